@@ -0,0 +1,292 @@
+"""
+Python 侧热点路径的基准测试，使用 SimulatedBackend 运行，不需要 DLL 和打印机。
+
+覆盖:
+    - 元素列表转换 (_create_dotnet_object_list)，10 / 100 / 1000 个元素
+    - 大型 JSON 任务文件的 LabelElement.from_data 与批量加载器 load_job
+    - update_element_data (普通列表与 ElementCollection)
+    - 生成并展开 SGTIN-96 EPC 批量数据 (sgtin96_batch)
+    - read_lsf 的 .NET 对象 -> Python 对象转换
+    - 预览图转换 (_convert_bitmap_to_pil)
+    - LockBits 像素拷贝 (_convert_bitmap_pixels)，使用模拟的已锁定位图，覆盖 32 位与自底向上的 24 位位图；
+      可加载 System.Drawing 时同时测量真实 .NET Bitmap 的转换
+
+用法:
+    python benchmarks/bench_hotpaths.py                         # 输出 JSON 结果
+    python benchmarks/bench_hotpaths.py -o results.json --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_hotpaths.py --baseline benchmarks/baseline.json --threshold 0.25
+
+指定 --baseline 时，中位耗时比基线慢超过 threshold 的基准会被标记为回归，并返回非零退出码。
+"""
+
+import argparse
+import base64
+import ctypes
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from harness import environment, find_regressions, load_baseline, measure, write_report  # noqa: E402
+
+from zmprinter import (  # noqa: E402
+    LabelPrinterSDK,
+    SimulatedBackend,
+    PrinterConfig,
+    LabelConfig,
+    PrinterStyle,
+    BarcodeType,
+    LabelElement,
+    ElementCollection,
+    TextElement,
+    BarcodeElement,
+    ImageElement,
+    RFIDElement,
+    ShapeElement,
+    DotNetBackend,
+    load_job,
+    sgtin96_batch,
+)
+from zmprinter import backends  # noqa: E402
+from zmprinter.runtime import default_dll_path  # noqa: E402
+
+ELEMENT_COUNTS = (10, 100, 1000)
+
+# 1x1 PNG，用于构造图片元素
+PIXEL_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+
+
+def make_sdk() -> LabelPrinterSDK:
+    return LabelPrinterSDK(
+        printer_config=PrinterConfig(interface=PrinterStyle.RFID_USB, dpi=300),
+        label_config=LabelConfig(width=100, height=60),
+        backend=SimulatedBackend(seed=0),
+    )
+
+
+def make_elements(count: int) -> List[Any]:
+    """按 文本/条码/RFID/图形/图片 轮换生成 count 个元素"""
+    elements: List[Any] = []
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            elements.append(TextElement(object_name=f"text-{i}", data=f"Text {i}", x=2, y=2))
+        elif kind == 1:
+            elements.append(
+                BarcodeElement(
+                    object_name=f"barcode-{i}", data=f"{i:012d}", barcode_type=BarcodeType.CODE_128_AUTO, x=2, y=10
+                )
+            )
+        elif kind == 2:
+            elements.append(RFIDElement(object_name=f"rfiduhf-{i}", data=f"{i:024X}"))
+        elif kind == 3:
+            elements.append(
+                ShapeElement(object_name=f"line-{i}", shape_type="line", start_x=1, start_y=1, end_x=50, end_y=1)
+            )
+        else:
+            elements.append(ImageElement(object_name=f"image-{i}", image_data=PIXEL_PNG, x=5, y=5))
+    return elements
+
+
+def make_job_json(count: int) -> str:
+    """生成与 LabelObjectList 格式一致的 JSON 任务文件内容"""
+    objects = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            objects.append({"ObjectName": f"text-{i}", "objectdata": f"Text {i}", "Xposition": 2, "Yposition": 2})
+        elif kind == 1:
+            objects.append({"ObjectName": f"barcode-{i}", "objectdata": f"{i:012d}", "barcodekind": "Code 128 Auto"})
+        elif kind == 2:
+            objects.append({"ObjectName": f"rfiduhf-{i}", "objectdata": f"{i:024X}", "RFIDEncodertype": 0})
+        else:
+            objects.append({"ObjectName": f"image-{i}", "imagedata": base64.b64encode(PIXEL_PNG * 64).decode("ascii")})
+    return json.dumps({"LabelObjectList": objects})
+
+
+def bench_cases() -> List[Tuple[str, Dict[str, Any], Callable[[], Any]]]:
+    """返回 (名称, 参数, 待测函数) 列表"""
+    cases: List[Tuple[str, Dict[str, Any], Callable[[], Any]]] = []
+    sdk = make_sdk()
+
+    for count in ELEMENT_COUNTS:
+        elements = make_elements(count)
+        cases.append(
+            (
+                f"create_object_list[{count}]",
+                {"elements": count},
+                lambda elements=elements: sdk._create_dotnet_object_list(elements),
+            )
+        )
+
+    job_json = make_job_json(1000)
+
+    def from_data_job():
+        for obj in json.loads(job_json)["LabelObjectList"]:
+            LabelElement.from_data(obj)
+
+    cases.append(("from_data_job[1000]", {"elements": 1000, "json_bytes": len(job_json)}, from_data_job))
+    cases.append(("load_job[1000]", {"elements": 1000, "json_bytes": len(job_json)}, lambda: load_job(job_json)))
+
+    plain_list = make_elements(1000)
+    collection = ElementCollection(make_elements(1000))
+    cases.append(
+        (
+            "update_element_data_list[1000]",
+            {"elements": 1000},
+            lambda: sdk.update_element_data(plain_list, "text-995", "new"),
+        )
+    )
+    cases.append(
+        (
+            "update_element_data_collection[1000]",
+            {"elements": 1000},
+            lambda: sdk.update_element_data(collection, "text-995", "new"),
+        )
+    )
+
+    cases.append(
+        (
+            "sgtin96_batch[100000]",
+            {"records": 100000},
+            lambda: list(sgtin96_batch("0614141", "812345", 0, 100000).records("rfiduhf-01")),
+        )
+    )
+
+    for count in (100, 1000):
+        template = sdk.compile_template(make_elements(count))
+        path = f"bench-{count}.lsf"
+        sdk.backend.register_lsf(path, template.dotnet_printer, template.dotnet_label, template.dotnet_elements)
+        cases.append((f"read_lsf[{count}]", {"elements": count}, lambda path=path: sdk.read_lsf(path)))
+
+    preview_elements = make_elements(10)
+    cases.append(("preview_label_simulated", {"elements": 10}, lambda: sdk.preview_label(preview_elements)))
+
+    cases.extend(fake_bitmap_cases())
+    bitmap_case = dotnet_bitmap_case()
+    if bitmap_case is not None:
+        cases.append(bitmap_case)
+    return cases
+
+
+# 模拟的 System.Drawing 成员，_convert_bitmap_pixels 只用到这些
+FAKE_DOTNET = SimpleNamespace(
+    PixelFormat=SimpleNamespace(Format24bppRgb="Format24bppRgb", Format32bppArgb="Format32bppArgb"),
+    ImageLockMode=SimpleNamespace(ReadOnly="ReadOnly"),
+    Rectangle=lambda *args: args,
+)
+
+
+class LockedBitmap:
+    """模拟 .NET Bitmap：LockBits 返回指向 ctypes 缓冲区的 BitmapData，行按 4 字节对齐"""
+
+    def __init__(self, width: int, height: int, pixel_format: str, bottom_up: bool = False):
+        self.Width = width
+        self.Height = height
+        self.PixelFormat = pixel_format
+        pixel_size = 3 if pixel_format == "Format24bppRgb" else 4
+        stride = (width * pixel_size + 3) // 4 * 4
+        self._buffer = ctypes.create_string_buffer(stride * height)
+        base = ctypes.addressof(self._buffer)
+        # 自底向上的位图 Scan0 指向缓冲区中的最后一行，stride 为负
+        scan0 = base + stride * (height - 1) if bottom_up else base
+        self._data = SimpleNamespace(
+            Stride=-stride if bottom_up else stride, Scan0=SimpleNamespace(ToInt64=lambda: scan0)
+        )
+
+    def LockBits(self, rect: Any, mode: Any, pixel_format: Any) -> Any:
+        return self._data
+
+    def UnlockBits(self, data: Any):
+        pass
+
+
+def fake_bitmap_cases() -> List[Tuple[str, Dict[str, Any], Callable[[], Any]]]:
+    """不依赖 .NET，直接测量 DotNetBackend._convert_bitmap_pixels 的像素拷贝"""
+    backend = DotNetBackend(default_dll_path())  # 构造时不会加载 .NET 运行时和 DLL
+
+    def convert(bitmap: LockedBitmap):
+        get_dotnet = backends.get_dotnet
+        backends.get_dotnet = lambda: FAKE_DOTNET
+        try:
+            return backend._convert_bitmap_pixels(bitmap)
+        finally:
+            backends.get_dotnet = get_dotnet
+
+    cases: List[Tuple[str, Dict[str, Any], Callable[[], Any]]] = []
+    for pixel_format, bottom_up in (("Format32bppArgb", False), ("Format24bppRgb", True)):
+        bitmap = LockedBitmap(1181, 709, pixel_format, bottom_up)
+        params = {"width": 1181, "height": 709, "pixel_format": pixel_format, "bottom_up": bottom_up}
+        name = f"convert_bitmap_pixels[{pixel_format[6:11]}{'-bottom-up' if bottom_up else ''}]"
+        cases.append((name, params, lambda bitmap=bitmap: convert(bitmap)))
+    return cases
+
+
+def dotnet_available() -> bool:
+    """探测 .NET 运行时和 System.Drawing 是否可用。不经过 get_dotnet，加载失败时不会记录错误日志"""
+    try:
+        import clr  # type: ignore
+
+        clr.AddReference("System.Drawing")  # type: ignore
+    except Exception:
+        return False
+    return True
+
+
+def dotnet_bitmap_case():
+    """可加载 System.Drawing 时，测量 .NET Bitmap -> PIL 的转换；否则返回 None"""
+    if not dotnet_available():
+        return None
+
+    dotnet = backends.get_dotnet()
+    backend = DotNetBackend(default_dll_path())  # 只用到位图转换，不会加载 LabelPrinter.dll
+
+    def convert():
+        bitmap = dotnet.Bitmap(1181, 709, dotnet.PixelFormat.Format32bppArgb)
+        return backend.bitmap_to_image(bitmap)
+
+    return "convert_bitmap_to_pil_dotnet", {"width": 1181, "height": 709}, convert
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="zmprinter 热点路径基准测试")
+    parser.add_argument("-o", "--output", type=Path, help="结果 JSON 输出路径 (默认输出到标准输出)")
+    parser.add_argument("--baseline", type=Path, help="用于回归比较的基线 JSON")
+    parser.add_argument("--save-baseline", type=Path, help="将本次结果保存为基线")
+    parser.add_argument("--threshold", type=float, default=0.2, help="判定为回归的中位耗时增幅 (默认 0.2 即 20%%)")
+    parser.add_argument("--repeat", type=int, default=5, help="每个基准的重复轮数")
+    parser.add_argument("--min-time", type=float, default=0.2, help="每轮的最短耗时 (秒)")
+    parser.add_argument("-k", "--filter", help="只运行名称包含该字符串的基准")
+    args = parser.parse_args()
+
+    results = []
+    for name, params, func in bench_cases():
+        if args.filter and args.filter not in name:
+            continue
+        timing = measure(func, repeat=args.repeat, min_time=args.min_time)
+        results.append({"name": name, "params": params, **timing})
+        print(f"{name:<40} {timing['median_s'] * 1e6:>12.1f} us", file=sys.stderr)
+
+    report: Dict[str, Any] = {"environment": environment(), "backend": "simulated", "results": results}
+    if args.baseline is not None:
+        regressions = find_regressions(results, load_baseline(args.baseline), args.threshold)
+        report["threshold"] = args.threshold
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(f"回归: {regression['name']} 变慢 {regression['change']:.1%}", file=sys.stderr)
+
+    write_report(args.output, report)
+    if args.save_baseline is not None:
+        write_report(args.save_baseline, report)
+
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
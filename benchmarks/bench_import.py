@@ -0,0 +1,79 @@
+"""
+测量 `import zmprinter` 的耗时，并检查导入时没有加载 .NET 运行时和 Pillow。
+
+用法:
+    python benchmarks/bench_import.py [--runs 7] [--budget-ms 120] [--json]
+
+每次测量都在新的子进程中进行，取中位数与预算比较；超出预算或导入时加载了重量级依赖时返回非零退出码。
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# 导入 zmprinter 时不应该被加载的模块
+HEAVY_MODULES = ["clr", "System", "PIL", "PIL.Image", "asyncio"]
+
+CHILD_CODE = f"""
+import json, sys, time
+start = time.perf_counter()
+import zmprinter
+elapsed = time.perf_counter() - start
+loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+def measure_once() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="zmprinter 导入耗时基准测试")
+    parser.add_argument("--runs", type=int, default=7, help="测量次数")
+    parser.add_argument("--budget-ms", type=float, default=120.0, help="导入耗时预算 (毫秒，按中位数比较)")
+    parser.add_argument("--json", action="store_true", help="以 JSON 格式输出结果")
+    args = parser.parse_args()
+
+    samples = [measure_once() for _ in range(args.runs)]
+    timings_ms = [sample["seconds"] * 1000 for sample in samples]
+    loaded = sorted({module for sample in samples for module in sample["loaded"]})
+    median_ms = statistics.median(timings_ms)
+
+    result = {
+        "benchmark": "import_zmprinter",
+        "runs": args.runs,
+        "median_ms": round(median_ms, 3),
+        "min_ms": round(min(timings_ms), 3),
+        "max_ms": round(max(timings_ms), 3),
+        "budget_ms": args.budget_ms,
+        "heavy_modules_loaded": loaded,
+        "passed": median_ms <= args.budget_ms and not loaded,
+    }
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print(
+            f"import zmprinter: 中位数 {median_ms:.1f} ms (最小 {min(timings_ms):.1f} ms, 预算 {args.budget_ms:.0f} ms)"
+        )
+        if loaded:
+            print(f"导入时加载了不应加载的模块: {', '.join(loaded)}")
+        print("通过" if result["passed"] else "未通过")
+
+    return 0 if result["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+基准测试的通用工具：计时、结果输出和与基线的回归比较。
+"""
+
+import json
+import platform
+import statistics
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+    """
+    测量 func 单次调用的耗时。
+    先自动确定每轮调用次数使单轮耗时不少于 min_time，再重复 repeat 轮。
+    :return: {"number": 每轮调用次数, "min_s": 最快单次耗时, "median_s": 中位单次耗时}
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    samples = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"number": number, "min_s": min(samples), "median_s": statistics.median(samples)}
+
+
+def environment() -> Dict[str, str]:
+    """记录运行环境，便于比较不同机器上的结果"""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, Any]]:
+    """读取基线文件，返回 {基准名称: 结果}"""
+    with open(path, "r", encoding="utf-8") as f:
+        return {result["name"]: result for result in json.load(f)["results"]}
+
+
+def find_regressions(
+    results: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float
+) -> List[Dict[str, Any]]:
+    """
+    与基线比较，找出中位耗时增加超过 threshold (比例) 的基准。
+    :return: 回归列表，每项包含名称、基线耗时、当前耗时和变化比例
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result["name"])
+        if base is None or "median_s" not in result or "median_s" not in base:
+            continue
+        change = result["median_s"] / base["median_s"] - 1.0
+        result["baseline_median_s"] = base["median_s"]
+        result["change"] = round(change, 4)
+        if change > threshold:
+            regressions.append(
+                {
+                    "name": result["name"],
+                    "baseline_median_s": base["median_s"],
+                    "median_s": result["median_s"],
+                    "change": round(change, 4),
+                }
+            )
+    return regressions
+
+
+def write_report(path: Optional[Path], report: Dict[str, Any]):
+    """将报告写入文件，path 为 None 时输出到标准输出"""
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if path is None:
+        print(text)
+    else:
+        path.write_text(text + "\n", encoding="utf-8")
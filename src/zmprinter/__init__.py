@@ -1,6 +1,27 @@
 # zmprinter_sdk/__init__.py
 from .core import LabelPrinterSDK
+from .runtime import LabelPrinterRuntime, get_runtime
+from .backends import PrinterBackend, DotNetBackend, SimulatedBackend
+from .scheduler import PrintScheduler, PrinterDevice, JobResult
+from .status import PrinterStatus, lookup_status, register_status
+from .monitor import StatusMonitor, StatusSnapshot, StatusChange
 from .config import PrinterConfig, LabelConfig
+from .template import LabelTemplate, BatchResult
+from .cache import PreviewCache, content_digest
+from .images import ImageStore, get_image_store, preprocess_image
+from .epc import EPCBatch, SGTIN96, encode_sgtin96, decode_sgtin96, sgtin96_batch, serial_batch
+from .rfid import RFIDEncodePipeline, EncodeResult, TagRead, TagInventory, InventoryStats, parse_uhf_tag_data
+from .lsf_cache import LSFCache, LSFStamp
+from .lsf_index import LSFIndex, LSFIndexEntry
+from .loader import LabelJob, load_job, load_jobs, iter_jobs, load_element, load_elements
+from .instrumentation import (
+    Instrumentation,
+    Span,
+    SpanSink,
+    CallbackSink,
+    MetricsSink,
+    OpenTelemetrySink,
+)
 from .elements import (
     LabelElement,
     TextElement,
@@ -9,6 +30,7 @@ from .elements import (
     RFIDElement,
     ShapeElement,
     LabelElementType,
+    ElementCollection,
 )
 from .enums import (
     PrinterStyle,
@@ -16,6 +38,9 @@ from .enums import (
     RFIDEncoderType,
     RFIDDataBlock,
     RFIDDataType,
+    ImageDither,
+    StatusCategory,
+    StatusSeverity,
 )
 from .utils import get_logger, setup_file_logging
 from .exceptions import (
@@ -46,8 +71,58 @@ logger = get_logger("zmprinter")
 # Optional: Define __all__ for explicit export control
 __all__ = [
     "LabelPrinterSDK",
+    "AsyncLabelPrinterSDK",
+    "LabelPrinterRuntime",
+    "get_runtime",
+    "PrinterBackend",
+    "DotNetBackend",
+    "SimulatedBackend",
+    "PrintScheduler",
+    "PrinterDevice",
+    "JobResult",
+    "PrinterStatus",
+    "lookup_status",
+    "register_status",
+    "StatusMonitor",
+    "StatusSnapshot",
+    "StatusChange",
     "PrinterConfig",
     "LabelConfig",
+    "LabelTemplate",
+    "BatchResult",
+    "PreviewCache",
+    "content_digest",
+    "ImageStore",
+    "get_image_store",
+    "preprocess_image",
+    "RFIDEncodePipeline",
+    "EPCBatch",
+    "SGTIN96",
+    "encode_sgtin96",
+    "decode_sgtin96",
+    "sgtin96_batch",
+    "serial_batch",
+    "TagInventory",
+    "InventoryStats",
+    "EncodeResult",
+    "TagRead",
+    "parse_uhf_tag_data",
+    "LSFCache",
+    "LSFStamp",
+    "LSFIndex",
+    "LSFIndexEntry",
+    "LabelJob",
+    "load_job",
+    "load_jobs",
+    "iter_jobs",
+    "load_element",
+    "load_elements",
+    "Instrumentation",
+    "Span",
+    "SpanSink",
+    "CallbackSink",
+    "MetricsSink",
+    "OpenTelemetrySink",
     "LabelElement",
     "TextElement",
     "BarcodeElement",
@@ -55,11 +130,15 @@ __all__ = [
     "RFIDElement",
     "ShapeElement",
     "LabelElementType",
+    "ElementCollection",
     "PrinterStyle",
     "BarcodeType",
     "RFIDEncoderType",
     "RFIDDataBlock",
     "RFIDDataType",
+    "ImageDither",
+    "StatusCategory",
+    "StatusSeverity",
     "get_logger",
     "setup_file_logging",
     "logger",
@@ -85,3 +164,12 @@ __all__ = [
 ]
 
 __version__ = "0.1.5"
+
+
+def __getattr__(name):
+    # asyncio 的导入开销较大，只在真正使用异步 SDK 时才导入 aio 模块
+    if name == "AsyncLabelPrinterSDK":
+        from .aio import AsyncLabelPrinterSDK
+
+        return AsyncLabelPrinterSDK
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,308 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterable, List, Mapping, Optional, Tuple, TypeVar, Union
+
+from .utils import get_logger
+from .config import PrinterConfig, LabelConfig
+from .core import LabelPrinterSDK
+from .backends import PrinterBackend
+from .elements import ElementCollection, LabelElementType
+from .template import LabelTemplate, BatchResult
+from .rfid import TagInventory, TagRead
+from .exceptions import ZMPrinterConnectionTimeoutError, ZMPrinterRFIDReadError
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# 用于区分 "未传入 timeout" 和 "timeout=None (不限时)"
+_DEFAULT_TIMEOUT: Any = object()
+
+
+class AsyncLabelPrinterSDK:
+    """
+    LabelPrinterSDK 的 asyncio 封装。
+
+    所有阻塞的 DLL 调用都在本实例独占的有界线程池中执行，不会阻塞事件循环。
+    建议每台打印机使用一个实例：默认的单线程执行器保证同一台打印机上的调用按提交顺序串行执行，
+    多台打印机之间则可以由同一个事件循环并发驱动。
+
+    超时与取消：超时或取消只会停止等待。尚未开始执行的调用会被直接取消；
+    已经进入 DLL 的调用无法中断，会在后台执行完毕后被丢弃。
+    """
+
+    def __init__(
+        self,
+        sdk: Optional[LabelPrinterSDK] = None,
+        max_workers: int = 1,
+        timeout: Optional[float] = None,
+        dll_path: Optional[str] = None,
+        printer_config: Optional[PrinterConfig] = None,
+        label_config: Optional[LabelConfig] = None,
+        backend: Optional[PrinterBackend] = None,
+    ):
+        """
+        :param sdk: 要封装的同步 SDK 实例。为 None 时使用 dll_path / printer_config / label_config / backend 新建一个。
+        :param max_workers: 执行器的最大线程数。同一台打印机的 DLL 调用不保证线程安全，默认为 1。
+        :param timeout: 默认超时时间 (秒)，None 表示不限时。各方法可通过 timeout 参数单独覆盖。
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers 必须至少为 1")
+        self.sdk = (
+            sdk
+            if sdk is not None
+            else LabelPrinterSDK(
+                dll_path=dll_path, printer_config=printer_config, label_config=label_config, backend=backend
+            )
+        )
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="zmprinter-aio")
+
+    async def _run(self, func: Callable[..., T], *args: Any, timeout: Any = _DEFAULT_TIMEOUT, **kwargs: Any) -> T:
+        """在执行器中运行阻塞函数，并应用超时"""
+        if timeout is _DEFAULT_TIMEOUT:
+            timeout = self.timeout
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        if timeout is None:
+            return await future
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError as e:
+            name = getattr(func, "__name__", repr(func))
+            logger.error(f"{name} 执行超时 ({timeout} 秒)")
+            raise ZMPrinterConnectionTimeoutError(f"{name} 执行超时 ({timeout} 秒)", original_exception=e) from e
+
+    async def preview_label(
+        self,
+        elements: List[LabelElementType],
+        printer_config: Optional[PrinterConfig] = None,
+        label_config: Optional[LabelConfig] = None,
+        *,
+        timeout: Any = _DEFAULT_TIMEOUT,
+    ) -> Optional["Image.Image"]:
+        """异步版本的 LabelPrinterSDK.preview_label"""
+        return await self._run(self.sdk.preview_label, elements, printer_config, label_config, timeout=timeout)
+
+    async def print_label(
+        self,
+        elements: List[LabelElementType],
+        copies: int = 1,
+        stop_at_error: bool = True,
+        printer_config: Optional[PrinterConfig] = None,
+        label_config: Optional[LabelConfig] = None,
+        *,
+        timeout: Any = _DEFAULT_TIMEOUT,
+    ) -> Tuple[str, int]:
+        """异步版本的 LabelPrinterSDK.print_label"""
+        return await self._run(
+            self.sdk.print_label, elements, copies, stop_at_error, printer_config, label_config, timeout=timeout
+        )
+
+    async def compile_template(
+        self,
+        elements: List[LabelElementType],
+        slots: Optional[Iterable[str]] = None,
+        printer_config: Optional[PrinterConfig] = None,
+        label_config: Optional[LabelConfig] = None,
+        *,
+        timeout: Any = _DEFAULT_TIMEOUT,
+    ) -> LabelTemplate:
+        """异步版本的 LabelPrinterSDK.compile_template"""
+        return await self._run(
+            self.sdk.compile_template, elements, slots, printer_config, label_config, timeout=timeout
+        )
+
+    async def print_template(
+        self,
+        template: LabelTemplate,
+        values: Optional[Mapping[str, str]] = None,
+        copies: int = 1,
+        stop_at_error: bool = True,
+        *,
+        timeout: Any = _DEFAULT_TIMEOUT,
+    ) -> Tuple[str, int]:
+        """异步版本的 LabelPrinterSDK.print_template"""
+        return await self._run(self.sdk.print_template, template, values, copies, stop_at_error, timeout=timeout)
+
+    async def preview_template(
+        self,
+        template: LabelTemplate,
+        values: Optional[Mapping[str, str]] = None,
+        *,
+        timeout: Any = _DEFAULT_TIMEOUT,
+    ) -> Optional["Image.Image"]:
+        """异步版本的 LabelPrinterSDK.preview_template"""
+        return await self._run(self.sdk.preview_template, template, values, timeout=timeout)
+
+    async def print_batch(
+        self,
+        template: Union[LabelTemplate, List[LabelElementType]],
+        records: Iterable[Mapping[str, Any]],
+        copies: int = 1,
+        stop_at_error: bool = False,
+        on_result: Optional[Callable[[BatchResult], None]] = None,
+        *,
+        timeout: Any = _DEFAULT_TIMEOUT,
+    ) -> Tuple[int, int]:
+        """
+        异步版本的 LabelPrinterSDK.print_batch。
+        records 在执行器线程中被迭代，on_result 回调也在执行器线程中调用。
+        """
+        return await self._run(
+            self.sdk.print_batch, template, records, copies, stop_at_error, on_result, timeout=timeout
+        )
+
+    async def read_lsf(
+        self, lsf_file_path: str | Path, *, timeout: Any = _DEFAULT_TIMEOUT
+    ) -> Tuple[Optional[PrinterConfig], Optional[LabelConfig], Optional[ElementCollection], str]:
+        """异步版本的 LabelPrinterSDK.read_lsf"""
+        return await self._run(self.sdk.read_lsf, lsf_file_path, timeout=timeout)
+
+    async def read_uhf_tag(
+        self,
+        area: int = 0,
+        power: int = 0,
+        stop_position: int = 2,
+        read_timeout: int = 2000,
+        printer_config: Optional[PrinterConfig] = None,
+        label_config: Optional[LabelConfig] = None,
+        *,
+        timeout: Any = _DEFAULT_TIMEOUT,
+    ) -> str:
+        """
+        异步版本的 LabelPrinterSDK.read_uhf_tag。
+        :param read_timeout: 传给 DLL 的读取超时 (毫秒)，对应同步方法的 timeout 参数
+        :param timeout: 等待结果的超时时间 (秒)
+        """
+        return await self._run(
+            self.sdk.read_uhf_tag,
+            area,
+            power,
+            stop_position,
+            read_timeout,
+            printer_config,
+            label_config,
+            timeout=timeout,
+        )
+
+    async def read_hf_tag(
+        self,
+        protocol: int = 1,
+        area: int = 0,
+        power: int = 0,
+        stop_position: int = 1,
+        read_timeout: int = 2000,
+        printer_config: Optional[PrinterConfig] = None,
+        label_config: Optional[LabelConfig] = None,
+        *,
+        timeout: Any = _DEFAULT_TIMEOUT,
+    ) -> str:
+        """
+        异步版本的 LabelPrinterSDK.read_hf_tag。
+        :param read_timeout: 传给 DLL 的读取超时 (毫秒)，对应同步方法的 timeout 参数
+        :param timeout: 等待结果的超时时间 (秒)
+        """
+        return await self._run(
+            self.sdk.read_hf_tag,
+            protocol,
+            area,
+            power,
+            stop_position,
+            read_timeout,
+            printer_config,
+            label_config,
+            timeout=timeout,
+        )
+
+    async def inventory_tags(
+        self,
+        inventory: Optional[TagInventory] = None,
+        max_tags: Optional[int] = None,
+        max_misses: int = 3,
+        duration: Optional[float] = None,
+        dedupe: bool = True,
+        stop: Optional[asyncio.Event] = None,
+        *,
+        timeout: Any = _DEFAULT_TIMEOUT,
+        **options: Any,
+    ) -> AsyncIterator[TagRead]:
+        """
+        异步版本的 TagInventory.scan()，逐个产出读到的标签。每次读取在 SDK 线程中执行，不阻塞事件循环。
+        :param inventory: 已创建的 TagInventory，为 None 时用 options 新建 (参数见 TagInventory)
+        :param max_tags: 产出这么多不重复标签后结束
+        :param max_misses: 连续这么多次没有读到新标签后结束；0 表示不限
+        :param duration: 盘点时长上限 (秒)
+        :param dedupe: 是否丢弃重复读到的标签
+        :param stop: 外部结束事件
+        :param timeout: 单次读取的等待超时 (秒)
+        """
+        if inventory is None:
+            inventory = await self._run(TagInventory, self.sdk, timeout=timeout, **options)
+        inventory.reset(max_tags, max_misses, duration, dedupe)
+        while not inventory.finished() and not (stop is not None and stop.is_set()):
+            try:
+                tag = await self._run(inventory.read_one, timeout=timeout)
+            except ZMPrinterRFIDReadError as e:
+                logger.warning(f"盘点读取出错: {e}")
+                inventory.accept(None, error=True)
+                continue
+            if inventory.accept(tag):
+                yield tag
+        logger.info(f"盘点结束: {inventory.stats}")
+
+    async def print_blank_page(
+        self,
+        print_error_mark: bool = True,
+        printer_config: Optional[PrinterConfig] = None,
+        label_config: Optional[LabelConfig] = None,
+        *,
+        timeout: Any = _DEFAULT_TIMEOUT,
+    ):
+        """异步版本的 LabelPrinterSDK.print_blank_page"""
+        return await self._run(
+            self.sdk.print_blank_page, print_error_mark, printer_config, label_config, timeout=timeout
+        )
+
+    async def get_printer_status(
+        self, printer_config: Optional[PrinterConfig] = None, *, timeout: Any = _DEFAULT_TIMEOUT
+    ) -> Tuple[int, str]:
+        """异步版本的 LabelPrinterSDK.get_printer_status"""
+        return await self._run(self.sdk.get_printer_status, printer_config, timeout=timeout)
+
+    async def get_usb_printer_sn(self, *, timeout: Any = _DEFAULT_TIMEOUT) -> List[str]:
+        """异步版本的 LabelPrinterSDK.get_usb_printer_sn"""
+        return await self._run(self.sdk.get_usb_printer_sn, timeout=timeout)
+
+    async def send_printer_command(
+        self,
+        command_string: str,
+        printer_config: Optional[PrinterConfig] = None,
+        *,
+        timeout: Any = _DEFAULT_TIMEOUT,
+    ) -> str:
+        """异步版本的 LabelPrinterSDK.send_printer_command"""
+        return await self._run(self.sdk.send_printer_command, command_string, printer_config, timeout=timeout)
+
+    def close(self, wait: bool = True):
+        """
+        关闭执行器。
+        :param wait: 是否等待正在执行的调用完成
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def aclose(self):
+        """异步关闭执行器，等待正在执行的调用完成"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self.close, wait=True))
+
+    async def __aenter__(self) -> "AsyncLabelPrinterSDK":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
@@ -0,0 +1,598 @@
+import io
+import time
+import ctypes
+import random
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .utils import get_logger
+from .enums import PrinterStyle
+from .runtime import LabelPrinterRuntime, get_dotnet, get_runtime, default_dll_path
+from .exceptions import ZMPrinterImportError
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = get_logger(__name__)
+
+
+class PrinterBackend(ABC):
+    """
+    打印机后端接口。
+
+    LabelPrinterSDK 通过后端创建打印机/标签/元素对象 (对应 ZMPrinter、ZMLabel、LabelObject)，
+    并调用打印、预览、RFID 读取、状态查询等操作。各操作与 LabelPrinter.dll 的方法一一对应，
+    参数均为本后端创建的对象。
+    """
+
+    name = "abstract"
+
+    def __init__(self):
+        # 后端自身的耗时统计 (秒)，会合并到 LabelPrinterSDK.timings 中
+        self.timings: Dict[str, float] = {}
+
+    # ---- 对象工厂 ----
+
+    @abstractmethod
+    def new_printer(self) -> Any:
+        """创建打印机对象 (ZMPrinter)"""
+
+    @abstractmethod
+    def new_label(self) -> Any:
+        """创建标签对象 (ZMLabel)"""
+
+    @abstractmethod
+    def new_object(self) -> Any:
+        """创建标签元素对象 (LabelObject)"""
+
+    @abstractmethod
+    def new_object_list(self, objects: Iterable[Any] = ()) -> Any:
+        """创建元素对象列表 (List<LabelObject>)"""
+
+    @abstractmethod
+    def parse_printer_style(self, name: str) -> Any:
+        """将 PrinterStyle 名称转换为后端的接口类型值"""
+
+    @abstractmethod
+    def enum_value(self, value: Any) -> int:
+        """获取后端枚举值对应的整数"""
+
+    @abstractmethod
+    def byte_array(self, data: bytes) -> Any:
+        """将 Python bytes 转换为后端的字节数组"""
+
+    # ---- 打印机操作 ----
+
+    @abstractmethod
+    def print_label(self, printer: Any, label: Any, objects: Any) -> str:
+        """打印一张标签 (PrintLabel)，返回 "OK" 等结果或 "Error: xxx" """
+
+    @abstractmethod
+    def get_label_image(self, printer: Any, label: Any, objects: Any, border: int = 0) -> Any:
+        """生成标签预览位图 (GetLabelImage)，返回值交给 bitmap_to_image 转换"""
+
+    @abstractmethod
+    def bitmap_to_image(self, bitmap: Any) -> "Image.Image":
+        """将 get_label_image 返回的位图转换为 PIL Image，并释放位图占用的资源"""
+
+    @abstractmethod
+    def get_uhf_tag_data(
+        self, printer: Any, label: Any, area: int, power: int, stop_position: int, timeout: int
+    ) -> Optional[str]:
+        """读取超高频标签数据 (GetUHFTagData)"""
+
+    @abstractmethod
+    def get_hf_tag_data(
+        self, printer: Any, label: Any, protocol: int, area: int, power: int, stop_position: int, timeout: int
+    ) -> Optional[str]:
+        """读取高频标签数据 (GetHFTagData)"""
+
+    @abstractmethod
+    def get_printer_status_code(self, printer: Any) -> int:
+        """获取打印机状态码 (getPrinterStatusCode)"""
+
+    @abstractmethod
+    def set_printer_params(self, printer: Any, command: str) -> Optional[str]:
+        """发送打印机指令 (SetPrinterParams)"""
+
+    @abstractmethod
+    def open_label(self, path: str, printer: Any, label: Any, objects: Any) -> Tuple[str, Any, Any, Any]:
+        """
+        读取 LSF 标签文件 (OpenLabel)。
+        printer / label 会被原地修改，返回 (错误信息, printer, label, objects)，成功时错误信息为空字符串。
+        """
+
+    @abstractmethod
+    def print_blank_page(self, printer: Any, label: Any, error_flag: int):
+        """打印空白页 (PrintaBlankpage)"""
+
+    @abstractmethod
+    def get_usb_printer_sn(self) -> List[str]:
+        """获取所有 USB 打印机的主板序列号 (getUSBPrinterMainboardSN)"""
+
+
+class ByteArrayCache:
+    """
+    按内容缓存已转换的后端字节数组 (进程内共享)。
+
+    以图像 bytes 本身为键：bytes 的哈希值计算一次后保存在对象上，
+    ImageStore 返回的共享 bytes 对象再次查找时不需要重新哈希或比较内容。
+    超出 max_bytes 时按最近最少使用淘汰。线程安全。
+    注意：缓存的数组会被多个标签共享，调用方不能修改其内容。
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        """
+        :param max_bytes: 缓存的数据总大小上限 (字节)
+        """
+        self.max_bytes = max_bytes
+        self._arrays: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, data: bytes, convert: Callable[[bytes], Any]) -> Any:
+        """
+        获取 data 对应的字节数组，未缓存时调用 convert(data) 转换并缓存。
+        :param data: 图像字节
+        :param convert: 转换函数
+        :return: 后端字节数组
+        """
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        with self._lock:
+            array = self._arrays.get(data)
+            if array is not None:
+                self._arrays.move_to_end(data)
+                self.hits += 1
+                return array
+            self.misses += 1
+
+        array = convert(data)
+        if len(data) <= self.max_bytes:
+            with self._lock:
+                if data not in self._arrays:
+                    self._arrays[data] = array
+                    self.total_bytes += len(data)
+                    while self.total_bytes > self.max_bytes:
+                        evicted, _ = self._arrays.popitem(last=False)
+                        self.total_bytes -= len(evicted)
+        return array
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._arrays.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._arrays)
+
+
+def _to_clr_bytes(data: bytes) -> Any:
+    """将 bytes 整块复制到新的 CLR byte[] (Marshal.Copy)，避免 pythonnet 逐元素转换"""
+    dotnet = get_dotnet()
+    System = dotnet.System
+    try:
+        array = System.Array.CreateInstance(System.Byte, len(data))
+        if data:
+            # c_char_p 直接指向 bytes 的内部缓冲区，不会复制
+            address = ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p).value
+            dotnet.Marshal.Copy(System.IntPtr(address), array, 0, len(data))
+        return array
+    except Exception as e:
+        logger.debug(f"Marshal.Copy 转换字节数组失败，回退到逐元素转换: {e}")
+        return System.Array[System.Byte](data)
+
+
+class DotNetBackend(PrinterBackend):
+    """基于 LabelPrinter.dll 的后端，.NET 运行时在第一次调用时加载并在进程内共享"""
+
+    name = "dotnet"
+
+    # 图像数据转换得到的 CLR byte[]，在所有 DotNetBackend 之间共享
+    byte_array_cache = ByteArrayCache()
+
+    def __init__(self, dll_path: Optional[str] = None):
+        """
+        :param dll_path: LabelPrinter.dll 的完整路径。如果为 None，会根据平台自动选择合适的DLL。
+        """
+        super().__init__()
+        # 如果未提供路径，根据平台自动选择DLL
+        if dll_path is None:
+            dll_path = default_dll_path()
+            logger.info(f"自动选择DLL路径: {dll_path}")
+
+        # 检查文件是否存在
+        if not Path(dll_path).exists():
+            err_msg = f"找不到DLL文件: {dll_path}"
+            logger.error(err_msg)
+            raise ZMPrinterImportError(err_msg)
+
+        self.dll_path = dll_path
+        self._runtime: Optional[LabelPrinterRuntime] = None
+        # 本后端独占的 PrintUtility / LSFUtility，随运行时一起在第一次访问时创建
+        self._print_utility: Any = None
+        self._lsf_utility: Any = None
+
+    @property
+    def runtime(self) -> LabelPrinterRuntime:
+        """本后端使用的共享运行时，第一次访问时加载 .NET 运行时和 DLL，并创建本后端的工具类实例"""
+        if self._runtime is None:
+            start = time.perf_counter()
+            runtime = get_runtime(self.dll_path)
+            self.timings["runtime"] = time.perf_counter() - start
+            start = time.perf_counter()
+            self._print_utility, self._lsf_utility = runtime.create_utilities()
+            self.timings["utilities"] = time.perf_counter() - start
+            runtime.handles += 1
+            self._runtime = runtime
+            logger.debug(f"获取共享运行时耗时 {self.timings['runtime'] * 1000:.1f} ms: {runtime!r}")
+        return self._runtime
+
+    @property
+    def print_utility(self) -> Any:
+        """本后端独占的 .NET PrintUtility 实例"""
+        self.runtime
+        return self._print_utility
+
+    @property
+    def lsf_utility(self) -> Any:
+        """本后端独占的 .NET LSFUtility 实例"""
+        self.runtime
+        return self._lsf_utility
+
+    def new_printer(self) -> Any:
+        return self.runtime.LabelPrinter.ZMPrinter()
+
+    def new_label(self) -> Any:
+        return self.runtime.LabelPrinter.ZMLabel()
+
+    def new_object(self) -> Any:
+        return self.runtime.LabelPrinter.LabelObject()
+
+    def new_object_list(self, objects: Iterable[Any] = ()) -> Any:
+        # 需要显式指定泛型类型
+        dotnet_list = get_dotnet().List[self.runtime.LabelPrinter.LabelObject]()
+        for obj in objects:
+            dotnet_list.Add(obj)
+        return dotnet_list
+
+    def parse_printer_style(self, name: str) -> Any:
+        printer_style = self.runtime.LabelPrinter.PrinterStyle
+        return printer_style.Parse(printer_style, name)
+
+    def enum_value(self, value: Any) -> int:
+        return value.value__
+
+    def byte_array(self, data: bytes) -> Any:
+        return self.byte_array_cache.get(data, _to_clr_bytes)
+
+    def print_label(self, printer: Any, label: Any, objects: Any) -> str:
+        # C# 方法签名: string PrintLabel(ZMPrinter printer, ZMLabel label, List<LabelObject> elements,
+        #                             bool firstlabel, bool lastlabel)
+        # 分析源码后发现 firstlabel 和 lastlabel 并未实际使用
+        return self.print_utility.PrintLabel(printer, label, objects, True, True)
+
+    def get_label_image(self, printer: Any, label: Any, objects: Any, border: int = 0) -> Any:
+        return self.print_utility.GetLabelImage(printer, label, objects, border)
+
+    def bitmap_to_image(self, bitmap: Any) -> "Image.Image":
+        try:
+            try:
+                # 优先直接读取像素缓冲区，避免 PNG 编码/解码
+                return self._convert_bitmap_pixels(bitmap)
+            except Exception as e:
+                logger.debug(f"直接读取 Bitmap 像素失败，回退到 PNG 转换: {e}")
+                return self._convert_bitmap_png(bitmap)
+        finally:
+            # 确保释放 .NET Bitmap 对象
+            bitmap.Dispose()
+
+    def _convert_bitmap_pixels(self, dotnet_bitmap: Any) -> "Image.Image":
+        """通过 LockBits 直接拷贝 Bitmap 的像素缓冲区并构造 PIL Image (仅一次内存拷贝，无编解码)"""
+        from PIL import Image
+
+        dotnet = get_dotnet()
+        PixelFormat = dotnet.PixelFormat
+        width = dotnet_bitmap.Width
+        height = dotnet_bitmap.Height
+        # 24 位位图保持 RGB，其余格式统一按 32 位 ARGB 读取 (GDI+ 负责格式转换)
+        if dotnet_bitmap.PixelFormat == PixelFormat.Format24bppRgb:
+            lock_format, mode, raw_mode, pixel_size = PixelFormat.Format24bppRgb, "RGB", "BGR", 3
+        else:
+            lock_format, mode, raw_mode, pixel_size = PixelFormat.Format32bppArgb, "RGBA", "BGRA", 4
+
+        bitmap_data = dotnet_bitmap.LockBits(
+            dotnet.Rectangle(0, 0, width, height), dotnet.ImageLockMode.ReadOnly, lock_format
+        )
+        try:
+            stride = bitmap_data.Stride
+            scan0 = bitmap_data.Scan0.ToInt64()
+            row_size = abs(stride)
+            if row_size < width * pixel_size:
+                raise ValueError(f"无效的 Bitmap 行宽: {stride}")
+            # 负 stride 表示自底向上存储，缓冲区起始地址是最后一行
+            start = scan0 if stride > 0 else scan0 + stride * (height - 1)
+            buffer = ctypes.string_at(start, row_size * height)
+        finally:
+            dotnet_bitmap.UnlockBits(bitmap_data)
+
+        orientation = 1 if stride > 0 else -1
+        return Image.frombuffer(mode, (width, height), buffer, "raw", raw_mode, row_size, orientation)
+
+    def _convert_bitmap_png(self, dotnet_bitmap: Any) -> "Image.Image":
+        """通过 PNG 编码/解码转换 Bitmap (兼容性回退方案)"""
+        from PIL import Image
+
+        dotnet = get_dotnet()
+        stream = dotnet.MemoryStream()
+        try:
+            # 以 PNG 格式保存到内存流，PNG 支持透明度且无损
+            dotnet_bitmap.Save(stream, dotnet.ImageFormat.Png)
+            # 从内存流中读取 bytes
+            image_bytes = bytes(stream.ToArray())
+        finally:
+            stream.Close()
+        # 使用 PIL 从 bytes 创建 Image 对象，load() 确保数据已完全解码
+        pil_image = Image.open(io.BytesIO(image_bytes))
+        pil_image.load()
+        return pil_image
+
+    def get_uhf_tag_data(
+        self, printer: Any, label: Any, area: int, power: int, stop_position: int, timeout: int
+    ) -> Optional[str]:
+        # C# 签名: string GetUHFTagData(ZMPrinter printer, ZMLabel label, int area, int power,
+        #                              int stopPosition, int timeout)
+        return self.print_utility.GetUHFTagData(printer, label, area, power, stop_position, timeout)
+
+    def get_hf_tag_data(
+        self, printer: Any, label: Any, protocol: int, area: int, power: int, stop_position: int, timeout: int
+    ) -> Optional[str]:
+        # C# 签名: string GetHFTagData(ZMPrinter printer, ZMLabel label, int protocol, int area, int power,
+        #                             int stopPosition, int timeout)
+        return self.print_utility.GetHFTagData(printer, label, protocol, area, power, stop_position, timeout)
+
+    def get_printer_status_code(self, printer: Any) -> int:
+        # C# 签名: int getPrinterStatusCode(ZMPrinter printer)
+        return self.print_utility.getPrinterStatusCode(printer)
+
+    def set_printer_params(self, printer: Any, command: str) -> Optional[str]:
+        # C# 签名: string SetPrinterParams(ZMPrinter printer, string paramstring)
+        return self.print_utility.SetPrinterParams(printer, command)
+
+    def open_label(self, path: str, printer: Any, label: Any, objects: Any) -> Tuple[str, Any, Any, Any]:
+        # pythonnet 以返回值元组的形式返回 ref 参数
+        # C# 签名: string OpenLabel(string filename, ref ZMPrinter printer, ref ZMLabel label,
+        #                          ref List<LabelObject> elements)
+        return self.lsf_utility.OpenLabel(path, printer, label, objects)
+
+    def print_blank_page(self, printer: Any, label: Any, error_flag: int):
+        # C# 签名: void PrintaBlankpage(ZMPrinter printer, ZMLabel label, int printErrorFlag)
+        self.print_utility.PrintaBlankpage(printer, label, error_flag)
+
+    def get_usb_printer_sn(self) -> List[str]:
+        # C# 签名: List<string> getUSBPrinterMainboardSN()
+        # 将 .NET List<string> 转换为 Python list[str]
+        return [sn for sn in self.print_utility.getUSBPrinterMainboardSN()]
+
+    def __repr__(self) -> str:
+        return f"DotNetBackend(dll_path={self.dll_path!r})"
+
+
+class SimulatedObject:
+    """模拟后端使用的通用对象，属性可任意读写 (对应 ZMPrinter / ZMLabel / LabelObject)"""
+
+    def __init__(self, **attrs: Any):
+        self.__dict__.update(attrs)
+
+    def copy(self) -> "SimulatedObject":
+        return SimulatedObject(**self.__dict__)
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(f"{k}={v!r}" for k, v in self.__dict__.items())
+        return f"SimulatedObject({attrs})"
+
+
+class SimulatedBackend(PrinterBackend):
+    """
+    纯 Python 实现的模拟打印机后端，不依赖 .NET 和真实硬件。
+
+    可配置调用延迟、打印失败率和状态码，用于在 Linux / CI 上对打印流程、模板、批量打印和调度器做功能和压力测试。
+    所有操作线程安全；打印结果记录在 printed 计数和 history 中。
+    """
+
+    name = "simulated"
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        status_code: int = 0,
+        uhf_tag_data: str = "E2801160600002040000A1B2",
+        hf_tag_data: str = "E004015012345678",
+        usb_serials: Optional[Iterable[str]] = None,
+        history_size: int = 1000,
+        seed: Optional[int] = None,
+        echo_rfid: bool = False,
+        rfid_error_rate: float = 0.0,
+    ):
+        """
+        :param latency: 每次打印机操作的基础延迟 (秒)
+        :param jitter: 在基础延迟上附加的随机延迟上限 (秒)
+        :param failure_rate: PrintLabel 返回错误的概率 (0-1)
+        :param status_code: getPrinterStatusCode 返回的状态码，可通过 status_code 属性随时修改
+        :param uhf_tag_data: GetUHFTagData 返回的数据
+        :param hf_tag_data: GetHFTagData 返回的数据
+        :param usb_serials: getUSBPrinterMainboardSN 返回的序列号
+        :param history_size: history 中保留的最近打印记录条数
+        :param seed: 随机数种子，便于复现
+        :param echo_rfid: 为 True 时模拟真实标签：每次打印写入一个新标签 (随机 TID)，
+                          GetUHFTagData 返回最近写入标签的 TID / EPC (area=2 时为 "TID,EPC")
+        :param rfid_error_rate: echo_rfid 模式下读回的 EPC 与写入数据不一致的概率 (0-1)
+        """
+        super().__init__()
+        if not 0.0 <= failure_rate <= 1.0:
+            raise ValueError("failure_rate 必须在 0 到 1 之间")
+        if not 0.0 <= rfid_error_rate <= 1.0:
+            raise ValueError("rfid_error_rate 必须在 0 到 1 之间")
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency 和 jitter 不能为负数")
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.status_code = status_code
+        self.uhf_tag_data = uhf_tag_data
+        self.hf_tag_data = hf_tag_data
+        self.usb_serials = list(usb_serials) if usb_serials is not None else []
+        self.history_size = history_size
+        self.echo_rfid = echo_rfid
+        self.rfid_error_rate = rfid_error_rate
+
+        self.printed = 0
+        self.failed = 0
+        self.calls: Dict[str, int] = {}
+        self.history: List[Dict[str, str]] = []
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._lsf_files: Dict[str, Tuple[Any, Any, List[Any]]] = {}
+        self._tag: Optional[Tuple[str, str]] = None  # echo_rfid 模式下最近写入的标签 (TID, EPC)
+
+    def _call(self, name: str):
+        """记录调用次数并模拟延迟"""
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def register_lsf(self, path: str | Path, printer: Any, label: Any, objects: Iterable[Any]):
+        """
+        注册一个模拟的 LSF 文件，之后 open_label(path) 返回这些对象的副本。
+        对象可以通过 LabelPrinterSDK.compile_template() 返回模板的
+        dotnet_printer / dotnet_label / dotnet_elements 获得。
+        :param path: LSF 文件路径
+        :param printer: 打印机对象
+        :param label: 标签对象
+        :param objects: 元素对象列表
+        """
+        with self._lock:
+            self._lsf_files[str(path)] = (printer, label, list(objects))
+
+    def new_printer(self) -> Any:
+        return SimulatedObject(printername="", printernetip="", printermbsn="")
+
+    def new_label(self) -> Any:
+        return SimulatedObject()
+
+    def new_object(self) -> Any:
+        return SimulatedObject(objectdata="", imagedata=b"", Xposition=0, Yposition=0)
+
+    def new_object_list(self, objects: Iterable[Any] = ()) -> Any:
+        return list(objects)
+
+    def parse_printer_style(self, name: str) -> Any:
+        try:
+            return PrinterStyle[name]
+        except KeyError:
+            raise ValueError(f"未知的打印机接口类型: {name}")
+
+    def enum_value(self, value: Any) -> int:
+        return value.value
+
+    def byte_array(self, data: bytes) -> Any:
+        return bytes(data)
+
+    def print_label(self, printer: Any, label: Any, objects: Any) -> str:
+        self._call("print_label")
+        with self._lock:
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                self.failed += 1
+                return "Error: 模拟打印失败"
+            self.printed += 1
+            self.history.append({obj.ObjectName: getattr(obj, "objectdata", "") for obj in objects})
+            if self.echo_rfid:
+                epc = next((obj.objectdata for obj in objects if obj.ObjectName.lower().startswith("rfiduhf")), None)
+                if epc is not None:
+                    self._tag = (f"E280{self._random.getrandbits(80):020X}", epc)
+            if len(self.history) > self.history_size:
+                del self.history[: len(self.history) - self.history_size]
+        return "OK"
+
+    def get_label_image(self, printer: Any, label: Any, objects: Any, border: int = 0) -> Any:
+        from PIL import Image
+
+        self._call("get_label_image")
+        # 按打印机分辨率将标签尺寸 (mm) 换算为像素
+        dpi = getattr(printer, "printerdpi", 300)
+        width = max(1, round(label.labelwidth * dpi / 25.4))
+        height = max(1, round(label.labelheight * dpi / 25.4))
+        return Image.new("RGB", (width, height), "white")
+
+    def bitmap_to_image(self, bitmap: Any) -> "Image.Image":
+        return bitmap
+
+    def get_uhf_tag_data(
+        self, printer: Any, label: Any, area: int, power: int, stop_position: int, timeout: int
+    ) -> Optional[str]:
+        self._call("get_uhf_tag_data")
+        with self._lock:
+            tag = self._tag
+            if not self.echo_rfid:
+                return self.uhf_tag_data
+            if tag is None:
+                return ""
+            tid, epc = tag
+            if self.rfid_error_rate and self._random.random() < self.rfid_error_rate:
+                epc = epc[:-1] + ("0" if epc[-1:] != "0" else "1")
+        return {0: tid, 1: epc}.get(area, f"{tid},{epc}")
+
+    def get_hf_tag_data(
+        self, printer: Any, label: Any, protocol: int, area: int, power: int, stop_position: int, timeout: int
+    ) -> Optional[str]:
+        self._call("get_hf_tag_data")
+        return self.hf_tag_data
+
+    def get_printer_status_code(self, printer: Any) -> int:
+        self._call("get_printer_status_code")
+        return self.status_code
+
+    def set_printer_params(self, printer: Any, command: str) -> Optional[str]:
+        self._call("set_printer_params")
+        return "OK"
+
+    def open_label(self, path: str, printer: Any, label: Any, objects: Any) -> Tuple[str, Any, Any, Any]:
+        self._call("open_label")
+        with self._lock:
+            entry = self._lsf_files.get(str(path))
+        if entry is None:
+            return f"找不到标签文件: {path}", printer, label, objects
+        stored_printer, stored_label, stored_objects = entry
+        # 与 DLL 一样原地填充 ref 参数
+        printer.__dict__.update(vars(stored_printer))
+        label.__dict__.update(vars(stored_label))
+        return "", printer, label, [obj.copy() for obj in stored_objects]
+
+    def print_blank_page(self, printer: Any, label: Any, error_flag: int):
+        self._call("print_blank_page")
+
+    def get_usb_printer_sn(self) -> List[str]:
+        self._call("get_usb_printer_sn")
+        return list(self.usb_serials)
+
+    def stats(self) -> Mapping[str, Any]:
+        """返回模拟后端的统计信息"""
+        with self._lock:
+            return {"printed": self.printed, "failed": self.failed, "calls": dict(self.calls)}
+
+    def __repr__(self) -> str:
+        return (
+            f"SimulatedBackend(latency={self.latency}, failure_rate={self.failure_rate}, "
+            f"status_code={self.status_code}, printed={self.printed})"
+        )
@@ -0,0 +1,195 @@
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from .utils import get_logger
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = get_logger(__name__)
+
+
+class ConversionCache:
+    """
+    Python 配置/元素对象到 .NET 对象的转换缓存。
+
+    以 Python 对象本身为键 (弱引用)，同时保存转换时对象属性的快照。
+    只有当对象的属性发生变化时才会重新转换；Python 对象被回收后缓存条目自动失效。
+    条目和 hits / misses 计数在锁内更新，可以被多个线程同时使用；转换函数在锁外调用，
+    同一对象并发未命中时可能被转换多次，以最后一次的结果为准。
+    """
+
+    def __init__(self):
+        self._entries: "weakref.WeakKeyDictionary[Any, Tuple[Dict[str, Any], Any]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, obj: Any, factory: Callable[[Any], Any]) -> Any:
+        """
+        获取 obj 对应的转换结果，必要时调用 factory(obj) 重新转换。
+        :param obj: PrinterConfig / LabelConfig / LabelElement 等 Python 对象
+        :param factory: 转换函数
+        :return: 转换后的 .NET 对象
+        """
+        state = _state(obj)
+        with self._lock:
+            entry = self._entries.get(obj)
+            if entry is not None and entry[0] == state:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = factory(obj)
+        with self._lock:
+            self._entries[obj] = (state, value)
+        return value
+
+    def invalidate(self, obj: Any):
+        """使指定对象的缓存失效"""
+        with self._lock:
+            self._entries.pop(obj, None)
+
+    def clear(self):
+        """清空所有缓存条目"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _state(obj: Any) -> Dict[str, Any]:
+    """对象用于比较和计算摘要的状态，对象可以通过 _digest_state() 提供 (如 ImageElement 附带文件修改时间)"""
+    digest_state = getattr(obj, "_digest_state", None)
+    return digest_state() if digest_state is not None else obj.__dict__.copy()
+
+
+def _feed_digest(h: "hashlib._Hash", value: Any):
+    """将一个值以无歧义的方式写入摘要 (带类型标记和长度前缀)"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        h.update(f"{type(value).__name__}:{value!r};".encode("utf-8"))
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        # 图片等二进制数据直接按内容计算摘要
+        data = bytes(value) if isinstance(value, memoryview) else value
+        h.update(f"bytes:{len(data)}:".encode("ascii"))
+        h.update(data)
+    elif isinstance(value, Enum):
+        h.update(f"enum:{type(value).__name__}.{value.name};".encode("utf-8"))
+    elif isinstance(value, (list, tuple)):
+        h.update(f"seq:{len(value)}[".encode("ascii"))
+        for item in value:
+            _feed_digest(h, item)
+        h.update(b"]")
+    elif isinstance(value, dict):
+        h.update(f"map:{len(value)}{{".encode("ascii"))
+        for key in sorted(value, key=str):
+            _feed_digest(h, key)
+            _feed_digest(h, value[key])
+        h.update(b"}")
+    elif hasattr(value, "__dict__"):
+        h.update(f"obj:{type(value).__module__}.{type(value).__qualname__}".encode("utf-8"))
+        _feed_digest(h, _state(value))
+    else:
+        h.update(f"{type(value).__name__}:{value!r};".encode("utf-8"))
+
+
+def content_digest(*objects: Any) -> str:
+    """
+    计算配置和元素的稳定内容摘要 (与对象标识和进程无关)。
+    :param objects: PrinterConfig、LabelConfig、元素列表等
+    :return: 十六进制摘要字符串
+    """
+    h = hashlib.blake2b(digest_size=20)
+    for obj in objects:
+        _feed_digest(h, obj)
+    return h.hexdigest()
+
+
+class PreviewCache:
+    """
+    预览图 LRU 缓存。
+
+    以配置和元素的内容摘要为键保存 PIL 预览图，按图像占用的字节数限制总容量，
+    超出容量时淘汰最久未使用的条目。线程安全。
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        :param max_bytes: 缓存可占用的最大字节数 (按图像像素数据估算)
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes 必须大于 0")
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Image.Image, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _image_size(image: "Image.Image") -> int:
+        return image.width * image.height * len(image.getbands())
+
+    def get(self, key: str) -> Optional["Image.Image"]:
+        """
+        获取缓存的预览图。
+        :param key: content_digest() 计算的键
+        :return: 预览图的副本，未命中时返回 None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            image = entry[0]
+        return image.copy()
+
+    def put(self, key: str, image: "Image.Image"):
+        """
+        缓存预览图。缓存持有传入的图像对象，调用方之后不应再修改它。
+        :param key: content_digest() 计算的键
+        :param image: 预览图
+        """
+        size = self._image_size(image)
+        if size > self.max_bytes:
+            logger.debug(f"预览图大小 {size} 字节超过缓存容量，不缓存")
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (image, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """清空缓存 (不重置命中统计)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """返回缓存统计信息"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
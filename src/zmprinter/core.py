@@ -1,15 +1,20 @@
-import io
-import sys
-import platform
+import time
+import threading
+import weakref
 from pathlib import Path
-from typing import List, Optional, Tuple
-
-import clr
-from PIL import Image
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
 from .utils import get_logger
+from .runtime import LabelPrinterRuntime
+from .backends import PrinterBackend, DotNetBackend
+from .instrumentation import Instrumentation, SpanSink, instrumented
+from .cache import ConversionCache, PreviewCache, content_digest
+from .images import get_image_store
+from .lsf_cache import LSFCache
+from .status import PrinterStatus, INTERNAL_ERROR_CODE, lookup_status
 from .config import PrinterConfig, LabelConfig
 from .enums import PrinterStyle, BarcodeType, RFIDEncoderType, RFIDDataBlock, RFIDDataType
+from .template import LabelTemplate, BatchResult
 from .elements import (
     TextElement,
     BarcodeElement,
@@ -17,10 +22,10 @@ from .elements import (
     RFIDElement,
     ShapeElement,
     LabelElementType,
+    ElementCollection,
 )
 from .exceptions import (
     ZMPrinterSetupError,
-    ZMPrinterImportError,
     ZMPrinterConfigError,
     ZMPrinterCommandError,
     ZMPrinterLSFError,
@@ -29,19 +34,12 @@ from .exceptions import (
     ZMPrinterDataError,
 )
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 # 获取logger实例
 logger = get_logger(__name__)
 
-clr.AddReference("System.Drawing")  # type: ignore
-try:
-    import System  # type: ignore
-    from System.Collections.Generic import List as DotNetList  # type: ignore .NET List
-    from System.Drawing import Bitmap as DotNetBitmap  # type: ignore .NET Drawing 命名空间
-    from System.Drawing.Imaging import ImageFormat  # type: ignore
-    from System.IO import MemoryStream  # type: ignore
-except ImportError as e:
-    logger.error(f"Failed to import System.Drawing: {e}")
-
 
 class LabelPrinterSDK:
     """封装 LabelPrinter.dll 功能的 Python SDK"""
@@ -51,82 +49,105 @@ class LabelPrinterSDK:
         dll_path: Optional[str] = None,
         printer_config: Optional[PrinterConfig] = None,
         label_config: Optional[LabelConfig] = None,
+        preview_cache: Optional[PreviewCache] = None,
+        backend: Optional[PrinterBackend] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        lsf_cache: Optional[LSFCache] = None,
     ):
         """
-        初始化 SDK 并加载 DLL。
+        初始化 SDK。
+        同一 DLL 的 .NET 运行时在进程内只加载一次并由所有实例共享，加载推迟到第一次真正调用打印机功能时。
+        构造和加载耗时记录在 timings 属性中 (秒)。
         :param dll_path: LabelPrinter.dll 的完整路径。如果为 None，会根据平台自动选择合适的DLL。
                        确保 DLL 依赖的 .NET Framework 版本已安装。
+        :param printer_config: 默认打印机配置
+        :param label_config: 默认标签配置
+        :param preview_cache: 预览图缓存 (可选)。设置后内容相同的预览请求直接返回缓存的图像。
+        :param backend: 打印机后端 (可选)。为 None 时使用基于 dll_path 的 DotNetBackend；
+                        传入 SimulatedBackend 可在没有 DLL 和硬件的环境下运行。
+        :param instrumentation: 阶段耗时埋点 (可选)。也可以之后通过 enable_instrumentation() 启用。
+        :param lsf_cache: 已解析 LSF 模板的缓存 (可选)。设置后 read_lsf 重新打开未变化的模板时不再调用 DLL。
         """
-        try:
-            # 如果未提供路径，根据平台自动选择DLL
-            if dll_path is None:
-                # 获取当前模块所在目录路径
-                module_dir = Path(__file__).parent
-
-                # 根据平台特性选择合适的DLL目录
-                if sys.platform == "win32":
-                    if platform.architecture()[0] == "64bit":
-                        # 64位Windows
-                        dll_dir = "x64"
-                    else:
-                        # 32位Windows
-                        dll_dir = "x86"
-                else:
-                    # 非Windows平台使用AnyCPU版本
-                    dll_dir = "AnyCPU"
-
-                # 构建DLL完整路径
-                dll_path_obj = module_dir / "libs" / dll_dir / "LabelPrinter.dll"
-                dll_path = str(dll_path_obj.resolve())
-                logger.info(f"自动选择DLL路径: {dll_path}")
-
-            # 检查文件是否存在
-            if not Path(dll_path).exists():
-                err_msg = f"找不到DLL文件: {dll_path}"
-                logger.error(err_msg)
-                raise ZMPrinterImportError(err_msg)
-
-            # 加载DLL
-            System.Reflection.Assembly.LoadFile(dll_path)
-            clr.AddReference("LabelPrinter")  # type: ignore
-        except (ImportError, FileNotFoundError, System.IO.FileNotFoundException, System.BadImageFormatException) as e:
-            logger.error(f"无法加载或引用 LabelPrinter.dll: {e}")
-            raise ZMPrinterImportError(
-                f"无法加载 LabelPrinter.dll。请确保 DLL 存在、架构匹配且 .NET 环境配置正确。错误: {e}",
-                original_exception=e,
-            )
-        except Exception as e:
-            logger.error(f"无法加载 LabelPrinter.dll: {e}")
-            raise ImportError(f"无法加载 LabelPrinter.dll。请确保 DLL 存在且 .NET 环境配置正确。错误: {e}")
+        start = time.perf_counter()
+        self._timings: Dict[str, float] = {}
 
-        try:
-            # 导入 .NET 命名空间和类
-            import LabelPrinter  # type: ignore
-
-            self.LabelPrinter = LabelPrinter
-
-            # 实例化 .NET 工具类
-            self.print_utility = self.LabelPrinter.PrintUtility()
-            self.lsf_utility = self.LabelPrinter.LSFUtility()
-            logger.info("LabelPrinter SDK 初始化成功")
-        except ImportError as e:
-            logger.error(f"成功加载 DLL 但无法导入 LabelPrinter 命名空间: {e}")
-            raise ZMPrinterImportError(f"无法导入 LabelPrinter 命名空间。错误: {e}", original_exception=e)
-        except Exception as e:
-            logger.error(f"无法实例化 LabelPrinter 类: {e}")
-            raise ZMPrinterSetupError(f"SDK 初始化失败: {e}", original_exception=e)
+        self.backend = backend if backend is not None else DotNetBackend(dll_path)
+        self.dll_path = getattr(self.backend, "dll_path", None)
 
         self.printer_status = None
         self.printer_config = printer_config
         self.label_config = label_config
 
+        # Python 对象 -> .NET 对象的转换缓存，避免重复编组未变化的配置和元素
+        self._conversion_cache = ConversionCache()
+        self._last_object_list: Optional[Tuple[List[object], object]] = None
+        # 图像预处理使用的 DPI (随每次打印/预览的打印机配置更新)，以及每个图像元素转换时使用的 DPI
+        self._image_dpi: Optional[int] = None
+        self._converted_image_dpi: "weakref.WeakKeyDictionary[ImageElement, int]" = weakref.WeakKeyDictionary()
+        # 串行化本实例的 DLL 调用和转换状态 (_last_object_list / _image_dpi)。
+        # 调度器的打印线程和状态监控器的轮询线程可能同时使用同一个实例
+        self._lock = threading.RLock()
+        self.preview_cache = preview_cache
+        self.instrumentation = instrumentation
+        self.lsf_cache = lsf_cache
+        self._timings["init"] = time.perf_counter() - start
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """SDK 构造及后端加载各阶段的耗时 (秒)"""
+        return {**self._timings, **self.backend.timings}
+
+    @property
+    def runtime(self) -> LabelPrinterRuntime:
+        """本实例使用的共享 .NET 运行时 (仅 DotNetBackend)，第一次访问时加载 .NET 运行时和 DLL"""
+        if not isinstance(self.backend, DotNetBackend):
+            raise ZMPrinterSetupError(f"当前后端 {self.backend.name} 不使用 .NET 运行时")
+        return self.backend.runtime
+
+    @property
+    def LabelPrinter(self) -> Any:
+        """LabelPrinter .NET 命名空间"""
+        return self.runtime.LabelPrinter
+
+    @property
+    def print_utility(self) -> Any:
+        """本实例后端的 .NET PrintUtility 实例"""
+        self.runtime
+        return self.backend.print_utility
+
+    @property
+    def lsf_utility(self) -> Any:
+        """本实例后端的 .NET LSFUtility 实例"""
+        self.runtime
+        return self.backend.lsf_utility
+
+    def enable_instrumentation(self, *sinks: SpanSink) -> Instrumentation:
+        """
+        启用阶段耗时埋点。
+        :param sinks: 接收耗时记录的 sink (CallbackSink / MetricsSink / OpenTelemetrySink 等)
+        :return: 本实例使用的 Instrumentation，可继续 add_sink()
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+        for sink in sinks:
+            self.instrumentation.add_sink(sink)
+        return self.instrumentation
+
+    def _dll(self, stage: str, func: Callable[..., Any], *args: Any) -> Any:
+        """调用后端的 DLL 操作 (同一实例上串行执行)，启用埋点时记录耗时"""
+        instrumentation = self.instrumentation
+        if instrumentation is None or not instrumentation.enabled:
+            with self._lock:
+                return func(*args)
+        with self._lock, instrumentation.span(stage):
+            return func(*args)
+
+    @instrumented("convert.printer")
     def _create_dotnet_printer(self, config: PrinterConfig) -> object:
         """将 Python PrinterConfig 转换为 .NET ZMPrinter 对象"""
         try:
-            dotnet_printer = self.LabelPrinter.ZMPrinter()
-            dotnet_printer.printerinterface = self.LabelPrinter.PrinterStyle.Parse(
-                self.LabelPrinter.PrinterStyle, config.interface.name
-            )
+            dotnet_printer = self.backend.new_printer()
+            dotnet_printer.printerinterface = self.backend.parse_printer_style(config.interface.name)
             dotnet_printer.printerdpi = config.dpi
             dotnet_printer.printSpeed = config.speed
             dotnet_printer.printDarkness = config.darkness
@@ -157,9 +178,10 @@ class LabelPrinterSDK:
         except Exception as e:
             raise ZMPrinterConfigError(f"处理打印机配置时出错: {e}", original_exception=e)
 
+    @instrumented("convert.label")
     def _create_dotnet_label(self, config: LabelConfig) -> object:
         """将 Python LabelConfig 转换为 .NET ZMLabel 对象"""
-        dotnet_label = self.LabelPrinter.ZMLabel()
+        dotnet_label = self.backend.new_label()
         dotnet_label.labelwidth = config.width
         dotnet_label.labelheight = config.height
         dotnet_label.labelrowgap = config.gap
@@ -175,166 +197,234 @@ class LabelPrinterSDK:
         dotnet_label.labelshape = config.label_shape
         return dotnet_label
 
-    def _create_dotnet_object_list(self, elements: List[LabelElementType]) -> object:
-        """将 Python LabelElement 列表转换为 .NET List<LabelObject>"""
-        elem = None
+    @instrumented("convert.element")
+    def _create_dotnet_object(self, elem: LabelElementType) -> object:
+        """将单个 Python LabelElement 转换为 .NET LabelObject"""
         try:
-            # 需要显式指定泛型类型
-            dotnet_list = DotNetList[self.LabelPrinter.LabelObject]()
-
-            for elem in elements:
-                dotnet_obj = self.LabelPrinter.LabelObject()
-                dotnet_obj.ObjectName = elem.object_name
-                # 对象名称的命名规则：
-                # 1、条码对象以"barcode"开头，如"barcode-01"，"barcode-02"...
-                # 2、文字对象以"text"开头，如"text-01"，"text-02"...
-                # 3、直线对象以"line"开头，如"line-01"，"line-02"...
-                # 4、矩形对象以"rectangle"开头，如"rectangle-01"，"rectangle-02"...
-                # 5、图片对象以"image"开头，如"image-01"，"image-02"...
-                # 6、RFID对象以"rfiduhf"开头，如"rfiduhf-01"，"rfiduhf-02"...注意：超高频和高频的对象名称都是以"rfiduhf"开头
-
-                # 根据 Python 对象的类型设置 .NET 对象属性
-                if isinstance(elem, TextElement):
-                    # ObjectName 在C#示例中似乎包含类型信息，如 "text-01"
-                    # 但 DLL 文档中 ObjectName 好像只是标识符。此处遵循 C# 示例给 object_name 赋值。
-                    dotnet_obj.objectdata = elem.data
-                    dotnet_obj.Xposition = elem.x
-                    dotnet_obj.Yposition = elem.y
-                    dotnet_obj.textfont = elem.font_name
-                    dotnet_obj.fontsize = elem.font_size
-                    dotnet_obj.fontstyle = elem.font_style
-                    dotnet_obj.direction = elem.direction
-                    dotnet_obj.blackbackground = elem.black_background
-                    dotnet_obj.chargap = elem.char_gap
-                    dotnet_obj.charHZoom = elem.char_h_zoom
-                    dotnet_obj.texttype = elem.text_type
-                    dotnet_obj.texttextalign = elem.text_text_align
-                    dotnet_obj.texttextvalign = elem.text_text_valign
-                    dotnet_obj.textwidth = elem.text_width
-                    dotnet_obj.textwidthbeyound = elem.text_width_beyound
-                    dotnet_obj.linegapindex = elem.line_gap_index
-                    dotnet_obj.linegap = elem.line_gap
-                    dotnet_obj.circularradius = elem.circular_radius
-                    dotnet_obj.textradian = elem.text_radian
-                    dotnet_obj.textstartangle = elem.text_start_angle
-                    dotnet_obj.rewindingdirection = elem.rewinding_direction
-                    dotnet_obj.literaldirection = elem.literal_direction
-
-                elif isinstance(elem, BarcodeElement):
-                    dotnet_obj.objectdata = elem.data
-                    dotnet_obj.Xposition = elem.x
-                    dotnet_obj.Yposition = elem.y
-                    dotnet_obj.barcodekind = elem.barcode_type
-                    dotnet_obj.barcodescale = elem.scale
-                    dotnet_obj.direction = elem.direction
-
-                    if elem.height is not None:  # 仅一维码设置
-                        dotnet_obj.barcodeheight = elem.height
-
-                    dotnet_obj.textposition = elem.text_position
-                    dotnet_obj.errorcorrection = elem.error_correction
-                    dotnet_obj.charencoding = elem.char_encoding
-                    dotnet_obj.qrversion = elem.qr_version
-                    dotnet_obj.code39widthratio = elem.code39_width_ratio
-                    dotnet_obj.code39startchar = elem.code39_start_char
-                    dotnet_obj.barcodealign = elem.barcode_align
-                    dotnet_obj.pdf417_rows = elem.pdf417_rows
-                    dotnet_obj.pdf417_columns = elem.pdf417_columns
-                    dotnet_obj.pdf417_rows_auto = elem.pdf417_rows_auto
-                    dotnet_obj.pdf417_columns_auto = elem.pdf417_columns_auto
-                    dotnet_obj.datamatrixShape = elem.datamatrix_shape
-                    dotnet_obj.textoffset = elem.text_offset
-                    dotnet_obj.textalign = elem.text_align
-                    dotnet_obj.textfont = elem.text_font
-                    dotnet_obj.fontsize = elem.text_font_size
-
-                elif isinstance(elem, ImageElement):
-                    dotnet_obj.Xposition = elem.x
-                    dotnet_obj.Yposition = elem.y
-                    dotnet_obj.direction = elem.direction
-                    dotnet_obj.transparent = elem.transparent
-
-                    if elem.image_data:
-                        # 将 Python bytes 转换为 .NET byte[]
-                        dotnet_obj.imagedata = System.Array[System.Byte](elem.image_data)
-
-                    dotnet_obj.aspectRatio = elem.aspect_ratio
-                    dotnet_obj.hscale = elem.h_scale
-                    dotnet_obj.vscale = elem.v_scale
-                    dotnet_obj.imagefixedsize = elem.image_fixed_size
-                    dotnet_obj.imagefixedwidth = elem.image_fixed_width
-                    dotnet_obj.imagefixedheight = elem.image_fixed_height
-
-                elif isinstance(elem, RFIDElement):
-                    dotnet_obj.objectdata = elem.data
-                    dotnet_obj.RFIDEncodertype = elem.rfid_encoder_type
-                    dotnet_obj.RFIDDatablock = elem.rfid_data_block if elem.data_block else 0
-                    dotnet_obj.RFIDDatatype = elem.rfid_data_type
-                    dotnet_obj.RFIDTextencoding = elem.rfid_text_encoding
-                    dotnet_obj.DataAlignment = elem.data_alignment
-                    dotnet_obj.RFIDerrortimes = elem.rfid_error_times
-                    dotnet_obj.Datalengthdoublewords = elem.data_length_double_words
-
-                    # HF相关属性
-                    dotnet_obj.HFstartblock = elem.hf_start_block
-                    dotnet_obj.HFmodulepower = elem.hf_module_power
-                    dotnet_obj.Encrypt14443A = elem.encrypt_14443a
-                    dotnet_obj.Sector14443A = elem.sector_14443a
-                    dotnet_obj.KEYAB14443A = elem.keyab_14443a
-                    dotnet_obj.KEYAnewpwd = elem.keya_new_pwd
-                    dotnet_obj.KEYAoldpwd = elem.keya_old_pwd
-                    dotnet_obj.KEYBnewpwd = elem.keyb_new_pwd
-                    dotnet_obj.KEYBoldpwd = elem.keyb_old_pwd
-                    dotnet_obj.Encrypt14443AControl = elem.encrypt_14443a_control
-                    dotnet_obj.Encrypt14443AControlvalue = elem.encrypt_14443a_control_value
-                    dotnet_obj.Controlarea15693 = elem.control_area_15693
-                    dotnet_obj.Controlvalue15693 = elem.control_value_15693
-
-                elif isinstance(elem, ShapeElement):
-                    dotnet_obj.startXposition = elem.start_x_position
-                    dotnet_obj.startYposition = elem.start_y_position
-                    dotnet_obj.endXposition = elem.end_x_position
-                    dotnet_obj.endYposition = elem.end_y_position
-                    dotnet_obj.lineWidth = elem.line_width
-                    dotnet_obj.lineDashStyle = elem.line_dash_style
-                    dotnet_obj.fillRectangle = elem.fill_rectangle
-                    dotnet_obj.lineclass = elem.line_class
-                    if elem.rectangle_class is not None:
-                        dotnet_obj.rectangleclass = elem.rectangle_class
-                    dotnet_obj.objectclass = elem.object_class
-
-                dotnet_list.Add(dotnet_obj)
-
-            return dotnet_list
+            dotnet_obj = self.backend.new_object()
+            dotnet_obj.ObjectName = elem.object_name
+            # 对象名称的命名规则：
+            # 1、条码对象以"barcode"开头，如"barcode-01"，"barcode-02"...
+            # 2、文字对象以"text"开头，如"text-01"，"text-02"...
+            # 3、直线对象以"line"开头，如"line-01"，"line-02"...
+            # 4、矩形对象以"rectangle"开头，如"rectangle-01"，"rectangle-02"...
+            # 5、图片对象以"image"开头，如"image-01"，"image-02"...
+            # 6、RFID对象以"rfiduhf"开头，如"rfiduhf-01"，"rfiduhf-02"...注意：超高频和高频的对象名称都是以"rfiduhf"开头
+
+            # 根据 Python 对象的类型设置 .NET 对象属性
+            if isinstance(elem, TextElement):
+                # ObjectName 在C#示例中似乎包含类型信息，如 "text-01"
+                # 但 DLL 文档中 ObjectName 好像只是标识符。此处遵循 C# 示例给 object_name 赋值。
+                dotnet_obj.objectdata = elem.data
+                dotnet_obj.Xposition = elem.x
+                dotnet_obj.Yposition = elem.y
+                dotnet_obj.textfont = elem.font_name
+                dotnet_obj.fontsize = elem.font_size
+                dotnet_obj.fontstyle = elem.font_style
+                dotnet_obj.direction = elem.direction
+                dotnet_obj.blackbackground = elem.black_background
+                dotnet_obj.chargap = elem.char_gap
+                dotnet_obj.charHZoom = elem.char_h_zoom
+                dotnet_obj.texttype = elem.text_type
+                dotnet_obj.texttextalign = elem.text_text_align
+                dotnet_obj.texttextvalign = elem.text_text_valign
+                dotnet_obj.textwidth = elem.text_width
+                dotnet_obj.textwidthbeyound = elem.text_width_beyound
+                dotnet_obj.linegapindex = elem.line_gap_index
+                dotnet_obj.linegap = elem.line_gap
+                dotnet_obj.circularradius = elem.circular_radius
+                dotnet_obj.textradian = elem.text_radian
+                dotnet_obj.textstartangle = elem.text_start_angle
+                dotnet_obj.rewindingdirection = elem.rewinding_direction
+                dotnet_obj.literaldirection = elem.literal_direction
+
+            elif isinstance(elem, BarcodeElement):
+                dotnet_obj.objectdata = elem.data
+                dotnet_obj.Xposition = elem.x
+                dotnet_obj.Yposition = elem.y
+                dotnet_obj.barcodekind = elem.barcode_type
+                dotnet_obj.barcodescale = elem.scale
+                dotnet_obj.direction = elem.direction
+
+                if elem.height is not None:  # 仅一维码设置
+                    dotnet_obj.barcodeheight = elem.height
+
+                dotnet_obj.textposition = elem.text_position
+                dotnet_obj.errorcorrection = elem.error_correction
+                dotnet_obj.charencoding = elem.char_encoding
+                dotnet_obj.qrversion = elem.qr_version
+                dotnet_obj.code39widthratio = elem.code39_width_ratio
+                dotnet_obj.code39startchar = elem.code39_start_char
+                dotnet_obj.barcodealign = elem.barcode_align
+                dotnet_obj.pdf417_rows = elem.pdf417_rows
+                dotnet_obj.pdf417_columns = elem.pdf417_columns
+                dotnet_obj.pdf417_rows_auto = elem.pdf417_rows_auto
+                dotnet_obj.pdf417_columns_auto = elem.pdf417_columns_auto
+                dotnet_obj.datamatrixShape = elem.datamatrix_shape
+                dotnet_obj.textoffset = elem.text_offset
+                dotnet_obj.textalign = elem.text_align
+                dotnet_obj.textfont = elem.text_font
+                dotnet_obj.fontsize = elem.text_font_size
+
+            elif isinstance(elem, ImageElement):
+                dotnet_obj.Xposition = elem.x
+                dotnet_obj.Yposition = elem.y
+                dotnet_obj.direction = elem.direction
+                dotnet_obj.transparent = elem.transparent
+
+                image_data = elem.image_data
+                if image_data:
+                    if elem.dither is not None:
+                        image_data = self._preprocess_image(elem, image_data)
+                    # 将 Python bytes 转换为 .NET byte[] (后端按内容缓存，同一图像只转换一次)
+                    dotnet_obj.imagedata = self.backend.byte_array(image_data)
+
+                dotnet_obj.aspectRatio = elem.aspect_ratio
+                dotnet_obj.hscale = elem.h_scale
+                dotnet_obj.vscale = elem.v_scale
+                dotnet_obj.imagefixedsize = elem.image_fixed_size
+                dotnet_obj.imagefixedwidth = elem.image_fixed_width
+                dotnet_obj.imagefixedheight = elem.image_fixed_height
+
+            elif isinstance(elem, RFIDElement):
+                dotnet_obj.objectdata = elem.data
+                dotnet_obj.RFIDEncodertype = elem.rfid_encoder_type
+                dotnet_obj.RFIDDatablock = elem.rfid_data_block if elem.data_block else 0
+                dotnet_obj.RFIDDatatype = elem.rfid_data_type
+                dotnet_obj.RFIDTextencoding = elem.rfid_text_encoding
+                dotnet_obj.DataAlignment = elem.data_alignment
+                dotnet_obj.RFIDerrortimes = elem.rfid_error_times
+                dotnet_obj.Datalengthdoublewords = elem.data_length_double_words
+
+                # HF相关属性
+                dotnet_obj.HFstartblock = elem.hf_start_block
+                dotnet_obj.HFmodulepower = elem.hf_module_power
+                dotnet_obj.Encrypt14443A = elem.encrypt_14443a
+                dotnet_obj.Sector14443A = elem.sector_14443a
+                dotnet_obj.KEYAB14443A = elem.keyab_14443a
+                dotnet_obj.KEYAnewpwd = elem.keya_new_pwd
+                dotnet_obj.KEYAoldpwd = elem.keya_old_pwd
+                dotnet_obj.KEYBnewpwd = elem.keyb_new_pwd
+                dotnet_obj.KEYBoldpwd = elem.keyb_old_pwd
+                dotnet_obj.Encrypt14443AControl = elem.encrypt_14443a_control
+                dotnet_obj.Encrypt14443AControlvalue = elem.encrypt_14443a_control_value
+                dotnet_obj.Controlarea15693 = elem.control_area_15693
+                dotnet_obj.Controlvalue15693 = elem.control_value_15693
+
+            elif isinstance(elem, ShapeElement):
+                dotnet_obj.startXposition = elem.start_x_position
+                dotnet_obj.startYposition = elem.start_y_position
+                dotnet_obj.endXposition = elem.end_x_position
+                dotnet_obj.endYposition = elem.end_y_position
+                dotnet_obj.lineWidth = elem.line_width
+                dotnet_obj.lineDashStyle = elem.line_dash_style
+                dotnet_obj.fillRectangle = elem.fill_rectangle
+                dotnet_obj.lineclass = elem.line_class
+                if elem.rectangle_class is not None:
+                    dotnet_obj.rectangleclass = elem.rectangle_class
+                dotnet_obj.objectclass = elem.object_class
+
+            return dotnet_obj
         except (TypeError, ValueError, AttributeError) as e:
             raise ZMPrinterConfigError(
                 f"处理标签元素 '{getattr(elem, 'object_name', '未知')}' 时数据无效: {e}", original_exception=e
             )
 
-    def _convert_bitmap_to_pil(self, dotnet_bitmap: "DotNetBitmap") -> Optional["Image.Image"]:
-        """将 .NET Bitmap 转换为 PIL Image 对象"""
+    @instrumented("convert.image")
+    def _preprocess_image(self, elem: ImageElement, image_data: bytes) -> bytes:
+        """按打印机 DPI 和元素的固定尺寸预处理图像，失败时记录警告并使用原图"""
+        dpi = self._image_dpi or (self.printer_config.dpi if self.printer_config else 300)
+        self._converted_image_dpi[elem] = dpi
+        try:
+            return get_image_store().preprocess(
+                image_data,
+                dpi,
+                elem.dither,
+                elem.image_fixed_width if elem.image_fixed_size else None,
+                elem.image_fixed_height if elem.image_fixed_size else None,
+                elem.aspect_ratio,
+            )
+        except Exception as e:
+            logger.warning(f"预处理图像 '{elem.object_name}' 失败，使用原图: {e}")
+            return image_data
+
+    def _use_image_dpi(self, printer_config: PrinterConfig, elements: List[LabelElementType]):
+        """设置图像预处理使用的 DPI；以其他 DPI 转换过的图像元素的转换缓存失效"""
+        self._image_dpi = dpi = printer_config.dpi
+        for elem in elements:
+            if isinstance(elem, ImageElement) and elem.dither is not None:
+                if self._converted_image_dpi.get(elem, dpi) != dpi:
+                    self._conversion_cache.invalidate(elem)
+
+    @instrumented("convert.element_list")
+    def _create_dotnet_object_list(self, elements: List[LabelElementType]) -> object:
+        """将 Python LabelElement 列表转换为 .NET List<LabelObject>"""
+        return self.backend.new_object_list(self._create_dotnet_object(elem) for elem in elements)
+
+    @instrumented("convert.elements")
+    def _get_dotnet_object_list(self, elements: List[LabelElementType]) -> object:
+        """
+        获取元素列表对应的 .NET List<LabelObject>，复用转换缓存。
+        只有内容发生变化的元素才会重新转换；若所有元素均未变化，则直接复用上一次的 .NET 列表。
+        """
+        dotnet_objects = [self._conversion_cache.get(elem, self._create_dotnet_object) for elem in elements]
+
+        if self._last_object_list is not None:
+            last_objects, last_list = self._last_object_list
+            if len(last_objects) == len(dotnet_objects) and all(a is b for a, b in zip(last_objects, dotnet_objects)):
+                return last_list
+
+        dotnet_list = self.backend.new_object_list(dotnet_objects)
+        self._last_object_list = (dotnet_objects, dotnet_list)
+        return dotnet_list
+
+    def _get_dotnet_configs(self, printer_config: PrinterConfig, label_config: LabelConfig) -> Tuple[object, object]:
+        """获取 (ZMPrinter, ZMLabel)，复用转换缓存。批量读取标签等重复调用不会每次重新转换配置"""
+        dotnet_printer = self._conversion_cache.get(printer_config, self._create_dotnet_printer)
+        dotnet_label = self._conversion_cache.get(label_config, self._create_dotnet_label)
+        return dotnet_printer, dotnet_label
+
+    @instrumented("convert.payload")
+    def _get_dotnet_payload(
+        self, printer_config: PrinterConfig, label_config: LabelConfig, elements: List[LabelElementType]
+    ) -> Tuple[object, object, object]:
+        """
+        获取一次打印/预览所需的 .NET 对象 (ZMPrinter, ZMLabel, List<LabelObject>)。
+        转换结果会被缓存，仅在配置或元素内容发生变化时重新转换。
+        """
+        with self._lock:
+            dotnet_printer, dotnet_label = self._get_dotnet_configs(printer_config, label_config)
+            self._use_image_dpi(printer_config, elements)
+            dotnet_elements = self._get_dotnet_object_list(elements)
+        return dotnet_printer, dotnet_label, dotnet_elements
+
+    def enable_preview_cache(self, max_bytes: int = 64 * 1024 * 1024) -> PreviewCache:
+        """
+        启用预览图缓存。
+        :param max_bytes: 缓存可占用的最大字节数
+        :return: 新建的 PreviewCache，可通过其 hits / misses / stats() 查看命中情况
+        """
+        self.preview_cache = PreviewCache(max_bytes=max_bytes)
+        return self.preview_cache
+
+    def clear_conversion_cache(self):
+        """清空 Python 对象到 .NET 对象的转换缓存"""
+        with self._lock:
+            self._conversion_cache.clear()
+            self._last_object_list = None
+
+    @instrumented("convert.bitmap")
+    def _convert_bitmap_to_pil(self, dotnet_bitmap: Any) -> Optional["Image.Image"]:
+        """将后端返回的 Bitmap 转换为 PIL Image 对象"""
         if dotnet_bitmap is None:
             return None
         try:
-            stream = MemoryStream()
-            # 以 PNG 格式保存到内存流，PNG 支持透明度且无损
-            dotnet_bitmap.Save(stream, ImageFormat.Png)
-            stream.Seek(0, System.IO.SeekOrigin.Begin)  # 重置流位置
-            # 从内存流中读取 bytes
-            image_bytes = stream.ToArray()
-            stream.Close()
-            # 使用 PIL 从 bytes 创建 Image 对象
-            pil_image = Image.open(io.BytesIO(image_bytes))
-            # 返回 PIL Image 对象（如果需要，可以 pil_image.copy() 防止原始 bytes 被回收）
-            return pil_image.copy()
+            return self.backend.bitmap_to_image(dotnet_bitmap)
         except Exception as e:
             logger.error(f"转换 Bitmap 到 PIL Image 失败: {e}")
             raise ZMPrinterDataError("转换 .NET Bitmap 到 PIL Image 失败", original_exception=e)
-        finally:
-            # 确保释放 .NET Bitmap 对象
-            if dotnet_bitmap is not None:
-                dotnet_bitmap.Dispose()
 
+    @instrumented("sdk.preview_label")
     def preview_label(
         self,
         elements: List[LabelElementType],
@@ -356,21 +446,34 @@ class LabelPrinterSDK:
             label_config = self.label_config
             if label_config is None:
                 raise ZMPrinterCommandError("标签配置对象为空")
+
+        cache_key = None
+        if self.preview_cache is not None:
+            cache_key = content_digest(printer_config, label_config, elements)
+            cached_image = self.preview_cache.get(cache_key)
+            if cached_image is not None:
+                return cached_image
+
         try:
-            dotnet_printer = self._create_dotnet_printer(printer_config)
-            dotnet_label = self._create_dotnet_label(label_config)
-            dotnet_elements = self._create_dotnet_object_list(elements)
+            dotnet_printer, dotnet_label, dotnet_elements = self._get_dotnet_payload(
+                printer_config, label_config, elements
+            )
 
             # 调用 DLL 的 GetLabelImage 方法
-            dotnet_bitmap = self.print_utility.GetLabelImage(
-                dotnet_printer, dotnet_label, dotnet_elements, 0
+            dotnet_bitmap = self._dll(
+                "dll.GetLabelImage", self.backend.get_label_image, dotnet_printer, dotnet_label, dotnet_elements, 0
             )  # 0 表示无边框
 
             # 转换 Bitmap 为 PIL Image
-            return self._convert_bitmap_to_pil(dotnet_bitmap)
+            pil_image = self._convert_bitmap_to_pil(dotnet_bitmap)
+            if cache_key is not None and pil_image is not None:
+                self.preview_cache.put(cache_key, pil_image)
+                return pil_image.copy()
+            return pil_image
         except Exception as e:
             raise ZMPrinterCommandError(f"生成标签预览失败: {e}", original_exception=e)
 
+    @instrumented("sdk.print_label")
     def print_label(
         self,
         elements: List[LabelElementType],
@@ -382,7 +485,8 @@ class LabelPrinterSDK:
         """
         打印标签。
         :param elements: 标签元素列表
-        :param copies: 打印份数。注意：DLL 的 PrintLabel 本身打印一张，循环在 Python 层完成。
+        :param copies: 打印份数。注意：DLL 的 PrintLabel 本身打印一张，循环在 Python 层完成，
+                       .NET 对象只转换一次并在各份之间复用。
         :param stop_at_error: 是否在遇到错误时停止打印。
         :param printer_config: 打印机配置对象
         :param label_config: 标签配置对象
@@ -400,20 +504,32 @@ class LabelPrinterSDK:
         if copies < 1:
             return "Error: 打印份数必须至少为 1", 0
 
+        # 每个打印任务只转换一次 .NET 对象，所有份数复用同一组对象
+        try:
+            dotnet_printer, dotnet_label, dotnet_elements = self._get_dotnet_payload(
+                printer_config, label_config, elements
+            )
+        except Exception as e:
+            error_msg = f"转换打印数据时发生 Python 异常: {e}"
+            logger.exception(error_msg)
+            return f"Error: {error_msg}", 0
+
+        return self._print_dotnet(dotnet_printer, dotnet_label, dotnet_elements, copies, stop_at_error)
+
+    def _print_dotnet(
+        self, dotnet_printer: object, dotnet_label: object, dotnet_elements: object, copies: int, stop_at_error: bool
+    ) -> Tuple[str, int]:
+        """使用已转换的 .NET 对象循环调用 PrintLabel，返回 (final_result, finished_count)"""
         final_result = "OK"  # 假设成功
         finished_count = 0
 
         for i in range(copies):
             logger.debug(f"准备打印第 {i + 1}/{copies} 张...")
             try:
-                dotnet_printer = self._create_dotnet_printer(printer_config)
-                dotnet_label = self._create_dotnet_label(label_config)
-                dotnet_elements = self._create_dotnet_object_list(elements)
-
                 # 调用 DLL 的 PrintLabel 方法
-                # C# 方法签名: string PrintLabel(ZMPrinter printer, ZMLabel label, List<LabelObject> elements, bool firstlabel, bool lastlabel)
-                # 分析源码后发现 firstlabel 和 lastlabel 并未实际使用
-                return_msg = self.print_utility.PrintLabel(dotnet_printer, dotnet_label, dotnet_elements, True, True)
+                return_msg = self._dll(
+                    "dll.PrintLabel", self.backend.print_label, dotnet_printer, dotnet_label, dotnet_elements
+                )
 
                 if isinstance(return_msg, str) and return_msg.startswith("Error:"):
                     logger.error(f"打印第 {i + 1} 张时出错: {return_msg}")
@@ -432,26 +548,201 @@ class LabelPrinterSDK:
 
         return final_result, finished_count
 
+    def compile_template(
+        self,
+        elements: List[LabelElementType],
+        slots: Optional[Iterable[str]] = None,
+        printer_config: Optional[PrinterConfig] = None,
+        label_config: Optional[LabelConfig] = None,
+    ) -> LabelTemplate:
+        """
+        将标签元素编译为模板：所有元素只转换为 .NET 对象一次，之后每次打印只更新变量槽位的 objectdata。
+        :param elements: 标签元素列表
+        :param slots: 变量槽位名称 (元素 object_name)。为 None 时所有文本、条码和 RFID 元素都作为槽位。
+        :param printer_config: 打印机配置对象
+        :param label_config: 标签配置对象
+        :return: LabelTemplate 对象
+        """
+        if printer_config is None:
+            printer_config = self.printer_config
+            if printer_config is None:
+                raise ZMPrinterCommandError("打印机配置对象为空")
+        if label_config is None:
+            label_config = self.label_config
+            if label_config is None:
+                raise ZMPrinterCommandError("标签配置对象为空")
+
+        # 模板独占自己的 .NET 对象，不与转换缓存共享，避免槽位修改影响其他打印任务
+        with self._lock:
+            self._use_image_dpi(printer_config, elements)
+            return LabelTemplate(
+                elements,
+                printer_config,
+                label_config,
+                self._create_dotnet_printer(printer_config),
+                self._create_dotnet_label(label_config),
+                self._create_dotnet_object_list(elements),
+                slots=slots,
+            )
+
+    @instrumented("sdk.print_template")
+    def print_template(
+        self,
+        template: LabelTemplate,
+        values: Optional[Mapping[str, str]] = None,
+        copies: int = 1,
+        stop_at_error: bool = True,
+    ) -> Tuple[str, int]:
+        """
+        使用编译后的模板打印标签。
+        :param template: compile_template() 返回的模板
+        :param values: 打印前需要更新的槽位数据 {槽位名称: 数据}
+        :param copies: 打印份数
+        :param stop_at_error: 是否在遇到错误时停止打印。
+        :return: 一个元组 (final_result, finished_count)。
+        """
+        if copies < 1:
+            return "Error: 打印份数必须至少为 1", 0
+
+        if values:
+            missing = template.update_many(values)
+            if missing:
+                logger.warning(f"模板中找不到以下变量槽位，已忽略: {', '.join(missing)}")
+
+        return self._print_dotnet(
+            template.dotnet_printer, template.dotnet_label, template.dotnet_elements, copies, stop_at_error
+        )
+
+    def iter_print_batch(
+        self,
+        template: Union[LabelTemplate, List[LabelElementType]],
+        records: Iterable[Mapping[str, Any]],
+        copies: int = 1,
+        stop_at_error: bool = False,
+    ) -> Iterator[BatchResult]:
+        """
+        逐条打印可变数据记录，并逐条产出打印结果。
+        records 会被惰性消费 (可以是生成器)，任意时刻只有当前一条记录在内存中。
+        注意：这是一个生成器，只有在迭代返回值时才会实际打印。
+        :param template: compile_template() 返回的模板，或标签元素列表 (将使用 SDK 默认配置编译为模板)
+        :param records: 记录序列，每条记录是 {槽位名称: 数据} 的映射
+        :param copies: 每条记录的打印份数
+        :param stop_at_error: 是否在某条记录打印失败后停止后续记录
+        :return: BatchResult 迭代器
+        """
+        if copies < 1:
+            raise ZMPrinterConfigError("打印份数必须至少为 1")
+        if not isinstance(template, LabelTemplate):
+            template = self.compile_template(template)
+
+        for index, record in enumerate(records):
+            missing = template.update_many(record)
+            if missing:
+                logger.warning(f"第 {index + 1} 条记录中的字段在模板中不存在，已忽略: {', '.join(missing)}")
+
+            final_result, finished_count = self._print_dotnet(
+                template.dotnet_printer, template.dotnet_label, template.dotnet_elements, copies, True
+            )
+            result = BatchResult(index, final_result, finished_count, missing)
+            yield result
+
+            if stop_at_error and not result.ok:
+                logger.error(f"第 {index + 1} 条记录打印失败，停止批量打印: {final_result}")
+                break
+
+    def print_batch(
+        self,
+        template: Union[LabelTemplate, List[LabelElementType]],
+        records: Iterable[Mapping[str, Any]],
+        copies: int = 1,
+        stop_at_error: bool = False,
+        on_result: Optional[Callable[[BatchResult], None]] = None,
+    ) -> Tuple[int, int]:
+        """
+        批量打印可变数据记录。配置和静态元素只转换一次，每条记录只更新模板的变量槽位。
+        records 会被惰性消费，适合从生成器、数据库游标或大文件中流式读取记录。
+        :param template: compile_template() 返回的模板，或标签元素列表 (将使用 SDK 默认配置编译为模板)
+        :param records: 记录序列，每条记录是 {槽位名称: 数据} 的映射
+        :param copies: 每条记录的打印份数
+        :param stop_at_error: 是否在某条记录打印失败后停止后续记录
+        :param on_result: 每条记录打印完成后的回调，参数为 BatchResult
+        :return: 一个元组 (succeeded_count, failed_count)，按记录计数
+        """
+        succeeded = 0
+        failed = 0
+        for result in self.iter_print_batch(template, records, copies=copies, stop_at_error=stop_at_error):
+            if result.ok:
+                succeeded += 1
+            else:
+                failed += 1
+            if on_result is not None:
+                on_result(result)
+
+        logger.info(f"批量打印完成: 成功 {succeeded} 条，失败 {failed} 条")
+        return succeeded, failed
+
+    @instrumented("sdk.preview_template")
+    def preview_template(
+        self, template: LabelTemplate, values: Optional[Mapping[str, str]] = None
+    ) -> Optional["Image.Image"]:
+        """
+        使用编译后的模板生成标签预览图。
+        :param template: compile_template() 返回的模板
+        :param values: 预览前需要更新的槽位数据 {槽位名称: 数据}
+        :return: PIL Image 对象，如果生成失败则返回 None
+        """
+        if values:
+            missing = template.update_many(values)
+            if missing:
+                logger.warning(f"模板中找不到以下变量槽位，已忽略: {', '.join(missing)}")
+        try:
+            dotnet_bitmap = self._dll(
+                "dll.GetLabelImage",
+                self.backend.get_label_image,
+                template.dotnet_printer,
+                template.dotnet_label,
+                template.dotnet_elements,
+                0,
+            )  # 0 表示无边框
+            return self._convert_bitmap_to_pil(dotnet_bitmap)
+        except Exception as e:
+            raise ZMPrinterCommandError(f"生成模板预览失败: {e}", original_exception=e)
+
+    @instrumented("sdk.read_lsf")
     def read_lsf(
         self, lsf_file_path: str | Path
-    ) -> Tuple[Optional[PrinterConfig], Optional[LabelConfig], Optional[List[LabelElementType]], str]:
+    ) -> Tuple[Optional[PrinterConfig], Optional[LabelConfig], Optional[ElementCollection], str]:
         """
         读取 LSF 标签文件。
         :param lsf_file_path: LSF 文件的完整路径。
         :return: 一个元组 (printer_config, label_config, elements, status_message)。
-                 如果成功，返回解析出的配置和元素列表，状态消息为空字符串。
+                 如果成功，返回解析出的配置和元素集合 (ElementCollection，可直接用于打印和按名称更新)，
+                 状态消息为空字符串。
                  如果失败，返回 None, None, None 和错误消息。
         """
         try:
+            # 文件未变化时直接使用缓存的解析结果，跳过 OpenLabel 和 .NET 对象转换
+            stamp = None
+            if self.lsf_cache is not None:
+                stamp = self.lsf_cache.stamp(lsf_file_path)
+                cached = self.lsf_cache.get(stamp)
+                if cached is not None:
+                    cached_printer, cached_label, cached_elements = cached
+                    return cached_printer, cached_label, cached_elements, ""
+
             # 创建 .NET 对象的引用，LSFUtility.OpenLabel 会修改它们
-            dotnet_printer_ref = self.LabelPrinter.ZMPrinter()
-            dotnet_label_ref = self.LabelPrinter.ZMLabel()
-            dotnet_elements_ref = DotNetList[self.LabelPrinter.LabelObject]()
+            dotnet_printer_ref = self.backend.new_printer()
+            dotnet_label_ref = self.backend.new_label()
+            dotnet_elements_ref = self.backend.new_object_list()
 
             # 调用 OpenLabel。注意 pythonnet 如何处理 ref 参数 (通常直接传递对象即可，它会自动处理)
-            # C# 签名: string OpenLabel(string filename, ref ZMPrinter printer, ref ZMLabel label, ref List<LabelObject> elements)
-            status_message, _, _, elements_ref = self.lsf_utility.OpenLabel(
-                str(lsf_file_path), dotnet_printer_ref, dotnet_label_ref, dotnet_elements_ref
+            status_message, _, _, elements_ref = self._dll(
+                "dll.OpenLabel",
+                self.backend.open_label,
+                str(lsf_file_path),
+                dotnet_printer_ref,
+                dotnet_label_ref,
+                dotnet_elements_ref,
             )
 
             if isinstance(status_message, str) and status_message:  # 如果返回了非空字符串，表示有错误
@@ -461,7 +752,7 @@ class LabelPrinterSDK:
 
             # 转换 PrinterConfig
             # 注意：接口类型需要从 .NET 枚举转回 Python 枚举
-            interface_val = dotnet_printer_ref.printerinterface.value__  # 获取枚举的整数值
+            interface_val = self.backend.enum_value(dotnet_printer_ref.printerinterface)  # 获取枚举的整数值
             py_interface = PrinterStyle(interface_val)
             printer_config = PrinterConfig(
                 interface=py_interface,
@@ -615,7 +906,8 @@ class LabelPrinterSDK:
                         # LSF 不太可能直接包含 imagedata，但如果 DLL 解析后填充了，可以处理
                         py_element = ImageElement(
                             object_name=object_name,
-                            image_data=bytes(dotnet_obj.imagedata),  # .NET byte[] to Python bytes
+                            # .NET byte[] -> Python bytes，相同图像共享同一对象
+                            image_data=get_image_store().intern(bytes(dotnet_obj.imagedata)),
                             x=x_pos,
                             y=y_pos,
                             fixed_width=dotnet_obj.imagefixedwidth if dotnet_obj.imagefixedsize else None,
@@ -743,7 +1035,9 @@ class LabelPrinterSDK:
                 logger.exception("将 .NET LSF 对象转换为 Python 对象时出错")
                 raise ZMPrinterLSFError(f"解析 LSF 文件内部数据结构失败: {e}", original_exception=e)
 
-            return printer_config, label_config, elements, ""
+            if self.lsf_cache is not None:
+                self.lsf_cache.put(stamp, printer_config, label_config, elements)
+            return printer_config, label_config, ElementCollection(elements), ""
         except ZMPrinterLSFError:
             raise
         except FileNotFoundError as e:  # 如果 OpenLabel 不处理文件不存在的情况
@@ -755,11 +1049,14 @@ class LabelPrinterSDK:
         """
         更新标签元素列表(Python 对象列表)中指定名称的元素的数据。
         这主要用于在打印前修改从 LSF 文件读取或手动创建的元素。
-        :param elements: 标签元素列表 (Python 对象)
+        :param elements: 标签元素列表 (Python 对象)。传入 ElementCollection 时使用其索引，无需遍历。
         :param object_name: 要更新的元素的 object_name
         :param new_data: 新的数据值
         :return: True 如果找到并更新成功，False 如果未找到该元素
         """
+        if isinstance(elements, ElementCollection):
+            return elements.update(object_name, new_data)
+
         found = False
         for elem in elements:
             if elem.object_name == object_name:
@@ -805,7 +1102,8 @@ class LabelPrinterSDK:
         :param power: 读取功率 (0-25 dBm, 0 表示使用打印机当前设置)
         :param stop_position: 读取后标签停止位置 (0:原始, 1:撕纸, 2:打印, 3:写入)
         :param timeout: 超时时间 (毫秒)
-        :return: 读取到的数据 (成功)
+        :return: 读取到的数据 (成功)，未读到标签时为空字符串
+        :raises ZMPrinterRFIDReadError: DLL 返回错误
         """
         if printer_config is None:
             printer_config = self.printer_config
@@ -826,12 +1124,17 @@ class LabelPrinterSDK:
         ]:
             raise ZMPrinterConfigError("打印机接口必须兼容RFID才能读取UHF标签。")
         try:
-            dotnet_printer = self._create_dotnet_printer(printer_config)
-            dotnet_label = self._create_dotnet_label(label_config)
-
-            # C# 签名: string GetUHFTagData(ZMPrinter printer, ZMLabel label, int area, int power, int stopPosition, int timeout)
-            tag_data = self.print_utility.GetUHFTagData(
-                dotnet_printer, dotnet_label, area, power, stop_position, timeout
+            dotnet_printer, dotnet_label = self._get_dotnet_configs(printer_config, label_config)
+
+            tag_data = self._dll(
+                "dll.GetUHFTagData",
+                self.backend.get_uhf_tag_data,
+                dotnet_printer,
+                dotnet_label,
+                area,
+                power,
+                stop_position,
+                timeout,
             )
 
             if tag_data is None:
@@ -841,6 +1144,8 @@ class LabelPrinterSDK:
             else:
                 return tag_data
 
+        except ZMPrinterRFIDReadError:
+            raise
         except Exception as e:
             raise ZMPrinterRFIDError(f"读取 RFID 标签时发生 Python 异常: {e}", original_exception=e)
 
@@ -863,7 +1168,8 @@ class LabelPrinterSDK:
         :param power: 读取功率 (0: 12db, 1: 24db, 2: 36db, 3: 48db) - 文档中的值
         :param stop_position: 读取后标签停止位置 (0: 打印头下方, 1: 撕纸口) - 文档中的值
         :param timeout: 超时时间 (毫秒)
-        :return: 读取到的数据 (成功) 或 "Error: xxx" (失败) 或空字符串 (未读到)
+        :return: 读取到的数据 (成功) 或空字符串 (未读到)
+        :raises ZMPrinterRFIDReadError: DLL 返回错误
         """
         if printer_config is None:
             printer_config = self.printer_config
@@ -877,12 +1183,18 @@ class LabelPrinterSDK:
         if printer_config.interface not in [PrinterStyle.RFID_USB, PrinterStyle.RFID_NET]:  # 确认支持的接口类型
             raise ZMPrinterConfigError("打印机接口必须兼容RFID才能读取HF标签。")
         try:
-            dotnet_printer = self._create_dotnet_printer(printer_config)
-            dotnet_label = self._create_dotnet_label(label_config)
-
-            # C# 签名: string GetHFTagData(ZMPrinter printer, ZMLabel label, int protocol, int area, int power, int stopPosition, int timeout)
-            tag_data = self.print_utility.GetHFTagData(
-                dotnet_printer, dotnet_label, protocol, area, power, stop_position, timeout
+            dotnet_printer, dotnet_label = self._get_dotnet_configs(printer_config, label_config)
+
+            tag_data = self._dll(
+                "dll.GetHFTagData",
+                self.backend.get_hf_tag_data,
+                dotnet_printer,
+                dotnet_label,
+                protocol,
+                area,
+                power,
+                stop_position,
+                timeout,
             )
 
             if tag_data is None:
@@ -891,6 +1203,8 @@ class LabelPrinterSDK:
                 raise ZMPrinterRFIDReadError("读取 RFID 标签失败", dll_message=tag_data)
             else:
                 return tag_data
+        except ZMPrinterRFIDReadError:
+            raise
         except Exception as e:
             raise ZMPrinterRFIDError(f"读取 HF 标签时发生 Python 异常: {e}", original_exception=e)
 
@@ -915,10 +1229,14 @@ class LabelPrinterSDK:
             if label_config is None:
                 raise ZMPrinterCommandError("标签配置对象为空")
         try:
-            dotnet_printer = self._create_dotnet_printer(printer_config)
-            dotnet_label = self._create_dotnet_label(label_config)
-            # C# 签名: void PrintaBlankpage(ZMPrinter printer, ZMLabel label, int printErrorFlag)
-            self.print_utility.PrintaBlankpage(dotnet_printer, dotnet_label, 1 if print_error_mark else 0)
+            dotnet_printer, dotnet_label = self._get_dotnet_configs(printer_config, label_config)
+            self._dll(
+                "dll.PrintaBlankpage",
+                self.backend.print_blank_page,
+                dotnet_printer,
+                dotnet_label,
+                1 if print_error_mark else 0,
+            )
         except Exception as e:
             logger.exception(f"Error: 打印空白页时发生 Python 异常: {e}")
             raise ZMPrinterCommandError(f"打印空白页失败: {e}", original_exception=e)
@@ -931,59 +1249,27 @@ class LabelPrinterSDK:
                  status_code: 整数状态码 (见文档)
                  status_message: 状态码对应的描述或错误信息
         """
+        status = self.query_printer_status(printer_config)
+        return status.code, status.message
+
+    def query_printer_status(self, printer_config: Optional[PrinterConfig] = None) -> PrinterStatus:
+        """
+        获取打印机状态，包含状态码的类别和严重程度。
+        :param printer_config: 打印机配置
+        :return: PrinterStatus；调用 DLL 时发生 Python 异常时状态码为 -999
+        """
         if printer_config is None:
             printer_config = self.printer_config
             if printer_config is None:
                 raise ZMPrinterCommandError("打印机配置对象为空")
         try:
-            dotnet_printer = self._create_dotnet_printer(printer_config)
-            # C# 签名: int getPrinterStatusCode(ZMPrinter printer)
-            status_code = self.print_utility.getPrinterStatusCode(dotnet_printer)
-
-            status_message = "未知状态"
-            if status_code == 0:
-                status_message = "打印机正常待机"
-            elif status_code == 1:
-                status_message = "指令语法错误"
-            elif status_code == 4:
-                status_message = "正在打印"
-            elif status_code == 81:
-                status_message = "硬件故障"
-            elif status_code == 82:
-                status_message = "碳带出错"
-            elif status_code == 83:
-                status_message = "标签出错"
-            elif status_code == 88:
-                status_message = "打印机暂停状态"
-            elif status_code == 89:
-                status_message = "标签用完"
-            elif status_code == 90:
-                status_message = "RFID读写出错"
-            elif status_code == 91:
-                status_message = "RFID程序校准出错"
-            elif status_code == 92:
-                status_message = "RFID手动校准出错"
-            elif status_code == 96:
-                status_message = "剥纸器正在等待取走标签"
-            elif status_code == 99:
-                status_message = "打印机刚完成升级 (状态 99)"
-            elif status_code == 120:
-                status_message = "打印机刚完成升级 (状态 120)"
-            elif status_code == -101:
-                status_message = "打印机硬件路径为空 (未连接?)"
-            elif status_code == -102:
-                status_message = "打开USB设备出错 (未连接?)"
-            elif status_code == -103:
-                status_message = "从USB读取状态失败 (异常?)"
-            elif status_code == -104:
-                status_message = "从USB读取状态异常 (异常?)"
-            else:
-                status_message = f"未知状态码: {status_code}"
-
-            return status_code, status_message
+            dotnet_printer = self._conversion_cache.get(printer_config, self._create_dotnet_printer)
+            status_code = self._dll("dll.getPrinterStatusCode", self.backend.get_printer_status_code, dotnet_printer)
+            return lookup_status(status_code)
 
         except Exception as e:
-            return -999, f"Error: 获取状态时发生 Python 异常: {e}"  # 使用 -999 表示 SDK 内部错误
+            # 使用 -999 表示 SDK 内部错误
+            return lookup_status(INTERNAL_ERROR_CODE)._replace(message=f"Error: 获取状态时发生 Python 异常: {e}")
 
     def get_usb_printer_sn(self) -> List[str]:
         """
@@ -991,10 +1277,7 @@ class LabelPrinterSDK:
         :return: 包含序列号的字符串列表。
         """
         try:
-            # C# 签名: List<string> getUSBPrinterMainboardSN()
-            dotnet_sn_list = self.print_utility.getUSBPrinterMainboardSN()
-            # 将 .NET List<string> 转换为 Python list[str]
-            return [sn for sn in dotnet_sn_list]
+            return self._dll("dll.getUSBPrinterMainboardSN", self.backend.get_usb_printer_sn)
         except Exception as e:
             logger.exception(f"获取 USB SN 时发生异常: {e}")
             return []
@@ -1016,8 +1299,9 @@ class LabelPrinterSDK:
                 raise ZMPrinterCommandError("打印机配置对象为空")
         try:
             dotnet_printer = self._create_dotnet_printer(printer_config)
-            # C# 签名: string SetPrinterParams(ZMPrinter printer, string paramstring)
-            return_msg = self.print_utility.SetPrinterParams(dotnet_printer, command_string)
+            return_msg = self._dll(
+                "dll.SetPrinterParams", self.backend.set_printer_params, dotnet_printer, command_string
+            )
             return return_msg if return_msg is not None else ""
         except Exception as e:
             raise ZMPrinterCommandError(f"发送指令时发生 Python 异常: {e}", original_exception=e)
@@ -1,11 +1,10 @@
-import base64
-import binascii
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Dict, Any, Union, Literal, cast
+from typing import Optional, Dict, Any, Union, Literal, Iterable, List, Mapping, SupportsIndex, Tuple, cast
 
 from .utils import get_logger
-from .enums import BarcodeType, RFIDEncoderType, RFIDDataBlock, RFIDDataType
+from .enums import BarcodeType, RFIDEncoderType, RFIDDataBlock, RFIDDataType, ImageDither
+from .images import decode_image_data, file_key, get_image_store
 
 logger = get_logger(__name__)
 
@@ -231,27 +230,8 @@ class LabelElement:
 
         elif object_name.lower().startswith("image"):
             # --- Create ImageElement ---
-            img_data_raw = data.get("imagedata")
-            img_data_bytes = None
-
-            if isinstance(img_data_raw, str) and img_data_raw:
-                # Attempt to decode if it looks like base64
-                try:
-                    # Simple check: is it likely base64?
-                    if len(img_data_raw) % 4 == 0 and all(
-                        c in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=" for c in img_data_raw
-                    ):
-                        img_data_bytes = base64.b64decode(img_data_raw)
-                    else:
-                        logger.warning(
-                            f"警告: 'imagedata' for {object_name} is a non-empty string but doesn't look like base64. Ignoring."
-                        )
-                except binascii.Error:
-                    logger.warning(f"警告: Failed to decode base64 'imagedata' for {object_name}. Ignoring.")
-                except Exception as decode_err:
-                    logger.warning(f"警告: Error processing 'imagedata' for {object_name}: {decode_err}. Ignoring.")
-            elif isinstance(img_data_raw, bytes):  # If already bytes
-                img_data_bytes = img_data_raw
+            # 单次 C 层校验解码，相同图像数据在进程内只解码并保存一份
+            img_data_bytes = decode_image_data(data.get("imagedata"), object_name)
 
             if not img_data_bytes:
                 raise ValueError(f"ImageElement '{object_name}' 缺少图像数据或图像数据无效.")
@@ -414,6 +394,7 @@ class ImageElement(LabelElement):
         aspect_ratio: bool = True,  # 图片是否保持长宽比，默认是
         h_scale: int = 1,  # 横向缩放率百分比
         v_scale: int = 1,  # 竖向缩放率百分比
+        dither: Optional[ImageDither] = None,  # 按打印机 DPI 预缩放并转为黑白图像的方式，None 为不预处理
     ):
         super().__init__(object_name, x, y)
         self.element_type = "image"
@@ -422,16 +403,16 @@ class ImageElement(LabelElement):
         if not image_path and not image_data:
             raise ValueError("Must provide either image_path or image_data.")
 
+        self.image_path: Optional[str] = None
+        self._image_data: Optional[bytes] = None
         if image_path:
-            # 在 .NET 端加载图片可能更可靠，尤其是在处理路径时
-            # 或者在这里读取并传递 bytes
+            # 只记录路径，图像数据在转换时才读取；引用同一文件的元素共享一份数据
             try:
-                with open(image_path, "rb") as f:
-                    self.image_data = f.read()
-            except Exception as e:
+                self.image_path = file_key(image_path)[0]
+            except OSError as e:
                 raise IOError(f"Failed to read image file {image_path}: {e}")
         else:
-            self.image_data = image_data
+            self._image_data = image_data
 
         self.fixed_width = fixed_width
         self.fixed_height = fixed_height
@@ -441,6 +422,32 @@ class ImageElement(LabelElement):
         self.image_fixed_size = fixed_width is not None and fixed_height is not None  # 是否固定尺寸
         self.image_fixed_width = fixed_width if fixed_width else 0  # 图片固定宽度，单位是mm
         self.image_fixed_height = fixed_height if fixed_height else 0  # 图片固定高度，单位是mm
+        self.dither = dither
+
+    @property
+    def image_data(self) -> Optional[bytes]:
+        """图像数据；由 image_path 创建的元素在第一次访问时从共享的 ImageStore 读取"""
+        if self._image_data is None and self.image_path is not None:
+            try:
+                return get_image_store().load_file(self.image_path)
+            except OSError as e:
+                raise IOError(f"Failed to read image file {self.image_path}: {e}")
+        return self._image_data
+
+    @image_data.setter
+    def image_data(self, value: Optional[bytes]):
+        self._image_data = value
+        self.image_path = None
+
+    def _digest_state(self) -> Dict[str, Any]:
+        """用于内容摘要和转换缓存的状态：文件路径附带修改时间和大小，文件变化后摘要随之变化"""
+        state = self.__dict__.copy()
+        if self.image_path is not None:
+            try:
+                state["image_path"] = file_key(self.image_path)
+            except OSError:
+                pass
+        return state
 
 
 class RFIDElement(LabelElement):
@@ -564,3 +571,124 @@ class ShapeElement(LabelElement):
 
 
 LabelElementType = Union[TextElement, BarcodeElement, ImageElement, RFIDElement, ShapeElement]
+
+
+class ElementCollection(list):
+    """
+    带索引的标签元素列表。
+
+    在普通 list 的基础上维护 object_name 索引和 LSF 变量 sharename 索引，
+    按名称更新数据只需 O(1) 的查找。它本身就是 list，可以直接传给 print_label / preview_label 等方法。
+    注意：元素加入集合后如果直接修改了其 object_name 或 variables，需要调用 reindex() 重建索引。
+    """
+
+    def __init__(self, elements: Iterable[LabelElementType] = ()):
+        super().__init__(elements)
+        self.reindex()
+
+    def reindex(self):
+        """重建 object_name 和 sharename 索引"""
+        self._by_name: Dict[str, List[LabelElementType]] = {}
+        self._by_sharename: Dict[str, List[Tuple[LabelElementType, Dict[str, Any]]]] = {}
+        for elem in self:
+            self._index(elem)
+
+    def _index(self, elem: LabelElementType):
+        self._by_name.setdefault(elem.object_name, []).append(elem)
+        for var_info in getattr(elem, "variables", None) or ():
+            sharename = var_info.get("sharename")
+            if sharename:
+                self._by_sharename.setdefault(sharename, []).append((elem, var_info))
+
+    # ---- 维护索引的 list 方法 ----
+
+    def append(self, elem: LabelElementType):
+        super().append(elem)
+        self._index(elem)
+
+    def extend(self, elements: Iterable[LabelElementType]):
+        elements = list(elements)
+        super().extend(elements)
+        for elem in elements:
+            self._index(elem)
+
+    def insert(self, index: SupportsIndex, elem: LabelElementType):
+        super().insert(index, elem)
+        self._index(elem)
+
+    def __iadd__(self, elements: Iterable[LabelElementType]):
+        self.extend(elements)
+        return self
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self.reindex()
+
+    def __reduce__(self):
+        # list 的默认反序列化会在 __init__ 之前调用 append / extend，此时索引尚不存在
+        return type(self), (list(self),)
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.reindex()
+
+    def remove(self, elem: LabelElementType):
+        super().remove(elem)
+        self.reindex()
+
+    def pop(self, index: SupportsIndex = -1) -> LabelElementType:
+        elem = super().pop(index)
+        self.reindex()
+        return elem
+
+    def clear(self):
+        super().clear()
+        self.reindex()
+
+    # ---- 查询与更新 ----
+
+    def get(self, object_name: str) -> Optional[LabelElementType]:
+        """
+        按 object_name 获取元素。
+        :param object_name: 元素名称
+        :return: 第一个同名元素，不存在时返回 None
+        """
+        matches = self._by_name.get(object_name)
+        return matches[0] if matches else None
+
+    def names(self) -> List[str]:
+        """返回集合中所有元素的 object_name (去重，保持顺序)"""
+        return list(self._by_name)
+
+    def sharenames(self) -> List[str]:
+        """返回集合中所有 LSF 变量的 sharename (去重，保持顺序)"""
+        return list(self._by_sharename)
+
+    def update(self, object_name: str, new_data: str) -> bool:
+        """
+        更新指定名称的元素数据，以及所有 sharename 与之相同的 LSF 变量。
+        :param object_name: 元素的 object_name 或 LSF 变量的 sharename
+        :param new_data: 新的数据值
+        :return: True 如果找到并更新成功，False 如果未找到该元素或变量
+        """
+        found = False
+        for elem in self._by_name.get(object_name, ()):
+            elem.data = new_data
+            found = True
+            if elem.variables and not any(var_info.get("sharename") == object_name for var_info in elem.variables):
+                logger.warning(f"更新了元素 '{object_name}' 的主数据，但未找到同名的 LSF 变量进行更新。")
+
+        # LSF 文件中可能有多个对象使用相同的 '子字符串共享名称'
+        for _, var_info in self._by_sharename.get(object_name, ()):
+            var_info["data"] = new_data
+            found = True
+
+        return found
+
+    def update_many(self, values: Mapping[str, str]) -> List[str]:
+        """
+        一次性应用一整条记录的数据。
+        :param values: {object_name 或 sharename: 新数据} 映射
+        :return: 未找到的名称列表 (全部找到时为空列表)
+        """
+        return [name for name, new_data in values.items() if not self.update(name, new_data)]
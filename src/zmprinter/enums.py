@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class PrinterStyle(Enum):
@@ -63,3 +63,37 @@ class RFIDDataType(Enum):
     HEX = 1
     NDEF_URL = 2  # NDEF 网址链接 (HF/NFC)
     NDEF_TEXT = 3  # NDEF 纯文本 (HF/NFC)
+
+
+class ImageDither(Enum):
+    """图像预处理时转换为黑白 (1 位) 图像的方式"""
+
+    THRESHOLD = "threshold"  # 固定阈值二值化，适合线条图和 logo
+    FLOYD_STEINBERG = "floyd_steinberg"  # Floyd-Steinberg 误差扩散，适合照片
+    ORDERED = "ordered"  # 4x4 Bayer 有序抖动，图案规则，适合渐变
+
+
+class StatusCategory(Enum):
+    """打印机状态码的类别"""
+
+    READY = "ready"  # 正常待机
+    BUSY = "busy"  # 正在打印
+    PAUSED = "paused"  # 暂停
+    MEDIA = "media"  # 标签纸 (出错、用完、剥纸器等待取走)
+    RIBBON = "ribbon"  # 碳带
+    RFID = "rfid"  # RFID 读写和校准
+    HARDWARE = "hardware"  # 硬件故障
+    COMMAND = "command"  # 指令错误
+    FIRMWARE = "firmware"  # 固件升级
+    CONNECTIVITY = "connectivity"  # 连接 (未连接、USB 读写失败)
+    INTERNAL = "internal"  # SDK 内部错误
+    UNKNOWN = "unknown"  # 未登记的状态码
+
+
+class StatusSeverity(IntEnum):
+    """打印机状态的严重程度，可以直接比较大小"""
+
+    OK = 0  # 可以打印
+    INFO = 1  # 可以打印，但需要注意 (如剥纸器等待取走标签)
+    WARNING = 2  # 暂时不能打印，通常会自行恢复或只需简单操作
+    ERROR = 3  # 不能打印，需要人工处理
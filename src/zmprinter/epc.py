@@ -0,0 +1,279 @@
+import sys
+import binascii
+from array import array
+from typing import Any, Dict, Iterable, Iterator, Mapping, NamedTuple, Optional
+
+from .utils import get_logger
+from .enums import RFIDDataType
+from .elements import RFIDElement
+from .exceptions import ZMPrinterConfigError
+
+logger = get_logger(__name__)
+
+# SGTIN-96 头部
+SGTIN96_HEADER = 0x30
+# 序列号位数及最大值
+SGTIN96_SERIAL_BITS = 38
+SGTIN96_MAX_SERIAL = (1 << SGTIN96_SERIAL_BITS) - 1
+# 分区值 -> (厂商识别代码位数, 厂商识别代码十进制位数, 商品项目代码位数, 商品项目代码十进制位数)
+SGTIN96_PARTITIONS = (
+    (40, 12, 4, 1),
+    (37, 11, 7, 2),
+    (34, 10, 10, 3),
+    (30, 9, 14, 4),
+    (27, 8, 17, 5),
+    (24, 7, 20, 6),
+    (20, 6, 24, 7),
+)
+
+# 各数据区可写入的最大字数 (1 字 = 16 位 = 4 位十六进制)。EPC 区最大 496 位，USER 区大小取决于芯片
+EPC_MAX_WORDS = 31
+USER_MAX_WORDS = 32
+
+# 迭代时每次批量转换为十六进制的记录数
+_CHUNK = 4096
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class SGTIN96(NamedTuple):
+    """解码后的 SGTIN-96 EPC"""
+
+    filter_value: int  # 过滤值 (0-7)，1 表示 POS 贸易项目
+    company_prefix: str  # 厂商识别代码 (6-12 位数字)
+    item_reference: str  # 商品项目代码 (含指示符，1-7 位数字)
+    serial: int  # 序列号
+
+
+def _sgtin96_prefix(company_prefix: str, item_reference: str, filter_value: int) -> int:
+    """返回序列号位全为 0 的 SGTIN-96 整数值"""
+    if not (0 <= filter_value <= 7):
+        raise ZMPrinterConfigError(f"SGTIN-96 过滤值必须在 0-7 之间: {filter_value}")
+    if not company_prefix.isdigit() or not item_reference.isdigit():
+        raise ZMPrinterConfigError("厂商识别代码和商品项目代码必须是数字")
+    for partition, (company_bits, company_digits, item_bits, item_digits) in enumerate(SGTIN96_PARTITIONS):
+        if len(company_prefix) == company_digits:
+            break
+    else:
+        raise ZMPrinterConfigError(f"厂商识别代码必须是 6-12 位数字: {company_prefix}")
+    if len(item_reference) != item_digits:
+        raise ZMPrinterConfigError(
+            f"厂商识别代码为 {company_digits} 位时，商品项目代码必须是 {item_digits} 位数字: {item_reference}"
+        )
+    value = SGTIN96_HEADER
+    value = (value << 3) | filter_value
+    value = (value << 3) | partition
+    value = (value << company_bits) | int(company_prefix)
+    value = (value << item_bits) | int(item_reference)
+    return value << SGTIN96_SERIAL_BITS
+
+
+def encode_sgtin96(company_prefix: str, item_reference: str, serial: int, filter_value: int = 1) -> str:
+    """
+    编码单个 SGTIN-96 EPC。
+    :param company_prefix: 厂商识别代码 (6-12 位数字)
+    :param item_reference: 商品项目代码，含指示符 (与厂商识别代码共 13 位数字)
+    :param serial: 序列号 (0 - 2^38-1)
+    :param filter_value: 过滤值
+    :return: 24 位大写十六进制 EPC
+    """
+    if not (0 <= serial <= SGTIN96_MAX_SERIAL):
+        raise ZMPrinterConfigError(f"SGTIN-96 序列号超出范围: {serial}")
+    return f"{_sgtin96_prefix(company_prefix, item_reference, filter_value) | serial:024X}"
+
+
+def decode_sgtin96(epc: str) -> SGTIN96:
+    """
+    解码 SGTIN-96 EPC。
+    :param epc: 24 位十六进制 EPC
+    :return: SGTIN96
+    :raises ValueError: 不是有效的 SGTIN-96
+    """
+    value = int(epc, 16)
+    if len(epc.strip()) != 24 or value >> 88 != SGTIN96_HEADER:
+        raise ValueError(f"不是 SGTIN-96 EPC: {epc}")
+    filter_value = (value >> 85) & 0x7
+    partition = (value >> 82) & 0x7
+    if partition >= len(SGTIN96_PARTITIONS):
+        raise ValueError(f"无效的 SGTIN-96 分区值: {partition}")
+    company_bits, company_digits, item_bits, item_digits = SGTIN96_PARTITIONS[partition]
+    item_reference = (value >> SGTIN96_SERIAL_BITS) & ((1 << item_bits) - 1)
+    company_prefix = (value >> (SGTIN96_SERIAL_BITS + item_bits)) & ((1 << company_bits) - 1)
+    return SGTIN96(
+        filter_value,
+        f"{company_prefix:0{company_digits}d}",
+        f"{item_reference:0{item_digits}d}",
+        value & SGTIN96_MAX_SERIAL,
+    )
+
+
+class EPCBatch:
+    """
+    紧凑存储的一批 RFID 写入数据。
+
+    每条数据的十六进制形式为 head + 值的定长十六进制 + tail，head / tail 对所有记录相同，
+    值保存在一个 array('Q') 中 (每条 8 字节)，一百万条数据约占 8MB。
+    迭代时按块调用 binascii.hexlify 批量转换，不会逐条格式化或补零。
+    """
+
+    def __init__(self, values: array, digits: int, head: str = "", tail: str = ""):
+        """
+        :param values: 各记录的值 (array('Q'))
+        :param digits: 值部分的十六进制位数 (1-16)
+        :param head: 值之前的固定十六进制串
+        :param tail: 值之后的固定十六进制串
+        """
+        if not (1 <= digits <= 16):
+            raise ZMPrinterConfigError(f"值部分的十六进制位数必须在 1-16 之间: {digits}")
+        if values and max(values) >> (4 * digits):
+            raise ZMPrinterConfigError(f"值超出 {digits} 位十六进制的范围")
+        self.values = values
+        self.digits = digits
+        self.head = head.upper()
+        self.tail = tail.upper()
+
+    @property
+    def width(self) -> int:
+        """每条数据的十六进制长度"""
+        return len(self.head) + self.digits + len(self.tail)
+
+    @property
+    def nbytes(self) -> int:
+        """值数组占用的字节数"""
+        return self.values.itemsize * len(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> str:
+        return f"{self.head}{self.values[index]:0{self.digits}X}{self.tail}"
+
+    def __iter__(self) -> Iterator[str]:
+        for start in range(0, len(self.values), _CHUNK):
+            yield from self._chunk(start, min(start + _CHUNK, len(self.values)))
+
+    def _chunk(self, start: int, stop: int) -> Iterator[str]:
+        chunk = self.values[start:stop]
+        if _LITTLE_ENDIAN:
+            chunk.byteswap()
+        text = binascii.hexlify(chunk.tobytes()).upper().decode("ascii")
+        head, tail, skip = self.head, self.tail, 16 - self.digits
+        for offset in range(0, len(text), 16):
+            yield head + text[offset + skip : offset + 16] + tail
+
+    def records(self, slot: str, base: Optional[Iterable[Mapping[str, Any]]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        生成可直接传给 print_batch / iter_print_batch / RFIDEncodePipeline 的记录。
+        :param slot: RFID 元素 (模板槽位) 名称
+        :param base: 其他字段的记录序列，与本批数据逐条合并；数量以较短者为准
+        :return: {槽位名称: 数据} 迭代器
+        """
+        if base is None:
+            for data in self:
+                yield {slot: data}
+        else:
+            for record, data in zip(base, self):
+                merged = dict(record)
+                merged[slot] = data
+                yield merged
+
+    def fit(self, element: RFIDElement, max_words: Optional[int] = None) -> "EPCBatch":
+        """
+        按 RFID 元素的写入设置补齐并校验数据长度。
+        data_length_double_words 为 True 时补齐到 4 字节 (2 字) 的整数倍，
+        data_alignment 决定在后端 (0) 还是前端 (1) 补零。
+        补零只改变固定的 head / tail，不会逐条处理数据。
+        :param element: 写入数据的 RFID 元素
+        :param max_words: 数据区可写入的最大字数，默认 EPC 区 31 字、USER 区 32 字
+        :return: 新的 EPCBatch (共享值数组)
+        :raises ZMPrinterConfigError: 元素不是十六进制数据类型，或数据长度超出数据区容量
+        """
+        if element.rfid_data_type != RFIDDataType.HEX.value:
+            raise ZMPrinterConfigError(f"RFID 元素 {element.object_name} 的数据类型必须是 HEX")
+        if max_words is None:
+            max_words = USER_MAX_WORDS if element.rfid_data_block == 1 else EPC_MAX_WORDS
+        unit = 8 if element.data_length_double_words else 4
+        padding = "0" * (-self.width % unit)
+        head, tail = (
+            (padding + self.head, self.tail) if element.data_alignment == 1 else (self.head, self.tail + padding)
+        )
+        batch = EPCBatch(self.values, self.digits, head, tail)
+        if batch.width > max_words * 4:
+            area = "USER" if element.rfid_data_block == 1 else "EPC"
+            raise ZMPrinterConfigError(
+                f"RFID 元素 {element.object_name} 的数据长度 {batch.width // 4} 字超出 {area} 区容量 {max_words} 字"
+            )
+        return batch
+
+
+def _fit(batch: EPCBatch, element: Optional[RFIDElement]) -> EPCBatch:
+    if element is not None:
+        batch = batch.fit(element)
+    logger.debug(f"生成 {len(batch)} 条 RFID 数据，每条 {batch.width} 位十六进制，占用 {batch.nbytes} 字节")
+    return batch
+
+
+def sgtin96_batch(
+    company_prefix: str,
+    item_reference: str,
+    start_serial: int,
+    count: int,
+    filter_value: int = 1,
+    element: Optional[RFIDElement] = None,
+) -> EPCBatch:
+    """
+    生成连续序列号的 SGTIN-96 EPC。
+    :param company_prefix: 厂商识别代码 (6-12 位数字)
+    :param item_reference: 商品项目代码，含指示符
+    :param start_serial: 起始序列号
+    :param count: 数量
+    :param filter_value: 过滤值
+    :param element: 写入的 RFID 元素，指定时按其设置补齐并校验长度
+    :return: EPCBatch
+    """
+    if count < 0 or start_serial < 0 or start_serial + count - 1 > SGTIN96_MAX_SERIAL:
+        raise ZMPrinterConfigError(f"SGTIN-96 序列号范围无效: {start_serial} 起 {count} 个")
+    prefix = _sgtin96_prefix(company_prefix, item_reference, filter_value)
+    # 序列号只占低 38 位，连续序列号的低 64 位也是连续整数，可以直接由 range 构造
+    low = prefix & 0xFFFFFFFFFFFFFFFF
+    values = array("Q", range(low + start_serial, low + start_serial + count))
+    return _fit(EPCBatch(values, 16, head=f"{prefix >> 64:08X}"), element)
+
+
+def serial_batch(
+    start: int,
+    count: int,
+    digits: Optional[int] = None,
+    step: int = 1,
+    head: str = "",
+    tail: str = "",
+    element: Optional[RFIDElement] = None,
+) -> EPCBatch:
+    """
+    生成连续序列号的十六进制数据，例如 USER 区的流水号或自定义 EPC。
+    :param start: 起始值
+    :param count: 数量
+    :param digits: 序列号部分的十六进制位数 (1-16)，默认为容纳最大值所需的位数
+    :param step: 步长
+    :param head: 序列号之前的固定十六进制串
+    :param tail: 序列号之后的固定十六进制串
+    :param element: 写入的 RFID 元素，指定时按其设置补齐并校验长度
+    :return: EPCBatch
+    """
+    for name, text in (("head", head), ("tail", tail)):
+        try:
+            bytes.fromhex("0" * (len(text) % 2) + text)
+        except ValueError:
+            raise ZMPrinterConfigError(f"{name} 必须是十六进制字符串: {text}")
+    if count < 0 or start < 0 or step < 1:
+        raise ZMPrinterConfigError("序列号的起始值、数量和步长必须为正")
+    last = start + step * (count - 1) if count else start
+    if last >= 1 << 64:
+        raise ZMPrinterConfigError(f"序列号超出 64 位范围: {start} 起 {count} 个，步长 {step}")
+    if digits is None:
+        digits = max(1, (last.bit_length() + 3) // 4)
+    elif not (1 <= digits <= 16):
+        raise ZMPrinterConfigError(f"序列号的十六进制位数必须在 1-16 之间: {digits}")
+    elif last >> (4 * digits):
+        raise ZMPrinterConfigError(f"序列号最大值 {last:X} 超出 {digits} 位十六进制的范围")
+    values = array("Q", range(start, last + 1, step)) if count else array("Q")
+    return _fit(EPCBatch(values, digits, head, tail), element)
@@ -0,0 +1,293 @@
+import base64
+import binascii
+import io
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+
+from .utils import get_logger
+from .enums import ImageDither
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = get_logger(__name__)
+
+
+def file_key(path: Union[str, "os.PathLike[str]"]) -> Tuple[str, int, int]:
+    """
+    返回图像文件的身份标识 (绝对路径, 修改时间, 大小)，文件内容变化后标识随之变化。
+    :param path: 文件路径
+    :return: (path, mtime_ns, size)
+    :raises OSError: 文件不存在或无法访问
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+def image_digest(data: Union[bytes, bytearray, memoryview, str]) -> str:
+    """
+    计算图像数据 (或其 base64 文本) 的内容摘要。
+    :param data: 图像字节或 base64 字符串
+    :return: 十六进制摘要
+    """
+    if isinstance(data, str):
+        data = data.encode("ascii", "surrogateescape")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ImageStore:
+    """
+    按内容寻址的图像数据存储。
+
+    相同内容的图像 (无论来自哪个元素或哪个任务) 只解码一次、在内存中只保留一份 bytes 对象。
+    base64 文本按其摘要映射到解码结果，重复出现的 logo 不会再次解码；
+    图像文件按 路径+修改时间+大小 映射到内容，多个元素引用同一文件时只读取一次。
+    超出 max_bytes 时按最近最少使用淘汰。线程安全。
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        :param max_bytes: 保存的图像数据总大小上限 (字节)
+        """
+        self.max_bytes = max_bytes
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+        self._decoded: Dict[str, str] = {}  # base64 文本摘要 -> 图像内容摘要
+        self._files: Dict[Tuple[str, int, int], str] = {}  # 文件标识 -> 图像内容摘要
+        self._processed: Dict[Tuple[Any, ...], str] = {}  # (原图摘要, DPI, 尺寸, 抖动方式) -> 处理后图像摘要
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, data: bytes) -> bytes:
+        """
+        返回与 data 内容相同的共享 bytes 对象。
+        :param data: 图像字节
+        :return: 存储中的 bytes 对象
+        """
+        data = bytes(data)
+        return self._put(image_digest(data), data)
+
+    def decode(self, text: str) -> bytes:
+        """
+        解码 base64 图像数据，相同文本直接返回已解码的共享对象。
+        :param text: base64 字符串
+        :return: 图像字节
+        :raises binascii.Error: 不是有效的 base64
+        """
+        text_key = image_digest(text)
+        with self._lock:
+            digest = self._decoded.get(text_key)
+            data = self._images.get(digest) if digest is not None else None
+            if data is not None:
+                self._images.move_to_end(digest)
+                self.hits += 1
+                return data
+
+        # validate=True: 非 base64 字符直接报错，整个校验和解码都在 C 层完成
+        data = base64.b64decode(text, validate=True)
+        digest = image_digest(data)
+        data = self._put(digest, data)
+        with self._lock:
+            if digest in self._images:
+                self._decoded[text_key] = digest
+        return data
+
+    def load_file(self, path: Union[str, "os.PathLike[str]"]) -> bytes:
+        """
+        读取图像文件，文件未变化时直接返回已读取的共享对象。
+        :param path: 文件路径
+        :return: 图像字节
+        :raises OSError: 文件不存在或无法读取
+        """
+        key = file_key(path)
+        with self._lock:
+            digest = self._files.get(key)
+            data = self._images.get(digest) if digest is not None else None
+            if data is not None:
+                self._images.move_to_end(digest)
+                self.hits += 1
+                return data
+
+        with open(key[0], "rb") as f:
+            data = f.read()
+        digest = image_digest(data)
+        data = self._put(digest, data)
+        with self._lock:
+            if digest in self._images:
+                self._files[key] = digest
+        return data
+
+    def preprocess(
+        self,
+        data: bytes,
+        dpi: int,
+        dither: ImageDither = ImageDither.FLOYD_STEINBERG,
+        width_mm: Optional[float] = None,
+        height_mm: Optional[float] = None,
+        keep_aspect: bool = True,
+    ) -> bytes:
+        """
+        预处理图像，结果按 (原图内容, DPI, 尺寸, 抖动方式) 缓存，相同参数只处理一次。
+        参数含义见 preprocess_image。
+        :return: 1 位黑白 PNG 图像字节
+        """
+        key = (image_digest(data), dpi, width_mm, height_mm, keep_aspect, dither.value)
+        with self._lock:
+            digest = self._processed.get(key)
+            processed = self._images.get(digest) if digest is not None else None
+            if processed is not None:
+                self._images.move_to_end(digest)
+                self.hits += 1
+                return processed
+
+        processed = preprocess_image(data, dpi, dither, width_mm, height_mm, keep_aspect)
+        digest = image_digest(processed)
+        processed = self._put(digest, processed)
+        with self._lock:
+            if digest in self._images:
+                self._processed[key] = digest
+        return processed
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """按内容摘要获取图像数据，不存在时返回 None"""
+        with self._lock:
+            return self._images.get(digest)
+
+    def _put(self, digest: str, data: bytes) -> bytes:
+        with self._lock:
+            existing = self._images.get(digest)
+            if existing is not None:
+                self._images.move_to_end(digest)
+                self.hits += 1
+                return existing
+            self.misses += 1
+            if len(data) > self.max_bytes:
+                return data
+            self._images[digest] = data
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self.total_bytes -= len(evicted)
+            if len(self._decoded) + len(self._files) + len(self._processed) > 4 * len(self._images) + 64:
+                # 清理指向已淘汰图像的 base64 / 文件 / 预处理映射
+                self._decoded = {k: v for k, v in self._decoded.items() if v in self._images}
+                self._files = {k: v for k, v in self._files.items() if v in self._images}
+                self._processed = {k: v for k, v in self._processed.items() if v in self._images}
+            return data
+
+    def clear(self):
+        """清空存储"""
+        with self._lock:
+            self._images.clear()
+            self._decoded.clear()
+            self._files.clear()
+            self._processed.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中次数、图像数量和占用字节数"""
+        with self._lock:
+            return {"images": len(self._images), "bytes": self.total_bytes, "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+
+# 4x4 Bayer 矩阵对应的灰度阈值
+_BAYER_4X4 = ((0, 8, 2, 10), (12, 4, 14, 6), (3, 11, 1, 9), (15, 7, 13, 5))
+_BAYER_THRESHOLDS = tuple(bytes(int((v + 0.5) * 16) for v in row) for row in _BAYER_4X4)
+
+
+def _ordered_dither(gray: "Image.Image") -> "Image.Image":
+    from PIL import Image, ImageChops
+
+    width, height = gray.size
+    rows = [(row * (width // 4 + 1))[:width] for row in _BAYER_THRESHOLDS]
+    thresholds = Image.frombytes("L", gray.size, b"".join(rows[y % 4] for y in range(height)))
+    # 灰度高于阈值的像素为白色
+    return ImageChops.subtract(gray, thresholds).point(lambda v: 255 if v else 0, mode="1")
+
+
+def preprocess_image(
+    data: bytes,
+    dpi: int,
+    dither: ImageDither = ImageDither.FLOYD_STEINBERG,
+    width_mm: Optional[float] = None,
+    height_mm: Optional[float] = None,
+    keep_aspect: bool = True,
+) -> bytes:
+    """
+    将图像缩放到打印机 DPI 下的实际像素尺寸并转换为 1 位黑白图像。
+    打印机只能打印黑白点，预先处理后 DLL 不需要在每张标签上重复缩放和二值化，编组的数据量也更小。
+    :param data: 原始图像字节 (任意 Pillow 支持的格式)
+    :param dpi: 打印机分辨率
+    :param dither: 黑白转换方式
+    :param width_mm: 打印宽度 (毫米)，与 height_mm 同时指定时才缩放
+    :param height_mm: 打印高度 (毫米)
+    :param keep_aspect: 缩放时是否保持长宽比 (图像缩放到能放入目标尺寸的最大大小)
+    :return: 1 位黑白 PNG 图像字节
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as source:
+        image = source.convert("RGBA")
+    # 透明区域按白色 (不打印) 处理
+    background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+    background.alpha_composite(image)
+    gray = background.convert("L")
+
+    if width_mm and height_mm:
+        size = (max(1, round(width_mm * dpi / 25.4)), max(1, round(height_mm * dpi / 25.4)))
+        if keep_aspect:
+            gray = ImageOps.contain(gray, size, Image.Resampling.LANCZOS)
+        else:
+            gray = gray.resize(size, Image.Resampling.LANCZOS)
+
+    if dither == ImageDither.THRESHOLD:
+        mono = gray.point(lambda v: 255 if v >= 128 else 0, mode="1")
+    elif dither == ImageDither.ORDERED:
+        mono = _ordered_dither(gray)
+    else:
+        mono = gray.convert("1", dither=Image.Dither.FLOYDSTEINBERG)
+
+    output = io.BytesIO()
+    mono.save(output, format="PNG", dpi=(dpi, dpi))
+    return output.getvalue()
+
+
+_default_store = ImageStore()
+
+
+def get_image_store() -> ImageStore:
+    """返回进程内共享的默认 ImageStore"""
+    return _default_store
+
+
+def decode_image_data(raw: Any, object_name: str, store: Optional[ImageStore] = None) -> Optional[bytes]:
+    """
+    将 JSON 中的 imagedata 转为图像字节。
+    :param raw: base64 字符串或 bytes
+    :param object_name: 元素名称，用于日志
+    :param store: 使用的 ImageStore，默认为进程共享的存储
+    :return: 图像字节；数据为空或无效时返回 None (并记录警告)
+    """
+    if store is None:
+        store = _default_store
+    if isinstance(raw, str) and raw:
+        try:
+            return store.decode(raw)
+        except (binascii.Error, ValueError):
+            logger.warning(
+                f"警告: 'imagedata' for {object_name} is a non-empty string but doesn't look like base64. Ignoring."
+            )
+        except Exception as decode_err:
+            logger.warning(f"警告: Error processing 'imagedata' for {object_name}: {decode_err}. Ignoring.")
+        return None
+    if isinstance(raw, (bytes, bytearray)) and raw:
+        return store.intern(raw)
+    return None
@@ -0,0 +1,262 @@
+import time
+import bisect
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, TypeVar
+
+from .utils import get_logger
+from .exceptions import ZMPrinterDependencyError
+
+logger = get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# 禁用时复用的空上下文，避免每次调用都创建新对象
+_NULL_CONTEXT = nullcontext()
+
+# 默认的耗时直方图分桶 (秒)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Span(NamedTuple):
+    """一次阶段耗时记录"""
+
+    name: str  # 阶段名称，如 "convert.printer"、"dll.PrintLabel"
+    start_ns: int  # 开始时间 (Unix 纪元纳秒)
+    duration: float  # 耗时 (秒)
+    parent: Optional[str]  # 外层阶段名称
+    attributes: Dict[str, Any]  # 附加属性
+    error: Optional[str]  # 阶段内抛出的异常，正常结束时为 None
+
+    @property
+    def end_ns(self) -> int:
+        """结束时间 (Unix 纪元纳秒)"""
+        return self.start_ns + int(self.duration * 1e9)
+
+
+class SpanSink:
+    """耗时记录的接收端，子类实现 on_span"""
+
+    def on_span(self, span: Span):
+        raise NotImplementedError
+
+
+class CallbackSink(SpanSink):
+    """将每条耗时记录传给回调函数"""
+
+    def __init__(self, callback: Callable[[Span], None]):
+        self.callback = callback
+
+    def on_span(self, span: Span):
+        self.callback(span)
+
+
+class _StageMetrics:
+    """单个阶段的累计指标"""
+
+    __slots__ = ("count", "errors", "total", "max", "buckets")
+
+    def __init__(self, bucket_count: int):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * bucket_count
+
+
+class MetricsSink(SpanSink):
+    """
+    按阶段累计调用次数、错误次数和耗时直方图，可导出 Prometheus 文本格式。
+    线程安全。
+    """
+
+    def __init__(self, prefix: str = "zmprinter", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        :param prefix: 指标名称前缀
+        :param buckets: 耗时直方图的分桶上界 (秒)，需递增
+        """
+        self.prefix = prefix
+        self.bucket_bounds = tuple(buckets)
+        self._stages: Dict[str, _StageMetrics] = {}
+        self._lock = threading.Lock()
+
+    def on_span(self, span: Span):
+        with self._lock:
+            metrics = self._stages.get(span.name)
+            if metrics is None:
+                metrics = self._stages[span.name] = _StageMetrics(len(self.bucket_bounds))
+            metrics.count += 1
+            metrics.total += span.duration
+            if span.duration > metrics.max:
+                metrics.max = span.duration
+            if span.error is not None:
+                metrics.errors += 1
+            index = bisect.bisect_left(self.bucket_bounds, span.duration)
+            if index < len(self.bucket_bounds):
+                metrics.buckets[index] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        返回各阶段指标。
+        :return: {阶段名称: {"count", "errors", "total_seconds", "mean_seconds", "max_seconds"}}
+        """
+        with self._lock:
+            return {
+                name: {
+                    "count": m.count,
+                    "errors": m.errors,
+                    "total_seconds": m.total,
+                    "mean_seconds": m.total / m.count if m.count else 0.0,
+                    "max_seconds": m.max,
+                }
+                for name, m in self._stages.items()
+            }
+
+    def render(self) -> str:
+        """以 Prometheus 文本格式导出指标"""
+        p = self.prefix
+        lines = [
+            f"# TYPE {p}_stage_calls_total counter",
+            f"# TYPE {p}_stage_errors_total counter",
+            f"# TYPE {p}_stage_seconds histogram",
+        ]
+        with self._lock:
+            for name in sorted(self._stages):
+                m = self._stages[name]
+                label = f'stage="{name}"'
+                lines.append(f"{p}_stage_calls_total{{{label}}} {m.count}")
+                lines.append(f"{p}_stage_errors_total{{{label}}} {m.errors}")
+                cumulative = 0
+                for bound, bucket in zip(self.bucket_bounds, m.buckets):
+                    cumulative += bucket
+                    lines.append(f'{p}_stage_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'{p}_stage_seconds_bucket{{{label},le="+Inf"}} {m.count}')
+                lines.append(f"{p}_stage_seconds_sum{{{label}}} {m.total}")
+                lines.append(f"{p}_stage_seconds_count{{{label}}} {m.count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """清空所有指标"""
+        with self._lock:
+            self._stages.clear()
+
+
+class OpenTelemetrySink(SpanSink):
+    """
+    将耗时记录导出为 OpenTelemetry span (需要安装 opentelemetry-api)。
+    span 在阶段结束后按实际起止时间创建，外层阶段名称记录在 zmprinter.parent 属性中。
+    """
+
+    def __init__(self, tracer: Any = None, tracer_name: str = "zmprinter"):
+        """
+        :param tracer: OpenTelemetry Tracer，为 None 时通过 trace.get_tracer(tracer_name) 获取
+        :param tracer_name: 获取默认 Tracer 时使用的名称
+        """
+        try:
+            from opentelemetry import trace  # type: ignore
+        except ImportError as e:
+            raise ZMPrinterDependencyError(
+                "OpenTelemetrySink 需要 opentelemetry-api，请先安装: pip install opentelemetry-api",
+                original_exception=e,
+            )
+        self._trace = trace
+        self.tracer = tracer if tracer is not None else trace.get_tracer(tracer_name)
+
+    def on_span(self, span: Span):
+        attributes = dict(span.attributes)
+        if span.parent is not None:
+            attributes["zmprinter.parent"] = span.parent
+        otel_span = self.tracer.start_span(span.name, start_time=span.start_ns, attributes=attributes)
+        if span.error is not None:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=span.end_ns)
+
+
+class Instrumentation:
+    """
+    SDK 的阶段耗时埋点。
+
+    通过 span() 记录各阶段 (配置/元素转换、DLL 调用、位图转换) 的耗时并分发给所有 sink。
+    没有 sink 时 span() 直接返回空上下文，几乎没有额外开销。
+    """
+
+    def __init__(self, sinks: Optional[Sequence[SpanSink]] = None):
+        """
+        :param sinks: 初始的 sink 列表
+        """
+        self._sinks: List[SpanSink] = list(sinks or [])
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        """是否有 sink 接收记录"""
+        return bool(self._sinks)
+
+    def add_sink(self, sink: SpanSink) -> SpanSink:
+        """添加 sink 并返回它"""
+        self._sinks = self._sinks + [sink]
+        return sink
+
+    def remove_sink(self, sink: SpanSink):
+        """移除 sink"""
+        self._sinks = [s for s in self._sinks if s is not sink]
+
+    def span(self, name: str, **attributes: Any):
+        """
+        记录一个阶段的耗时。
+        :param name: 阶段名称
+        :param attributes: 附加属性
+        :return: 上下文管理器
+        """
+        if not self._sinks:
+            return _NULL_CONTEXT
+        return self._span(name, attributes)
+
+    @contextmanager
+    def _span(self, name: str, attributes: Dict[str, Any]) -> Iterator[None]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        error: Optional[str] = None
+        start_ns = time.time_ns()
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            self._emit(Span(name, start_ns, duration, parent, attributes, error))
+
+    def _emit(self, span: Span):
+        for sink in self._sinks:
+            try:
+                sink.on_span(span)
+            except Exception as e:
+                # 埋点不能影响打印流程
+                logger.warning(f"埋点 sink {type(sink).__name__} 处理 {span.name} 失败: {e}")
+
+
+def instrumented(stage: str) -> Callable[[F], F]:
+    """
+    方法装饰器：当实例的 instrumentation 启用时记录该方法的耗时。
+    :param stage: 阶段名称
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = self.instrumentation
+            if instrumentation is None or not instrumentation.enabled:
+                return func(self, *args, **kwargs)
+            with instrumentation.span(stage):
+                return func(self, *args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
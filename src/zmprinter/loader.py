@@ -0,0 +1,398 @@
+import json
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .utils import get_logger
+from .config import PrinterConfig, LabelConfig
+from .enums import PrinterStyle, BarcodeType, RFIDEncoderType, RFIDDataBlock, RFIDDataType
+from .elements import (
+    LabelElement,
+    TextElement,
+    BarcodeElement,
+    RFIDElement,
+    ShapeElement,
+    LabelElementType,
+    ElementCollection,
+)
+from .exceptions import ZMPrinterConfigError
+
+logger = get_logger(__name__)
+
+_MISSING: Any = object()
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+# 字段映射: (JSON 键, 构造参数/属性名, 类型转换函数, 默认值)
+# 默认值在编译时就按转换函数处理好，与 LabelElement.from_data 的默认值和转换规则保持一致
+FieldSpec = Tuple[str, str, Callable[[Any], Any], Any]
+
+
+def _compile(fields: Iterable[Tuple[str, str, Callable[[Any], Any], Any]]) -> Tuple[FieldSpec, ...]:
+    return tuple((key, name, coerce, coerce(default)) for key, name, coerce, default in fields)
+
+
+_TEXT_FIELDS = _compile(
+    [
+        ("textfont", "font_name", _identity, "黑体"),
+        ("fontsize", "font_size", float, 10.0),
+        ("fontstyle", "font_style", int, 0),
+        ("texttextalign", "text_align", int, 0),
+        ("texttextvalign", "text_valign", int, 0),
+        ("blackbackground", "black_background", bool, False),
+        ("chargap", "char_gap", float, 0),
+        ("charHZoom", "char_h_zoom", float, 1),
+        ("linegapindex", "line_gap_index", int, 0),
+        ("linegap", "line_gap", float, 0),
+        ("circularradius", "circular_radius", float, 2.0),
+        ("textradian", "text_radian", int, 360),
+        ("textstartangle", "text_start_angle", int, 0),
+        ("rewindingdirection", "rewinding_direction", int, 0),
+        ("literaldirection", "literal_direction", int, 0),
+    ]
+)
+
+_BARCODE_FIELDS = _compile(
+    [
+        ("barcodescale", "scale", float, 3),
+        ("textposition", "text_position", int, 0),
+        ("direction", "direction", int, 0),
+        ("errorcorrection", "error_correction", int, 0),
+        ("charencoding", "char_encoding", int, 0),
+        ("qrversion", "qr_version", int, 0),
+        ("code39widthratio", "code39_width_ratio", int, 3),
+        ("code39startchar", "code39_start_char", bool, True),
+        ("barcodealign", "barcode_align", int, 0),
+        ("pdf417_rows", "pdf417_rows", int, 0),
+        ("pdf417_columns", "pdf417_columns", int, 0),
+        ("pdf417_rows_auto", "pdf417_rows_auto", int, 3),
+        ("pdf417_columns_auto", "pdf417_columns_auto", int, 1),
+        ("datamatrixShape", "datamatrix_shape", int, 0),
+        ("textoffset", "text_offset", float, 0),
+        ("textalign", "text_align", int, 2),
+        ("textfont", "text_font", _identity, "黑体"),
+        ("fontsize", "text_font_size", float, 10.0),
+    ]
+)
+
+_RFID_FIELDS = _compile(
+    [
+        ("RFIDTextencoding", "rfid_text_encoding", int, 0),
+        ("RFIDerrortimes", "rfid_error_times", int, 2),
+        ("Datalengthdoublewords", "data_length_double_words", bool, False),
+        ("DataAlignment", "data_alignment", int, 0),
+        ("RFIDepccontrol", "rfid_epc_control", int, 0),
+        ("RFIDusercontrol", "rfid_user_control", int, 0),
+        ("RFIDtidcontrol", "rfid_tid_control", int, 0),
+        ("RFIDaccesspwdcontrol", "rfid_access_pwd_control", int, 0),
+        ("RFIDkillpwdcontrol", "rfid_kill_pwd_control", int, 0),
+        ("RFIDaccessnewpwd", "rfid_access_new_pwd", _identity, "00000000"),
+        ("RFIDaccessoldpwd", "rfid_access_old_pwd", _identity, "00000000"),
+        ("RFIDusekillpwd", "rfid_use_kill_pwd", bool, False),
+        ("RFIDkillpwd", "rfid_kill_pwd", _identity, "00000000"),
+        ("HFstartblock", "hf_start_block", int, 0),
+        ("HFmodulepower", "hf_module_power", int, 0),
+        ("Encrypt14443A", "encrypt_14443a", bool, False),
+        ("Sector14443A", "sector_14443a", int, 1),
+        ("KEYAB14443A", "keyab_14443a", int, 0),
+        ("KEYAnewpwd", "keya_new_pwd", _identity, ""),
+        ("KEYAoldpwd", "keya_old_pwd", _identity, "FFFFFFFFFFFF"),
+        ("KEYBnewpwd", "keyb_new_pwd", _identity, ""),
+        ("KEYBoldpwd", "keyb_old_pwd", _identity, "FFFFFFFFFFFF"),
+        ("Encrypt14443AControl", "encrypt_14443a_control", bool, False),
+        ("Encrypt14443AControlvalue", "encrypt_14443a_control_value", _identity, "FF078069"),
+        ("Controlarea15693", "control_area_15693", int, 0),
+        ("Controlvalue15693", "control_value_15693", _identity, "00"),
+    ]
+)
+
+_PRINTER_FIELDS = _compile(
+    [
+        ("printerdpi", "dpi", int, 300),
+        ("printSpeed", "speed", int, 4),
+        ("printDarkness", "darkness", int, 10),
+        ("labelhavegap", "has_gap", bool, True),
+        ("pageDirection", "page_direction", int, 1),
+        ("reverse", "reverse", bool, False),
+        ("printnum", "print_num", int, 1),
+        ("copynum", "copy_num", int, 1),
+    ]
+)
+
+_LABEL_FIELDS = _compile(
+    [
+        ("labelwidth", "width", float, 60.0),
+        ("labelheight", "height", float, 40.0),
+        ("labelrowgap", "gap", float, 2.0),
+        ("labelcolumngap", "column_gap", float, 2.0),
+        ("labelrownum", "row_num", int, 1),
+        ("labelcolumnnum", "column_num", int, 1),
+        ("leftoffset", "left_offset", float, 0.0),
+        ("topoffset", "top_offset", float, 0.0),
+        ("pageleftedges", "page_left_edges", float, 0.0),
+        ("pagerightedges", "page_right_edges", float, 0.0),
+        ("pagestartlocation", "page_start_location", int, 0),
+        ("pagelabelorder", "page_label_order", int, 0),
+        ("labelshape", "label_shape", int, 0),
+    ]
+)
+
+_BARCODE_TYPES = {barcode_type.value: barcode_type for barcode_type in BarcodeType}
+
+
+def _apply(data: Mapping[str, Any], fields: Tuple[FieldSpec, ...], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """按字段映射从 data 中取值并转换类型，写入 kwargs"""
+    get = data.get
+    for key, name, coerce, default in fields:
+        value = get(key, _MISSING)
+        kwargs[name] = default if value is _MISSING else coerce(value)
+    return kwargs
+
+
+def _enum_or_default(enum_cls: Any, value: Any, default: Any, field: str, object_name: str) -> Any:
+    try:
+        return enum_cls(int(value))
+    except ValueError:
+        logger.warning(f"警告: 无效的 {field} 值 for {object_name}. 使用默认 {default.name}.")
+        return default
+
+
+def _build_text(data: Mapping[str, Any], object_name: str, obj_data: Any, x: float, y: float) -> LabelElementType:
+    # C# texttype: 0=single, 1=paragraph, 2=circular
+    text_type = int(data.get("texttype", 0))
+    is_multiline = text_type == 1
+    kwargs = _apply(data, _TEXT_FIELDS, {"object_name": object_name, "data": obj_data, "x": x, "y": y})
+    kwargs["is_multiline"] = is_multiline
+    kwargs["width"] = float(data.get("textwidth", 30.0)) if is_multiline else None
+    kwargs["width_handling"] = int(data.get("textwidthbeyound", 0)) if is_multiline else 0
+    element = TextElement(**kwargs)
+    if text_type == 2:
+        element.text_type = 2
+    return element
+
+
+def _build_barcode(data: Mapping[str, Any], object_name: str, obj_data: Any, x: float, y: float) -> LabelElementType:
+    barcode_kind = data.get("barcodekind", "Code 128 Auto")
+    height_val = data.get("barcodeheight")
+    height = float(height_val) if height_val is not None and float(height_val) > 0 else None
+    kwargs = _apply(data, _BARCODE_FIELDS, {"object_name": object_name, "data": obj_data, "x": x, "y": y})
+    kwargs["barcode_type"] = _BARCODE_TYPES.get(barcode_kind, barcode_kind)
+    kwargs["height"] = height
+    return BarcodeElement(**kwargs)
+
+
+def _build_rfid(data: Mapping[str, Any], object_name: str, obj_data: Any, x: float, y: float) -> LabelElementType:
+    encoder_type = _enum_or_default(
+        RFIDEncoderType, data.get("RFIDEncodertype", 0), RFIDEncoderType.UHF, "RFIDEncodertype", object_name
+    )
+    data_block = None
+    if encoder_type == RFIDEncoderType.UHF:
+        data_block = _enum_or_default(
+            RFIDDataBlock, data.get("RFIDDatablock", 0), RFIDDataBlock.EPC, "RFIDDatablock", object_name
+        )
+    data_type = _enum_or_default(
+        RFIDDataType, data.get("RFIDDatatype", 0), RFIDDataType.HEX, "RFIDDatatype", object_name
+    )
+    kwargs = _apply(data, _RFID_FIELDS, {"object_name": object_name, "data": obj_data})
+    kwargs["rfid_encoder_type"] = encoder_type
+    kwargs["rfid_data_block"] = data_block
+    kwargs["rfid_data_type"] = data_type
+    return RFIDElement(**kwargs)
+
+
+def _build_shape(data: Mapping[str, Any], object_name: str, x: float, y: float, shape_type: str) -> ShapeElement:
+    element = ShapeElement(
+        object_name=object_name,
+        shape_type=shape_type,  # type: ignore[arg-type]
+        start_x=float(data.get("startXposition", x)),
+        start_y=float(data.get("startYposition", y)),
+        end_x=float(data.get("endXposition", x + 10)),
+        end_y=float(data.get("endYposition", y if shape_type == "line" else y + 5)),
+        line_width=float(data.get("lineWidth", 0.4)),
+    )
+    if "lineDashStyle" in data:
+        element.line_dash_style = int(data["lineDashStyle"])  # type: ignore[assignment]
+    if shape_type == "line":
+        if "lineclass" in data:
+            element.line_class = int(data["lineclass"])
+        element.object_class = 1
+    else:
+        if "fillRectangle" in data:
+            element.fill_rectangle = bool(data["fillRectangle"])
+        element.rectangle_class = int(data.get("rectangleclass", 0))
+        element.object_class = 2
+    return element
+
+
+def _build_line(data: Mapping[str, Any], object_name: str, obj_data: Any, x: float, y: float) -> LabelElementType:
+    return _build_shape(data, object_name, x, y, "line")
+
+
+def _build_rectangle(data: Mapping[str, Any], object_name: str, obj_data: Any, x: float, y: float) -> LabelElementType:
+    return _build_shape(data, object_name, x, y, "rectangle")
+
+
+# 按 ObjectName 前缀分派的构造函数，顺序与 LabelElement.from_data 一致
+_BUILDERS: Tuple[Tuple[str, Optional[Callable[..., LabelElementType]]], ...] = (
+    ("text", _build_text),
+    ("barcode", _build_barcode),
+    ("rfiduhf", _build_rfid),
+    ("line", _build_line),
+    ("rectangle", _build_rectangle),
+    ("image", None),  # 图片需要解码图像数据，交给 LabelElement.from_data 处理
+)
+
+
+def load_element(data: Mapping[str, Any]) -> LabelElementType:
+    """
+    从字典创建标签元素，结果与 LabelElement.from_data 相同，但使用预编译的字段映射。
+    :param data: LabelObjectList 中的一个元素字典
+    :return: LabelElement 子类对象
+    """
+    object_name = data.get("ObjectName")
+    if not object_name:
+        raise ValueError(f"警告: 跳过缺少 'ObjectName' 的元素数据: {data}")
+
+    prefix = object_name.lower()
+    for name, builder in _BUILDERS:
+        if prefix.startswith(name):
+            break
+    else:
+        raise ValueError(f"未知或不支持的 ObjectName 前缀: '{object_name}'.")
+
+    if builder is None:
+        return LabelElement.from_data(dict(data))
+
+    element = builder(
+        data,
+        object_name,
+        data.get("objectdata", ""),
+        float(data.get("Xposition", 3.0)),
+        float(data.get("Yposition", 3.0)),
+    )
+    element.direction = int(data.get("direction", 0))
+    element.transparent = bool(data.get("transparent", True))
+    return element
+
+
+def load_elements(objects: Iterable[Mapping[str, Any]], strict: bool = True) -> ElementCollection:
+    """
+    批量创建标签元素。
+    :param objects: LabelObjectList 元素字典序列
+    :param strict: True 时遇到无效元素抛出 ZMPrinterConfigError；False 时记录警告并跳过
+    :return: ElementCollection
+    """
+    elements = []
+    append = elements.append
+    for index, data in enumerate(objects):
+        try:
+            append(load_element(data))
+        except (TypeError, ValueError, AttributeError) as e:
+            if strict:
+                raise ZMPrinterConfigError(f"第 {index} 个元素无效: {e}", original_exception=e)
+            logger.warning(f"跳过第 {index} 个无效元素: {e}")
+    return ElementCollection(elements)
+
+
+def load_printer_config(data: Mapping[str, Any]) -> PrinterConfig:
+    """
+    从 JSON 文档的 "Printer" 部分创建 PrinterConfig。
+    :param data: 打印机配置字典，键名与 C# ZMPrinter 一致
+    :return: PrinterConfig
+    """
+    interface = data.get("printerinterface", "USB")
+    try:
+        interface_enum = PrinterStyle(interface) if isinstance(interface, int) else PrinterStyle[interface.upper()]
+    except (KeyError, ValueError, AttributeError):
+        logger.warning(f"无效的打印机接口类型 '{interface}'，使用 USB")
+        interface_enum = PrinterStyle.USB
+
+    kwargs = _apply(data, _PRINTER_FIELDS, {"interface": interface_enum})
+    kwargs["name"] = data.get("printername") or None
+    kwargs["ip_address"] = data.get("printernetip") or None
+    kwargs["mbsn"] = data.get("printermbsn") or None
+    return PrinterConfig(**kwargs)
+
+
+def load_label_config(data: Mapping[str, Any]) -> LabelConfig:
+    """
+    从 JSON 文档的 "LabelFormat" 部分创建 LabelConfig。
+    :param data: 标签配置字典，键名与 C# ZMLabel 一致
+    :return: LabelConfig
+    """
+    return LabelConfig(**_apply(data, _LABEL_FIELDS, {}))
+
+
+class LabelJob(NamedTuple):
+    """从 JSON 文档加载的打印任务"""
+
+    printer_config: PrinterConfig
+    label_config: LabelConfig
+    elements: ElementCollection
+    copies: int  # 打印份数 (Printer.printnum)
+    operate: Optional[str]  # 文档中的 Operate 字段，如 "print"
+
+
+def load_job(document: Union[Mapping[str, Any], str, bytes], strict: bool = True) -> LabelJob:
+    """
+    一次性加载包含 Printer / LabelFormat / LabelObjectList 的任务文档。
+    :param document: 已解析的字典或 JSON 文本
+    :param strict: 见 load_elements
+    :return: LabelJob
+    """
+    if isinstance(document, (str, bytes)):
+        document = json.loads(document)
+    if not isinstance(document, Mapping):
+        raise ZMPrinterConfigError(f"任务文档必须是 JSON 对象，实际为 {type(document).__name__}")
+
+    printer_config = load_printer_config(document.get("Printer") or {})
+    return LabelJob(
+        printer_config=printer_config,
+        label_config=load_label_config(document.get("LabelFormat") or {}),
+        elements=load_elements(document.get("LabelObjectList") or [], strict=strict),
+        copies=printer_config.print_num,
+        operate=document.get("Operate"),
+    )
+
+
+def load_jobs(source: Union[str, Path], strict: bool = True) -> List[LabelJob]:
+    """
+    从 JSON 文件加载任务，文件内容可以是单个任务文档或任务文档数组。
+    :param source: JSON 文件路径
+    :param strict: 见 load_elements
+    :return: LabelJob 列表
+    """
+    with open(source, "r", encoding="utf-8") as f:
+        document = json.load(f)
+    documents = document if isinstance(document, list) else [document]
+    return [load_job(doc, strict=strict) for doc in documents]
+
+
+def iter_jobs(source: Union[str, Path, IO[str], Iterable[str]], strict: bool = True) -> Iterator[LabelJob]:
+    """
+    以 JSON Lines 流式读取任务：每行一个任务文档，逐行解析并产出，内存占用与文件大小无关。
+    :param source: JSONL 文件路径、已打开的文本文件或字符串行的可迭代对象
+    :param strict: True 时遇到无法解析或配置无效的行抛出 ZMPrinterConfigError；False 时记录警告并跳过该行
+    :return: LabelJob 迭代器
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "r", encoding="utf-8") as f:
+            yield from iter_jobs(f, strict=strict)
+        return
+
+    for line_no, line in enumerate(source, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield load_job(line, strict=strict)
+        except (ValueError, TypeError, AttributeError, ZMPrinterConfigError) as e:
+            # TypeError / AttributeError 来自值为 null 或类型错误的配置项，如 "printerdpi": null
+            if strict:
+                if isinstance(e, ZMPrinterConfigError):
+                    raise
+                reason = "不是有效的 JSON" if isinstance(e, json.JSONDecodeError) else "的任务配置无效"
+                raise ZMPrinterConfigError(f"第 {line_no} 行{reason}: {e}", original_exception=e)
+            logger.warning(f"跳过第 {line_no} 行: {e}")
@@ -0,0 +1,219 @@
+import os
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .utils import get_logger
+from .config import PrinterConfig, LabelConfig
+from .elements import ImageElement, LabelElementType, ElementCollection
+from .images import get_image_store
+
+logger = get_logger(__name__)
+
+# 序列化格式版本，元素类的属性发生不兼容变化时递增，旧的磁盘缓存会被忽略
+CACHE_FORMAT = 1
+
+LSFResult = Tuple[PrinterConfig, LabelConfig, ElementCollection]
+
+
+class LSFStamp(NamedTuple):
+    """LSF 文件在某一时刻的身份标识"""
+
+    path: str  # 绝对路径
+    mtime_ns: int  # 修改时间 (纳秒)
+    size: int  # 文件大小 (字节)
+    digest: str  # 文件内容摘要
+
+
+class LSFCache:
+    """
+    已解析 LSF 模板的缓存 (内存 + 可选的磁盘目录)。
+
+    以 路径 + 修改时间 + 大小 + 内容摘要 标识文件，缓存 read_lsf 转换出的 PrinterConfig / LabelConfig / 元素，
+    再次打开未变化的模板时不需要调用 LSFUtility.OpenLabel，也不需要逐个转换 .NET 对象。
+    文件的修改时间和大小未变时直接复用已计算的摘要，不读取文件内容。
+
+    缓存以 pickle 序列化保存，每次读取都反序列化出新的对象，调用方可以随意修改返回的配置和元素。
+    磁盘缓存文件按内容摘要命名，内容相同的模板 (即使路径不同) 共享同一条目。
+    注意：磁盘缓存目录必须只有可信的进程可以写入。线程安全。
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None, max_entries: int = 512):
+        """
+        :param directory: 磁盘缓存目录，为 None 时只在内存中缓存。目录不存在时自动创建。
+        :param max_entries: 内存中最多保留的模板数量 (按最近最少使用淘汰)
+        """
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()  # 内容摘要 -> 序列化数据
+        self._stamps: Dict[str, LSFStamp] = {}  # 路径 -> 最近一次计算的标识
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def stamp(self, path: Union[str, Path]) -> Optional[LSFStamp]:
+        """
+        计算文件的当前标识。
+        :param path: LSF 文件路径
+        :return: LSFStamp；文件不存在或无法读取时返回 None
+        """
+        try:
+            abs_path = os.path.abspath(path)
+            st = os.stat(abs_path)
+            with self._lock:
+                known = self._stamps.get(abs_path)
+            if known is not None and known.mtime_ns == st.st_mtime_ns and known.size == st.st_size:
+                return known
+            with open(abs_path, "rb") as f:
+                digest = hashlib.blake2b(f.read(), digest_size=20).hexdigest()
+        except OSError:
+            return None
+
+        stamp = LSFStamp(abs_path, st.st_mtime_ns, st.st_size, digest)
+        with self._lock:
+            self._stamps[abs_path] = stamp
+        return stamp
+
+    def get(self, stamp: Optional[LSFStamp]) -> Optional[LSFResult]:
+        """
+        获取缓存的解析结果。
+        :param stamp: stamp() 返回的文件标识
+        :return: (printer_config, label_config, elements) 的新副本；未缓存时返回 None
+        """
+        if stamp is None:
+            return None
+        with self._lock:
+            payload = self._entries.get(stamp.digest)
+            if payload is not None:
+                self._entries.move_to_end(stamp.digest)
+                self.hits += 1
+
+        if payload is None:
+            payload = self._read_disk(stamp.digest)
+            if payload is None:
+                with self._lock:
+                    self.misses += 1
+                return None
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(stamp.digest, payload)
+
+        try:
+            return self._decode(payload)
+        except Exception as e:
+            logger.warning(f"LSF 缓存条目 {stamp.digest} 无法反序列化，已丢弃: {e}")
+            self.discard(stamp)
+            return None
+
+    def put(
+        self,
+        stamp: Optional[LSFStamp],
+        printer_config: PrinterConfig,
+        label_config: LabelConfig,
+        elements: List[LabelElementType],
+    ):
+        """
+        保存解析结果。
+        :param stamp: 解析前通过 stamp() 取得的文件标识，为 None 时不缓存
+        :param printer_config: 打印机配置
+        :param label_config: 标签配置
+        :param elements: 元素列表
+        """
+        if stamp is None:
+            return
+        payload = pickle.dumps((CACHE_FORMAT, printer_config, label_config, elements), protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(stamp.digest, payload)
+        self._write_disk(stamp.digest, payload)
+
+    def discard(self, stamp: LSFStamp):
+        """删除指定文件内容对应的缓存条目"""
+        with self._lock:
+            self._entries.pop(stamp.digest, None)
+        if self.directory is not None:
+            try:
+                self._disk_path(stamp.digest).unlink()
+            except OSError:
+                pass
+
+    def clear(self, disk: bool = False):
+        """
+        清空缓存。
+        :param disk: 是否同时删除磁盘缓存文件
+        """
+        with self._lock:
+            self._entries.clear()
+            self._stamps.clear()
+        if disk and self.directory is not None:
+            for file in self.directory.glob("*.lsfcache"):
+                try:
+                    file.unlink()
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中统计和内存中的条目数量"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(len(payload) for payload in self._entries.values()),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, digest: str, payload: bytes):
+        with self._lock:
+            self._entries[digest] = payload
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _decode(payload: bytes) -> LSFResult:
+        version, printer_config, label_config, elements = pickle.loads(payload)
+        if version != CACHE_FORMAT:
+            raise ValueError(f"缓存格式版本 {version} 与当前版本 {CACHE_FORMAT} 不一致")
+        store = get_image_store()
+        for elem in elements:
+            # 反序列化得到的图像数据与其他元素共享同一份 bytes
+            if isinstance(elem, ImageElement) and elem._image_data:
+                elem._image_data = store.intern(elem._image_data)
+        if not isinstance(elements, ElementCollection):
+            elements = ElementCollection(elements)
+        return printer_config, label_config, elements
+
+    def _disk_path(self, digest: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{digest}.lsfcache"
+
+    def _read_disk(self, digest: str) -> Optional[bytes]:
+        if self.directory is None:
+            return None
+        try:
+            return self._disk_path(digest).read_bytes()
+        except OSError:
+            return None
+
+    def _write_disk(self, digest: str, payload: bytes):
+        if self.directory is None:
+            return
+        path = self._disk_path(digest)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)  # 原子替换，并发读取不会读到写了一半的文件
+        except OSError as e:
+            logger.warning(f"写入 LSF 磁盘缓存失败 {path}: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,284 @@
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .utils import get_logger
+from .backends import DotNetBackend
+from .exceptions import ZMPrinterError
+
+if TYPE_CHECKING:
+    from .core import LabelPrinterSDK
+
+logger = get_logger(__name__)
+
+# 索引文件格式版本
+INDEX_FORMAT = 1
+
+
+class LSFIndexEntry(NamedTuple):
+    """单个 LSF 模板的索引信息"""
+
+    path: str  # 绝对路径
+    mtime_ns: int  # 修改时间 (纳秒)
+    size: int  # 文件大小 (字节)
+    label_width: Optional[float]  # 标签宽度 (mm)
+    label_height: Optional[float]  # 标签高度 (mm)
+    object_names: Tuple[str, ...]  # 元素名称
+    element_types: Tuple[str, ...]  # 元素类型 (text / barcode / image / rfid / shape)，去重
+    barcode_types: Tuple[str, ...]  # 条码类型，去重
+    sharenames: Tuple[str, ...]  # LSF 变量的 sharename，去重
+    error: Optional[str]  # 解析失败时的错误信息
+
+
+class ScanResult(NamedTuple):
+    """一次扫描的结果统计"""
+
+    added: int  # 新增的文件数
+    updated: int  # 内容变化后重新解析的文件数
+    removed: int  # 已删除的文件数
+    unchanged: int  # 未变化、沿用原索引的文件数
+    failed: int  # 解析失败的文件数 (包含在 added / updated 中)
+
+
+def _unique(values) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(v for v in values if v))
+
+
+class LSFIndex:
+    """
+    LSF 模板目录索引。
+
+    扫描目录树中的 .lsf 文件，调用 read_lsf 解析，记录元素名称、元素类型、条码类型、
+    变量 sharename 和标签尺寸，支持按这些条件查询。再次扫描时只重新解析修改时间或大小发生变化的文件。
+    索引可以保存为 JSON 文件，下次启动时加载后继续增量扫描。线程安全。
+
+    同一 SDK 实例的 DLL 调用是串行的，因此线程池中的每个解析线程使用 sdk_factory 创建的独立 SDK 实例。
+    没有 sdk_factory 时 (非 DotNetBackend 且未指定) 只使用 sdk 逐个解析。
+    """
+
+    def __init__(
+        self,
+        sdk: "LabelPrinterSDK",
+        pattern: str = "*.lsf",
+        workers: int = 4,
+        sdk_factory: Optional[Callable[[], "LabelPrinterSDK"]] = None,
+    ):
+        """
+        :param sdk: 用于解析模板的 SDK 实例 (其 lsf_cache 也会被利用)
+        :param pattern: 文件名匹配模式
+        :param workers: 并行解析的线程数
+        :param sdk_factory: 为每个解析线程创建 SDK 实例的函数。sdk 使用 DotNetBackend 时默认以同一 DLL
+            创建新的后端 (各自的 LSFUtility) 并共享 lsf_cache
+        """
+        self.sdk = sdk
+        self.pattern = pattern
+        self.workers = max(1, workers)
+        if sdk_factory is None and isinstance(sdk.backend, DotNetBackend):
+            sdk_factory = self._dotnet_sdk
+        self.sdk_factory = sdk_factory
+        self._entries: Dict[str, LSFIndexEntry] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ---- 扫描 ----
+
+    def scan(self, root: Union[str, Path]) -> ScanResult:
+        """
+        扫描目录并更新索引。root 之下不再存在的文件会从索引中删除。
+        :param root: 模板根目录
+        :return: ScanResult
+        """
+        root_path = os.path.abspath(root)
+        found: Dict[str, os.stat_result] = {}
+        for path in Path(root_path).rglob(self.pattern):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if path.is_file():
+                found[str(path)] = st
+
+        with self._lock:
+            known = {p: e for p, e in self._entries.items() if _is_under(p, root_path)}
+        removed = [p for p in known if p not in found]
+        changed = [
+            p
+            for p, st in found.items()
+            if p not in known or known[p].mtime_ns != st.st_mtime_ns or known[p].size != st.st_size
+        ]
+
+        if len(changed) > 1 and self.workers > 1 and self.sdk_factory is not None:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="lsf-index") as pool:
+                parsed = list(pool.map(lambda p: self._parse(self._worker_sdk(), p, found[p]), changed))
+        else:
+            parsed = [self._parse(self.sdk, p, found[p]) for p in changed]
+
+        with self._lock:
+            for path in removed:
+                self._entries.pop(path, None)
+            for entry in parsed:
+                self._entries[entry.path] = entry
+
+        result = ScanResult(
+            added=sum(1 for p in changed if p not in known),
+            updated=sum(1 for p in changed if p in known),
+            removed=len(removed),
+            unchanged=len(found) - len(changed),
+            failed=sum(1 for entry in parsed if entry.error is not None),
+        )
+        logger.info(f"LSF 索引扫描 {root_path}: {result}")
+        return result
+
+    def _dotnet_sdk(self) -> "LabelPrinterSDK":
+        """以同一 DLL 创建新的 SDK 实例，共享 lsf_cache"""
+        return type(self.sdk)(backend=DotNetBackend(self.sdk.dll_path), lsf_cache=self.sdk.lsf_cache)
+
+    def _worker_sdk(self) -> "LabelPrinterSDK":
+        """当前解析线程独占的 SDK 实例，第一次使用时创建"""
+        sdk = getattr(self._local, "sdk", None)
+        if sdk is None:
+            assert self.sdk_factory is not None
+            sdk = self._local.sdk = self.sdk_factory()
+        return sdk
+
+    def _parse(self, sdk: "LabelPrinterSDK", path: str, st: os.stat_result) -> LSFIndexEntry:
+        label_width = label_height = None
+        elements: List[Any] = []
+        error = None
+        try:
+            _, label_config, parsed, message = sdk.read_lsf(path)
+            if message:
+                error = message
+            else:
+                elements = list(parsed or ())
+                if label_config is not None:
+                    label_width, label_height = label_config.width, label_config.height
+        except ZMPrinterError as e:
+            error = str(e)
+        if error is not None:
+            logger.warning(f"索引 LSF 文件失败 {path}: {error}")
+
+        return LSFIndexEntry(
+            path=path,
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            label_width=label_width,
+            label_height=label_height,
+            object_names=tuple(elem.object_name for elem in elements),
+            element_types=_unique(getattr(elem, "element_type", None) for elem in elements),
+            barcode_types=_unique(getattr(elem, "barcode_type", None) for elem in elements),
+            sharenames=_unique(var.get("sharename") for elem in elements for var in (elem.variables or ())),
+            error=error,
+        )
+
+    # ---- 查询 ----
+
+    def find(
+        self,
+        object_name: Optional[str] = None,
+        element_type: Optional[str] = None,
+        barcode_type: Optional[Any] = None,
+        sharename: Optional[str] = None,
+        label_size: Optional[Tuple[float, float]] = None,
+    ) -> List[LSFIndexEntry]:
+        """
+        查询同时满足所有给定条件的模板 (未给定的条件不限制)，解析失败的模板不会出现在结果中。
+        :param object_name: 包含该名称的元素
+        :param element_type: 包含该类型的元素，如 "barcode"、"rfid"
+        :param barcode_type: 使用该条码类型 (BarcodeType 或其字符串值)
+        :param sharename: 包含该 sharename 的变量
+        :param label_size: 标签尺寸 (宽, 高)，单位 mm
+        :return: 按路径排序的索引条目
+        """
+        barcode_value = getattr(barcode_type, "value", barcode_type)
+        with self._lock:
+            entries = list(self._entries.values())
+        return sorted(
+            (
+                entry
+                for entry in entries
+                if entry.error is None
+                and (object_name is None or object_name in entry.object_names)
+                and (element_type is None or element_type in entry.element_types)
+                and (barcode_value is None or barcode_value in entry.barcode_types)
+                and (sharename is None or sharename in entry.sharenames)
+                and (label_size is None or (entry.label_width, entry.label_height) == tuple(label_size))
+            ),
+            key=lambda entry: entry.path,
+        )
+
+    def values(self, field: str) -> Dict[str, Set[str]]:
+        """
+        按字段建立倒排表。
+        :param field: "object_names"、"element_types"、"barcode_types" 或 "sharenames"
+        :return: {字段值: 包含该值的模板路径集合}
+        """
+        inverted: Dict[str, Set[str]] = {}
+        with self._lock:
+            for entry in self._entries.values():
+                for value in getattr(entry, field):
+                    inverted.setdefault(value, set()).add(entry.path)
+        return inverted
+
+    def get(self, path: Union[str, Path]) -> Optional[LSFIndexEntry]:
+        """获取指定文件的索引条目"""
+        with self._lock:
+            return self._entries.get(os.path.abspath(path))
+
+    def errors(self) -> List[LSFIndexEntry]:
+        """解析失败的模板"""
+        with self._lock:
+            return sorted((e for e in self._entries.values() if e.error is not None), key=lambda e: e.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[LSFIndexEntry]:
+        with self._lock:
+            return iter(sorted(self._entries.values(), key=lambda e: e.path))
+
+    # ---- 持久化 ----
+
+    def save(self, path: Union[str, Path]):
+        """
+        将索引保存为 JSON 文件。
+        :param path: 索引文件路径
+        """
+        with self._lock:
+            entries = [entry._asdict() for entry in self._entries.values()]
+        data = {"format": INDEX_FORMAT, "pattern": self.pattern, "entries": entries}
+        tmp_path = Path(f"{path}.tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def load(self, path: Union[str, Path]) -> int:
+        """
+        加载之前保存的索引，之后调用 scan() 只会解析变化的文件。
+        :param path: 索引文件路径
+        :return: 加载的条目数；文件不存在或格式版本不一致时返回 0
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0
+        if data.get("format") != INDEX_FORMAT:
+            logger.info(f"忽略格式版本不一致的 LSF 索引文件: {path}")
+            return 0
+
+        entries = {}
+        for item in data.get("entries", []):
+            for field in ("object_names", "element_types", "barcode_types", "sharenames"):
+                item[field] = tuple(item[field])
+            entry = LSFIndexEntry(**item)
+            entries[entry.path] = entry
+        with self._lock:
+            self._entries.update(entries)
+        return len(entries)
+
+
+def _is_under(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
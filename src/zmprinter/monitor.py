@@ -0,0 +1,302 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .utils import get_logger
+from .config import PrinterConfig
+from .core import LabelPrinterSDK
+from .enums import StatusCategory, StatusSeverity
+from .status import PrinterStatus
+from .exceptions import ZMPrinterConfigError
+
+logger = get_logger(__name__)
+
+
+class StatusSnapshot(NamedTuple):
+    """某台打印机最近一次查询到的状态"""
+
+    printer: str  # 打印机名称
+    code: int  # 状态码 (见 get_printer_status)
+    message: str  # 状态描述
+    category: StatusCategory  # 状态类别
+    severity: StatusSeverity  # 严重程度
+    timestamp: float  # 查询时间 (time.time())
+    since: float  # 该状态首次出现的时间 (time.time())
+
+    @property
+    def status(self) -> PrinterStatus:
+        """对应的 PrinterStatus"""
+        return PrinterStatus(self.code, self.message, self.category, self.severity)
+
+
+class StatusChange(NamedTuple):
+    """状态变化事件"""
+
+    printer: str  # 打印机名称
+    previous: Optional[StatusSnapshot]  # 变化前的状态，首次查询时为 None
+    current: StatusSnapshot  # 变化后的状态
+
+
+class _Target:
+    """监控中的一台打印机"""
+
+    def __init__(self, name: str, printer_config: PrinterConfig, sdk: LabelPrinterSDK, interval: float):
+        self.name = name
+        self.printer_config = printer_config
+        self.sdk = sdk
+        self.interval = interval  # 当前轮询间隔，状态不变时逐步增大
+        self.due = 0.0  # 下次轮询时间 (time.monotonic())
+        self.polling = False
+        self.status: Optional[StatusSnapshot] = None
+        self.polls = 0
+        self.changes = 0
+
+
+class StatusMonitor:
+    """
+    打印机状态后台监控。
+
+    后台线程按计划轮询每台打印机的 getPrinterStatusCode，缓存最近一次的状态和时间戳，
+    读取状态 (get / snapshot) 不会调用 DLL。状态保持不变时轮询间隔按 backoff 倍数逐步增大到 max_interval，
+    状态变化或调用 refresh() 后恢复为 interval。状态变化 (如 0 -> 89 标签用完) 时通知所有订阅者。
+
+    订阅者在轮询线程中被调用，应尽快返回；订阅者抛出的异常会被记录并忽略。
+    轮询与打印可能同时使用同一个 SDK 实例 (例如 PrintScheduler 注册的打印机)。LabelPrinterSDK 会串行化同一实例上的
+    DLL 调用，状态查询最多等待当前这一张标签发送完成，不会与 PrintLabel 并发进入 DLL。
+    """
+
+    def __init__(
+        self,
+        interval: float = 2.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        workers: int = 4,
+        sdk_factory: Optional[Callable[[PrinterConfig], LabelPrinterSDK]] = None,
+    ):
+        """
+        :param interval: 基础轮询间隔 (秒)
+        :param max_interval: 状态长时间不变时的最大轮询间隔 (秒)
+        :param backoff: 每次状态未变化时轮询间隔的放大倍数
+        :param workers: 并行查询状态的线程数
+        :param sdk_factory: 为打印机创建 SDK 实例的函数，默认 LabelPrinterSDK(printer_config=cfg)
+        """
+        if interval <= 0 or max_interval < interval or backoff < 1:
+            raise ZMPrinterConfigError("轮询间隔必须为正，max_interval 不能小于 interval，backoff 不能小于 1")
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.workers = max(1, workers)
+        self.sdk_factory = sdk_factory or (lambda cfg: LabelPrinterSDK(printer_config=cfg))
+
+        self._targets: Dict[str, _Target] = {}
+        self._subscribers: List[Callable[[StatusChange], None]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._running = False
+
+        self.polls = 0
+        self.changes = 0
+        self.category_counts: Dict[StatusCategory, int] = dict.fromkeys(StatusCategory, 0)  # 各类别状态的查询次数
+
+    # ---- 打印机管理 ----
+
+    def add_printer(
+        self, printer_config: PrinterConfig, name: Optional[str] = None, sdk: Optional[LabelPrinterSDK] = None
+    ) -> str:
+        """
+        开始监控一台打印机，监控运行中时会立即安排一次查询。
+        :param printer_config: 打印机配置
+        :param name: 打印机名称，默认由 printer_name() 生成
+        :param sdk: 查询状态使用的 SDK 实例，默认由 sdk_factory 创建
+        :return: 打印机名称
+        """
+        from .scheduler import printer_name
+
+        name = name or printer_name(printer_config)
+        with self._lock:
+            if name in self._targets:
+                raise ZMPrinterConfigError(f"打印机 '{name}' 已在监控中")
+            self._targets[name] = _Target(name, printer_config, sdk or self.sdk_factory(printer_config), self.interval)
+            self._wakeup.notify_all()
+        return name
+
+    def remove_printer(self, name: str):
+        """停止监控一台打印机"""
+        with self._lock:
+            self._targets.pop(name, None)
+
+    def printers(self) -> List[str]:
+        """监控中的打印机名称"""
+        with self._lock:
+            return list(self._targets)
+
+    # ---- 订阅 ----
+
+    def subscribe(self, callback: Callable[[StatusChange], None]) -> Callable[[], None]:
+        """
+        订阅状态变化事件。
+        :param callback: 回调函数，参数为 StatusChange
+        :return: 取消订阅的函数
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    # ---- 读取 ----
+
+    def get(self, name: str) -> Optional[StatusSnapshot]:
+        """返回缓存的状态，尚未查询过时返回 None"""
+        with self._lock:
+            target = self._targets.get(name)
+            return target.status if target is not None else None
+
+    def snapshot(self) -> Dict[str, Optional[StatusSnapshot]]:
+        """返回所有打印机缓存的状态"""
+        with self._lock:
+            return {name: target.status for name, target in self._targets.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        """返回轮询次数、状态变化次数、各类别状态的出现次数以及每台打印机当前的轮询间隔"""
+        with self._lock:
+            return {
+                "polls": self.polls,
+                "changes": self.changes,
+                "categories": {category.value: count for category, count in self.category_counts.items() if count},
+                "printers": {
+                    name: {"polls": t.polls, "changes": t.changes, "interval": t.interval}
+                    for name, t in self._targets.items()
+                },
+            }
+
+    # ---- 轮询 ----
+
+    def poll(self, name: str) -> StatusSnapshot:
+        """
+        立即查询一台打印机的状态 (同步调用 DLL)，更新缓存并在状态变化时通知订阅者。
+        :param name: 打印机名称
+        :return: 最新的 StatusSnapshot
+        """
+        with self._lock:
+            target = self._targets.get(name)
+            if target is None:
+                raise ZMPrinterConfigError(f"打印机 '{name}' 不在监控中")
+        status = target.sdk.query_printer_status(target.printer_config)
+        code, message = status.code, status.message
+        now = time.time()
+
+        with self._lock:
+            previous = target.status
+            changed = previous is None or previous.code != code
+            current = StatusSnapshot(name, *status, now, now if changed else previous.since)
+            target.status = current
+            target.polls += 1
+            self.polls += 1
+            self.category_counts[status.category] += 1
+            if changed:
+                target.changes += 1
+                self.changes += 1
+                target.interval = self.interval
+            else:
+                target.interval = min(target.interval * self.backoff, self.max_interval)
+            target.due = time.monotonic() + target.interval
+            subscribers = list(self._subscribers) if changed else []
+
+        if changed:
+            logger.info(f"打印机 '{name}' 状态变化: {previous.code if previous else None} -> {code} ({message})")
+        event = StatusChange(name, previous, current)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception(f"状态变化订阅者处理打印机 '{name}' 的事件时出错")
+        return current
+
+    def refresh(self, name: Optional[str] = None):
+        """
+        让一台 (或所有) 打印机恢复基础轮询间隔并尽快查询，例如在提交打印任务之后。
+        :param name: 打印机名称，为 None 时作用于所有打印机
+        """
+        with self._lock:
+            targets = self._targets.values() if name is None else [self._targets.get(name)]
+            for target in filter(None, targets):
+                target.interval = self.interval
+                target.due = 0.0
+            self._wakeup.notify_all()
+
+    # ---- 生命周期 ----
+
+    def start(self):
+        """启动后台轮询线程"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="zmprinter-status")
+            self._thread = threading.Thread(target=self._loop, name="zmprinter-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """停止后台轮询，等待正在进行的查询结束"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self._wakeup.notify_all()
+            thread, pool = self._thread, self._pool
+        if thread is not None:
+            thread.join(timeout=timeout)
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def __enter__(self) -> "StatusMonitor":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _loop(self):
+        while True:
+            with self._lock:
+                if not self._running:
+                    return
+                now = time.monotonic()
+                due: List[Tuple[float, str]] = [(t.due, name) for name, t in self._targets.items() if not t.polling]
+                ready = [name for when, name in due if when <= now]
+                for name in ready:
+                    self._targets[name].polling = True
+                if not ready:
+                    self._wakeup.wait(timeout=min((when for when, _ in due), default=now + self.interval) - now)
+                    continue
+                pool = self._pool
+            for name in ready:
+                assert pool is not None
+                pool.submit(self._poll_scheduled, name)
+
+    def _poll_scheduled(self, name: str):
+        try:
+            self.poll(name)
+        except ZMPrinterConfigError:
+            pass  # 查询期间已被移除
+        except Exception:
+            logger.exception(f"查询打印机 '{name}' 状态时出错")
+            with self._lock:
+                target = self._targets.get(name)
+                if target is not None:
+                    target.interval = min(target.interval * self.backoff, self.max_interval)
+                    target.due = time.monotonic() + target.interval
+        finally:
+            with self._lock:
+                target = self._targets.get(name)
+                if target is not None:
+                    target.polling = False
+                self._wakeup.notify_all()
@@ -0,0 +1,541 @@
+import re
+import time
+import queue
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .utils import get_logger
+from .enums import PrinterStyle
+from .config import PrinterConfig, LabelConfig
+from .elements import RFIDElement, LabelElementType
+from .template import LabelTemplate
+from .instrumentation import MetricsSink, Span
+from .exceptions import ZMPrinterConfigError, ZMPrinterCommandError, ZMPrinterRFIDReadError
+
+if TYPE_CHECKING:
+    from .core import LabelPrinterSDK
+
+logger = get_logger(__name__)
+
+# 标准 96 位 TID 的十六进制长度，TID+EPC 读取结果没有分隔符时按此拆分
+TID_HEX_LENGTH = 24
+
+_SEPARATORS = re.compile(r"[\s,;|:]+")
+_HEX = re.compile(r"^[0-9A-Fa-f]*$")
+
+
+class TagRead(NamedTuple):
+    """一次 UHF 标签读取结果"""
+
+    tid: Optional[str]  # 标签 TID (大写十六进制)，未读取时为 None
+    epc: Optional[str]  # 标签 EPC (大写十六进制)，未读取时为 None
+    raw: str  # GetUHFTagData 返回的原始字符串
+    timestamp: float  # 读取完成的时间 (time.time())
+    stop_position: int  # 读取后标签停止的位置
+
+
+def parse_uhf_tag_data(
+    raw: Optional[str], area: int, stop_position: int = 0, timestamp: Optional[float] = None
+) -> TagRead:
+    """
+    解析 GetUHFTagData 的返回值。
+    :param raw: DLL 返回的字符串
+    :param area: 读取区域 (0: TID, 1: EPC, 2: TID+EPC)
+    :param stop_position: 读取时使用的停止位置
+    :param timestamp: 读取时间，默认为当前时间
+    :return: TagRead；raw 为空时 tid 和 epc 均为 None
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    text = (raw or "").strip()
+    tid = epc = None
+    if text:
+        if area == 0:
+            tid = text.upper()
+        elif area == 1:
+            epc = text.upper()
+        else:
+            parts = [part for part in _SEPARATORS.split(text) if part]
+            if len(parts) >= 2:
+                tid, epc = parts[0].upper(), "".join(parts[1:]).upper()
+            else:
+                # 没有分隔符时，前 96 位为 TID，其余为 EPC
+                tid, epc = text[:TID_HEX_LENGTH].upper(), (text[TID_HEX_LENGTH:].upper() or None)
+    return TagRead(tid, epc, raw or "", timestamp, stop_position)
+
+
+def epc_matches(expected: str, read: Optional[str]) -> bool:
+    """
+    比较写入的 EPC 与读回的 EPC。读回的 EPC 区可能比写入的数据长，多出的部分必须全为 0。
+    :param expected: 写入的 EPC (十六进制)
+    :param read: 读回的 EPC (十六进制)
+    """
+    if not read:
+        return False
+    expected, read = expected.strip().upper(), read.strip().upper()
+    return read.startswith(expected) and not read[len(expected) :].strip("0")
+
+
+class EncodeResult(NamedTuple):
+    """RFID 编码校验流水线中单条记录的结果"""
+
+    index: int  # 记录在输入序列中的序号 (从 0 开始)
+    epc: str  # 写入的 EPC
+    result: str  # PrintLabel 结果，"OK" 或 "Error: xxx"
+    tag: Optional[TagRead]  # 读回的标签，未读取时为 None
+    verified: bool  # 读回的 EPC 与写入的一致
+    voided: bool  # 是否已打印空白页作废该标签
+    error: Optional[str]  # 失败原因
+
+    @property
+    def ok(self) -> bool:
+        """该记录是否写入并校验成功"""
+        return self.verified
+
+
+class _Prepared(NamedTuple):
+    index: int
+    values: Dict[str, str]
+    epc: str
+    error: Optional[str]
+
+
+_DONE = object()
+
+# 结束时等待数据准备线程退出的最长时间 (秒)
+_PRODUCER_JOIN_TIMEOUT = 1.0
+
+
+class RFIDEncodePipeline:
+    """
+    RFID 编码 + 校验流水线。
+
+    每条记录：更新模板槽位 -> PrintLabel 写入 EPC/USER 数据 -> GetUHFTagData 读回 TID/EPC ->
+    与写入数据比较，不一致时打印空白页 (带 X 标记) 作废该标签。
+    所有记录复用模板中已转换的 ZMPrinter / ZMLabel / LabelObject，不会重复转换配置。
+    下一条记录的数据准备 (prepare 回调、校验) 在后台线程中进行，与当前标签的硬件 I/O 重叠。
+    各阶段耗时记录在 metrics (MetricsSink) 中，可通过 metrics.snapshot() 或 metrics.render() 查看直方图。
+    """
+
+    def __init__(
+        self,
+        sdk: "LabelPrinterSDK",
+        template: Union[LabelTemplate, Iterable[LabelElementType]],
+        epc_slot: Optional[str] = None,
+        read_area: int = 2,
+        read_power: int = 0,
+        read_stop_position: int = 0,
+        read_timeout: int = 2000,
+        void_failures: bool = True,
+        prefetch: int = 16,
+        prepare: Optional[Callable[[Mapping[str, Any]], Mapping[str, Any]]] = None,
+        metrics: Optional[MetricsSink] = None,
+    ):
+        """
+        :param sdk: LabelPrinterSDK 实例
+        :param template: compile_template() 返回的模板，或标签元素列表 (将使用 SDK 默认配置编译)
+        :param epc_slot: 写入 EPC 的 RFID 元素名称，为 None 时使用模板中第一个写 EPC 区的 UHF 元素
+        :param read_area: 校验时的读取区域 (1: EPC, 2: TID+EPC)
+        :param read_power: 读取功率 (0 表示使用打印机当前设置)
+        :param read_stop_position: 读取后标签停止位置 (0:原始, 1:撕纸, 2:打印, 3:写入)
+        :param read_timeout: 读取超时 (毫秒)
+        :param void_failures: 校验失败时是否打印空白页作废标签
+        :param prefetch: 预先准备的记录数
+        :param prepare: 数据准备回调，输入一条记录，返回 {槽位名称: 数据}；在后台线程中调用
+        :param metrics: 接收阶段耗时的 MetricsSink，默认新建一个
+        """
+        if read_area not in (1, 2):
+            raise ZMPrinterConfigError("校验读取区域必须包含 EPC (1: EPC, 2: TID+EPC)")
+        if not isinstance(template, LabelTemplate):
+            template = sdk.compile_template(list(template))
+        if epc_slot is None:
+            epc_slot = next(
+                (
+                    elem.object_name
+                    for elem in template.elements
+                    if isinstance(elem, RFIDElement)
+                    and elem.rfid_encoder_type == 0
+                    and elem.rfid_data_block == 0
+                    and elem.object_name in template.slot_names
+                ),
+                None,
+            )
+            if epc_slot is None:
+                raise ZMPrinterConfigError("模板中没有写入 EPC 的 UHF RFID 元素")
+        elif epc_slot not in template.slot_names:
+            raise ZMPrinterConfigError(f"模板中找不到 EPC 槽位: {epc_slot}")
+
+        self.sdk = sdk
+        self.template = template
+        self.epc_slot = epc_slot
+        self.read_area = read_area
+        self.read_power = read_power
+        self.read_stop_position = read_stop_position
+        self.read_timeout = read_timeout
+        self.void_failures = void_failures
+        self.prefetch = max(1, prefetch)
+        self.prepare = prepare
+        self.metrics = metrics if metrics is not None else MetricsSink(prefix="zmprinter_rfid")
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        """记录一个阶段的耗时到 metrics"""
+        error: Optional[str] = None
+        start_ns = time.time_ns()
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.metrics.on_span(Span(name, start_ns, time.perf_counter() - start, None, {}, error))
+
+    def _prepare_record(self, index: int, record: Mapping[str, Any]) -> _Prepared:
+        with self._stage("rfid.prepare"):
+            try:
+                values = self.prepare(record) if self.prepare is not None else record
+                values = {name: value if isinstance(value, str) else str(value) for name, value in values.items()}
+                epc = values.get(self.epc_slot, "").strip().upper()
+                if not epc:
+                    return _Prepared(index, values, epc, f"记录中缺少 EPC 字段 '{self.epc_slot}'")
+                if not _HEX.match(epc) or len(epc) % 4:
+                    return _Prepared(index, values, epc, f"EPC 必须是按字 (4 位十六进制) 对齐的十六进制字符串: {epc}")
+                values[self.epc_slot] = epc
+                return _Prepared(index, values, epc, None)
+            except Exception as e:
+                return _Prepared(index, {}, "", f"准备第 {index + 1} 条记录时出错: {e}")
+
+    def _produce(self, records: Iterable[Mapping[str, Any]], buffer: "queue.Queue[Any]", stop: threading.Event):
+        """后台线程：逐条准备记录放入缓冲队列"""
+
+        def put(item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            for index, record in enumerate(records):
+                if stop.is_set() or not put(self._prepare_record(index, record)):
+                    return
+        except BaseException as e:
+            put(e)
+        put(_DONE)
+
+    def _encode(self, item: _Prepared) -> EncodeResult:
+        template = self.template
+        missing = template.update_many(item.values)
+        if missing:
+            logger.warning(f"第 {item.index + 1} 条记录中的字段在模板中不存在，已忽略: {', '.join(missing)}")
+
+        with self._stage("rfid.encode"):
+            result, _ = self.sdk.print_template(template)
+        if result.startswith("Error:"):
+            return EncodeResult(item.index, item.epc, result, None, False, False, result)
+
+        tag = None
+        error = None
+        try:
+            with self._stage("rfid.verify"):
+                raw = self.sdk.read_uhf_tag(
+                    self.read_area,
+                    self.read_power,
+                    self.read_stop_position,
+                    self.read_timeout,
+                    printer_config=template.printer_config,
+                    label_config=template.label_config,
+                )
+            tag = parse_uhf_tag_data(raw, self.read_area, self.read_stop_position)
+            if not epc_matches(item.epc, tag.epc):
+                error = f"EPC 校验失败: 写入 {item.epc}，读回 {tag.epc}"
+        except ZMPrinterRFIDReadError as e:
+            error = f"读回标签失败: {e.dll_message}"
+        except Exception as e:
+            error = f"读回标签时发生异常: {e}"
+
+        if error is None:
+            return EncodeResult(item.index, item.epc, result, tag, True, False, None)
+
+        logger.warning(f"第 {item.index + 1} 条记录 {error}")
+        voided = False
+        if self.void_failures:
+            try:
+                with self._stage("rfid.void"):
+                    self.sdk.print_blank_page(True, template.printer_config, template.label_config)
+                voided = True
+            except Exception as e:
+                logger.error(f"作废第 {item.index + 1} 条记录的标签失败: {e}")
+        return EncodeResult(item.index, item.epc, result, tag, False, voided, error)
+
+    def run(self, records: Iterable[Mapping[str, Any]], stop_at_error: bool = False) -> Iterator[EncodeResult]:
+        """
+        逐条编码并校验记录，逐条产出结果。records 在后台线程中被惰性消费。
+        注意：这是一个生成器，只有在迭代返回值时才会实际打印；提前结束迭代会停止后台线程
+        (后台线程阻塞在 records 迭代器上时不会等待它退出)。
+        :param records: 记录序列，每条记录是 {槽位名称: 数据} 的映射 (或交给 prepare 回调的任意映射)
+        :param stop_at_error: 是否在某条记录失败后停止
+        :return: EncodeResult 迭代器
+        """
+        buffer: "queue.Queue[Any]" = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce, args=(records, buffer, stop), name="rfid-prepare", daemon=True
+        )
+        producer.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                if item.error is not None:
+                    result = EncodeResult(item.index, item.epc, f"Error: {item.error}", None, False, False, item.error)
+                else:
+                    with self._stage("rfid.label"):
+                        result = self._encode(item)
+                yield result
+                if stop_at_error and not result.ok:
+                    logger.error(f"第 {result.index + 1} 条记录编码失败，停止: {result.error}")
+                    break
+        finally:
+            stop.set()
+            # 后台线程可能阻塞在 records 迭代器上，它是守护线程，超时后不再等待
+            producer.join(timeout=_PRODUCER_JOIN_TIMEOUT)
+            if producer.is_alive():
+                logger.warning("RFID 数据准备线程未在超时前结束 (records 迭代器阻塞?)，不再等待")
+
+    def encode_all(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        stop_at_error: bool = False,
+        on_result: Optional[Callable[[EncodeResult], None]] = None,
+    ) -> Tuple[int, int]:
+        """
+        编码并校验所有记录。
+        :param records: 记录序列
+        :param stop_at_error: 是否在某条记录失败后停止
+        :param on_result: 每条记录完成后的回调
+        :return: (succeeded_count, failed_count)
+        """
+        succeeded = failed = 0
+        for result in self.run(records, stop_at_error=stop_at_error):
+            if result.ok:
+                succeeded += 1
+            else:
+                failed += 1
+            if on_result is not None:
+                on_result(result)
+        logger.info(f"RFID 编码完成: 成功 {succeeded} 条，失败 {failed} 条")
+        return succeeded, failed
+
+    def histograms(self) -> Dict[str, Dict[str, float]]:
+        """各阶段 (rfid.prepare / encode / verify / void / label) 的耗时统计"""
+        return self.metrics.snapshot()
+
+
+# 可以读写 RFID 的打印机接口
+RFID_INTERFACES = (
+    PrinterStyle.RFID_USB,
+    PrinterStyle.RFID_NET,
+    PrinterStyle.GBGM_USB,
+    PrinterStyle.GBGM_NET,
+    PrinterStyle.GJB_USB,
+    PrinterStyle.GJB_NET,
+)
+
+
+class InventoryStats(NamedTuple):
+    """一次盘点的统计"""
+
+    reads: int  # 读取次数 (含未读到和重复)
+    unique: int  # 产出的不重复标签数
+    duplicates: int  # 被去重丢弃的读取次数
+    misses: int  # 未读到标签的次数
+    errors: int  # DLL 返回错误的次数
+    elapsed: float  # 已用时间 (秒)
+
+    @property
+    def reads_per_second(self) -> float:
+        """每秒读取次数"""
+        return self.reads / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class TagInventory:
+    """
+    RFID 标签批量盘点。
+
+    重复调用 GetUHFTagData (或 GetHFTagData)，每次读取后标签按 stop_position 走纸，逐个产出解析后的 TagRead。
+    配置只转换一次，之后的读取复用 SDK 转换缓存中的 ZMPrinter / ZMLabel 对象。
+    支持按数量、时长、连续未读到次数或外部事件提前结束，可按 TID (没有 TID 时按 EPC) 去重。
+    HF 标签的 UID 记录在 TagRead.tid 中。
+    同步使用 scan()，异步使用 AsyncLabelPrinterSDK.inventory_tags()。
+    """
+
+    def __init__(
+        self,
+        sdk: "LabelPrinterSDK",
+        area: int = 2,
+        power: int = 0,
+        stop_position: int = 1,
+        timeout: int = 2000,
+        hf_protocol: Optional[int] = None,
+        printer_config: Optional[PrinterConfig] = None,
+        label_config: Optional[LabelConfig] = None,
+    ):
+        """
+        :param sdk: LabelPrinterSDK 实例
+        :param area: 读取区域。UHF: 0 TID, 1 EPC, 2 TID+EPC；HF: 0 UID, 1 数据区
+        :param power: 读取功率 (含义见 read_uhf_tag / read_hf_tag)
+        :param stop_position: 每次读取后标签停止的位置，盘点整卷时通常为走纸到下一张的位置
+        :param timeout: 单次读取超时 (毫秒)
+        :param hf_protocol: 为 None 时读取 UHF 标签；否则读取 HF 标签，值为协议类型 (1: 15693, 2: 14443A, 3: NFC)
+        :param printer_config: 打印机配置，默认使用 SDK 的配置
+        :param label_config: 标签配置，默认使用 SDK 的配置
+        """
+        printer_config = printer_config or sdk.printer_config
+        label_config = label_config or sdk.label_config
+        if printer_config is None or label_config is None:
+            raise ZMPrinterCommandError("打印机配置或标签配置对象为空")
+        interfaces = RFID_INTERFACES if hf_protocol is None else (PrinterStyle.RFID_USB, PrinterStyle.RFID_NET)
+        if printer_config.interface not in interfaces:
+            raise ZMPrinterConfigError("打印机接口必须兼容RFID才能盘点标签。")
+
+        self.sdk = sdk
+        self.area = area
+        self.power = power
+        self.stop_position = stop_position
+        self.timeout = timeout
+        self.hf_protocol = hf_protocol
+        self.printer_config = printer_config
+        self.label_config = label_config
+        self.reset()
+
+    def reset(
+        self,
+        max_tags: Optional[int] = None,
+        max_misses: int = 3,
+        duration: Optional[float] = None,
+        dedupe: bool = True,
+    ):
+        """
+        开始新一轮盘点，清空统计和去重记录。scan() 会自动调用。
+        :param max_tags: 产出这么多不重复标签后结束
+        :param max_misses: 连续这么多次没有读到新标签 (未读到、读取出错或重复) 后结束，视为到达卷尾；0 表示不限
+        :param duration: 盘点时长上限 (秒)
+        :param dedupe: 是否丢弃重复读到的标签
+        """
+        self.max_tags = max_tags
+        self.max_misses = max_misses
+        self.duration = duration
+        self.dedupe = dedupe
+        self._seen: set = set()
+        self._reads = self._unique = self._duplicates = self._misses = self._errors = 0
+        self._consecutive_misses = 0
+        self._started = time.perf_counter()
+
+    def read_one(self) -> Optional[TagRead]:
+        """
+        读取一次标签 (不计入统计)。
+        :return: TagRead；未读到标签时返回 None
+        :raises ZMPrinterRFIDReadError: DLL 返回错误
+        """
+        if self.hf_protocol is None:
+            raw = self.sdk.read_uhf_tag(
+                self.area, self.power, self.stop_position, self.timeout, self.printer_config, self.label_config
+            )
+        else:
+            raw = self.sdk.read_hf_tag(
+                self.hf_protocol,
+                self.area,
+                self.power,
+                self.stop_position,
+                self.timeout,
+                self.printer_config,
+                self.label_config,
+            )
+        if not raw.strip():
+            return None
+        if self.hf_protocol is None:
+            return parse_uhf_tag_data(raw, self.area, self.stop_position)
+        text = raw.strip().upper()
+        return TagRead(
+            text if self.area == 0 else None, None if self.area == 0 else text, raw, time.time(), self.stop_position
+        )
+
+    def accept(self, tag: Optional[TagRead], error: bool = False) -> bool:
+        """
+        记录一次读取结果并判断是否应该产出。
+        :param tag: read_one() 的返回值
+        :param error: 本次读取是否出错
+        :return: True 表示这是一个需要产出的新标签
+        """
+        self._reads += 1
+        if error or tag is None:
+            if error:
+                self._errors += 1
+            else:
+                self._misses += 1
+            self._consecutive_misses += 1
+            return False
+        if self.dedupe:
+            key = tag.tid or tag.epc
+            if key in self._seen:
+                self._duplicates += 1
+                self._consecutive_misses += 1
+                return False
+            self._seen.add(key)
+        self._unique += 1
+        self._consecutive_misses = 0
+        return True
+
+    def finished(self, stop: Optional[threading.Event] = None) -> bool:
+        """是否满足任一结束条件"""
+        return (
+            (stop is not None and stop.is_set())
+            or (self.max_tags is not None and self._unique >= self.max_tags)
+            or (self.max_misses > 0 and self._consecutive_misses >= self.max_misses)
+            or (self.duration is not None and time.perf_counter() - self._started >= self.duration)
+        )
+
+    def scan(
+        self,
+        max_tags: Optional[int] = None,
+        max_misses: int = 3,
+        duration: Optional[float] = None,
+        dedupe: bool = True,
+        stop: Optional[threading.Event] = None,
+    ) -> Iterator[TagRead]:
+        """
+        盘点标签，逐个产出读到的标签。提前结束迭代即停止读取。
+        参数含义见 reset()；stop 为外部结束事件。
+        :return: TagRead 迭代器
+        """
+        self.reset(max_tags, max_misses, duration, dedupe)
+        while not self.finished(stop):
+            try:
+                tag = self.read_one()
+            except ZMPrinterRFIDReadError as e:
+                logger.warning(f"盘点读取出错: {e}")
+                self.accept(None, error=True)
+                continue
+            if self.accept(tag):
+                yield tag
+        logger.info(f"盘点结束: {self.stats}")
+
+    @property
+    def stats(self) -> InventoryStats:
+        """当前一轮盘点的统计"""
+        return InventoryStats(
+            self._reads,
+            self._unique,
+            self._duplicates,
+            self._misses,
+            self._errors,
+            time.perf_counter() - self._started,
+        )
@@ -0,0 +1,223 @@
+import sys
+import platform
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .utils import get_logger
+from .exceptions import ZMPrinterImportError, ZMPrinterSetupError
+
+logger = get_logger(__name__)
+
+# .NET 运行时和 LabelPrinter 程序集都在第一次真正使用时才加载，并在整个进程内共享
+_lock = threading.RLock()
+_dotnet: Optional["DotNetRuntime"] = None
+_assemblies: Dict[str, Any] = {}
+_runtimes: Dict[str, "LabelPrinterRuntime"] = {}
+
+
+class DotNetRuntime:
+    """已加载的 .NET 运行时及 SDK 用到的 System 命名空间成员"""
+
+    def __init__(self):
+        import clr  # type: ignore
+
+        clr.AddReference("System.Drawing")  # type: ignore
+        import System  # type: ignore
+        from System.Collections.Generic import List as DotNetList  # type: ignore .NET List
+        from System.Drawing import Bitmap, Rectangle  # type: ignore .NET Drawing 命名空间
+        from System.Drawing.Imaging import ImageFormat, ImageLockMode, PixelFormat  # type: ignore
+        from System.IO import MemoryStream  # type: ignore
+        from System.Runtime.InteropServices import Marshal  # type: ignore
+
+        self.clr = clr
+        self.System = System
+        self.List = DotNetList
+        self.Bitmap = Bitmap
+        self.Rectangle = Rectangle
+        self.ImageFormat = ImageFormat
+        self.ImageLockMode = ImageLockMode
+        self.PixelFormat = PixelFormat
+        self.MemoryStream = MemoryStream
+        self.Marshal = Marshal
+
+
+class LabelPrinterRuntime:
+    """
+    进程内共享的 LabelPrinter 运行时。
+
+    每个 DLL 路径只加载一次程序集，所有使用同一 DLL 的 LabelPrinterSDK 实例共享。
+    PrintUtility / LSFUtility 不保证线程安全，每个后端通过 create_utilities() 创建自己的一组，
+    不同打印机的 SDK 实例可以在各自的线程中并行调用，而不会并发使用同一个 .NET 对象。
+    """
+
+    def __init__(self, dll_path: str, label_printer: Any, timings: Dict[str, float]):
+        """
+        :param dll_path: LabelPrinter.dll 的完整路径
+        :param label_printer: LabelPrinter .NET 命名空间模块
+        :param timings: 加载各阶段耗时 (秒)
+        """
+        self.dll_path = dll_path
+        self.LabelPrinter = label_printer
+        self.timings = dict(timings)
+        self.handles = 0
+
+    def create_utilities(self) -> Tuple[Any, Any]:
+        """
+        创建一组新的 .NET 工具类实例。
+        :return: (PrintUtility, LSFUtility)
+        """
+        try:
+            return self.LabelPrinter.PrintUtility(), self.LabelPrinter.LSFUtility()
+        except Exception as e:
+            logger.error(f"无法实例化 LabelPrinter 类: {e}")
+            raise ZMPrinterSetupError(f"SDK 初始化失败: {e}", original_exception=e)
+
+    @property
+    def load_seconds(self) -> float:
+        """加载运行时的总耗时 (秒)"""
+        return sum(self.timings.values())
+
+    def __repr__(self) -> str:
+        return (
+            f"LabelPrinterRuntime(dll_path={self.dll_path!r}, handles={self.handles}, "
+            f"load_seconds={self.load_seconds:.3f})"
+        )
+
+
+def get_dotnet() -> DotNetRuntime:
+    """
+    获取 (必要时加载) 进程内共享的 .NET 运行时。
+    :return: DotNetRuntime 对象
+    """
+    global _dotnet
+    if _dotnet is None:
+        with _lock:
+            if _dotnet is None:
+                try:
+                    _dotnet = DotNetRuntime()
+                    logger.debug(".NET 运行时加载完成")
+                except Exception as e:
+                    logger.error(f"无法加载 .NET 运行时或 System.Drawing: {e}")
+                    raise ZMPrinterImportError(
+                        f"无法加载 .NET 运行时。请确保已安装 pythonnet 及兼容的 .NET 环境。错误: {e}",
+                        original_exception=e,
+                    )
+    return _dotnet
+
+
+def is_dotnet_loaded() -> bool:
+    """.NET 运行时是否已经加载"""
+    return _dotnet is not None
+
+
+def default_dll_path() -> str:
+    """根据平台自动选择随包发布的 LabelPrinter.dll 路径"""
+    # 获取当前模块所在目录路径
+    module_dir = Path(__file__).parent
+
+    # 根据平台特性选择合适的DLL目录
+    if sys.platform == "win32":
+        if platform.architecture()[0] == "64bit":
+            # 64位Windows
+            dll_dir = "x64"
+        else:
+            # 32位Windows
+            dll_dir = "x86"
+    else:
+        # 非Windows平台使用AnyCPU版本
+        dll_dir = "AnyCPU"
+
+    # 构建DLL完整路径
+    return str((module_dir / "libs" / dll_dir / "LabelPrinter.dll").resolve())
+
+
+def load_label_printer(dll_path: str) -> Any:
+    """
+    加载 LabelPrinter.dll 并返回 LabelPrinter 命名空间。
+    同一路径的程序集在进程内只加载一次。
+    :param dll_path: LabelPrinter.dll 的完整路径
+    :return: LabelPrinter .NET 命名空间模块
+    """
+    module = _assemblies.get(dll_path)
+    if module is not None:
+        return module
+
+    with _lock:
+        module = _assemblies.get(dll_path)
+        if module is not None:
+            return module
+
+        dotnet = get_dotnet()
+        try:
+            # 加载DLL
+            dotnet.System.Reflection.Assembly.LoadFile(dll_path)
+            dotnet.clr.AddReference("LabelPrinter")  # type: ignore
+        except (
+            ImportError,
+            FileNotFoundError,
+            dotnet.System.IO.FileNotFoundException,
+            dotnet.System.BadImageFormatException,
+        ) as e:
+            logger.error(f"无法加载或引用 LabelPrinter.dll: {e}")
+            raise ZMPrinterImportError(
+                f"无法加载 LabelPrinter.dll。请确保 DLL 存在、架构匹配且 .NET 环境配置正确。错误: {e}",
+                original_exception=e,
+            )
+        except Exception as e:
+            logger.error(f"无法加载 LabelPrinter.dll: {e}")
+            raise ImportError(f"无法加载 LabelPrinter.dll。请确保 DLL 存在且 .NET 环境配置正确。错误: {e}")
+
+        try:
+            # 导入 .NET 命名空间和类
+            import LabelPrinter  # type: ignore
+        except ImportError as e:
+            logger.error(f"成功加载 DLL 但无法导入 LabelPrinter 命名空间: {e}")
+            raise ZMPrinterImportError(f"无法导入 LabelPrinter 命名空间。错误: {e}", original_exception=e)
+
+        _assemblies[dll_path] = LabelPrinter
+        logger.info(f"LabelPrinter.dll 加载成功: {dll_path}")
+        return LabelPrinter
+
+
+def get_runtime(dll_path: Optional[str] = None) -> LabelPrinterRuntime:
+    """
+    获取 (必要时加载) 指定 DLL 的共享运行时。
+    :param dll_path: LabelPrinter.dll 的完整路径，为 None 时使用 default_dll_path()
+    :return: LabelPrinterRuntime 对象
+    """
+    if dll_path is None:
+        dll_path = default_dll_path()
+    key = str(Path(dll_path).resolve())
+    runtime = _runtimes.get(key)
+    if runtime is not None:
+        return runtime
+
+    with _lock:
+        runtime = _runtimes.get(key)
+        if runtime is not None:
+            return runtime
+
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        get_dotnet()
+        timings["dotnet"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        label_printer = load_label_printer(key)
+        timings["assembly"] = time.perf_counter() - start
+
+        runtime = LabelPrinterRuntime(key, label_printer, timings)
+        _runtimes[key] = runtime
+        logger.info(
+            f"LabelPrinter 运行时加载完成，耗时 {runtime.load_seconds * 1000:.1f} ms "
+            f"(.NET {timings['dotnet'] * 1000:.1f} ms, 程序集 {timings['assembly'] * 1000:.1f} ms)"
+        )
+        return runtime
+
+
+def loaded_runtimes() -> List[LabelPrinterRuntime]:
+    """返回进程内已加载的所有共享运行时"""
+    with _lock:
+        return list(_runtimes.values())
@@ -0,0 +1,447 @@
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .utils import get_logger
+from .config import PrinterConfig, LabelConfig
+from .core import LabelPrinterSDK
+from .monitor import StatusMonitor
+from .enums import StatusCategory
+from .status import PrinterStatus, lookup_status
+from .elements import LabelElementType, RFIDElement
+from .exceptions import ZMPrinterError, ZMPrinterConfigError, ZMPrinterCommandError, ZMPrinterStateError
+
+logger = get_logger(__name__)
+
+# 停止工作线程的哨兵对象
+_STOP = object()
+
+
+class JobResult(NamedTuple):
+    """调度器中一个打印任务的最终结果"""
+
+    job_id: int
+    printer: str  # 最终执行任务的打印机名称
+    result: str  # 打印结果，"OK" 或 "Error: xxx"
+    finished_count: int  # 成功发送的份数 (包括在其他打印机上已完成的部分)
+    attempts: int  # 尝试次数 (每换一台打印机计一次)
+
+
+class PrintJob:
+    """提交给 PrintScheduler 的打印任务"""
+
+    def __init__(
+        self,
+        job_id: int,
+        elements: List[LabelElementType],
+        copies: int = 1,
+        group: str = "default",
+        label_config: Optional[LabelConfig] = None,
+        printer: Optional[str] = None,
+    ):
+        self.job_id = job_id
+        self.elements = elements
+        self.copies = copies
+        self.group = group
+        self.label_config = label_config
+        self.printer = printer  # 指定打印机时不会负载均衡或重试到其他打印机
+        self.rfid = any(isinstance(elem, RFIDElement) for elem in elements)  # 是否需要写入 RFID
+        self.finished_count = 0
+        self.attempts = 0
+        self.tried_printers: List[str] = []
+        self.submitted_at = time.monotonic()
+        self.future: "Future[JobResult]" = Future()
+
+    @property
+    def remaining(self) -> int:
+        """尚未成功发送的份数"""
+        return self.copies - self.finished_count
+
+
+class PrinterDevice:
+    """调度器管理的一台打印机，拥有独立的 FIFO 队列、工作线程和 SDK 实例"""
+
+    def __init__(self, name: str, printer_config: PrinterConfig, group: str, sdk: LabelPrinterSDK):
+        self.name = name
+        self.printer_config = printer_config
+        self.group = group
+        self.sdk = sdk
+        self.queue: "queue.Queue[object]" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self.busy = False
+        self.available = True  # 最近一次状态检查是否可用
+        self.last_status: Optional[Tuple[int, str]] = None
+        self.status: Optional[PrinterStatus] = None  # 最近一次检查到的状态
+        self.completed_jobs = 0
+        self.failed_attempts = 0
+        self.printed_labels = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """排队中 (含正在执行) 的任务数"""
+        return self.queue.qsize() + (1 if self.busy else 0)
+
+
+def printer_name(printer_config: PrinterConfig) -> str:
+    """根据打印机配置生成设备名称：优先使用 USB 主板序号，其次网络 IP 和驱动名称"""
+    return printer_config.mbsn or printer_config.ip_address or printer_config.name or printer_config.interface.name
+
+
+class PrintScheduler:
+    """
+    多打印机任务调度器。
+
+    每台打印机拥有一个 FIFO 队列和一个工作线程。提交任务时在同一分组 (group) 内可互换的打印机之间
+    按队列深度做负载均衡；打印前会检查打印机状态，若状态异常 (如 89 标签用完) 或打印失败，
+    任务会被转移到同组的其他打印机上重试。
+    状态按类别区分：RFID 类错误只影响需要写入 RFID 的任务。
+    """
+
+    def __init__(
+        self,
+        label_config: Optional[LabelConfig] = None,
+        sdk_factory: Optional[Callable[[PrinterConfig], LabelPrinterSDK]] = None,
+        check_status: bool = True,
+        ready_codes: Optional[Iterable[int]] = None,
+        status_monitor: Optional[StatusMonitor] = None,
+    ):
+        """
+        :param label_config: 默认标签配置，任务未指定 label_config 时使用
+        :param sdk_factory: 为每台打印机创建 SDK 实例的函数，默认 LabelPrinterSDK(printer_config=cfg)
+        :param check_status: 打印前是否检查打印机状态
+        :param ready_codes: 视为可打印的状态码集合。默认在检查时查询状态码表
+            (0 正常待机，4 正在打印，96 剥纸器等待取走标签，以及之后通过 register_status 登记的可打印状态)
+        :param status_monitor: 状态监控器。指定时注册的打印机会加入监控，打印前直接使用缓存的状态，不再逐个任务查询
+        """
+        self.label_config = label_config
+        self.sdk_factory = sdk_factory or (lambda cfg: LabelPrinterSDK(printer_config=cfg))
+        self.check_status = check_status
+        self.ready_codes = frozenset(ready_codes) if ready_codes is not None else None
+        self.status_monitor = status_monitor
+
+        self._devices: Dict[str, PrinterDevice] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._job_ids = itertools.count(1)
+        self._pending = 0
+        self._running = False
+        self._started_at: Optional[float] = None
+
+        self.submitted_jobs = 0
+        self.completed_jobs = 0
+        self.failed_jobs = 0
+        self.retried_jobs = 0
+        self.printed_labels = 0
+        # 打印前检查到的各类别状态次数
+        self.status_categories: Dict[StatusCategory, int] = dict.fromkeys(StatusCategory, 0)
+
+    # ---- 打印机管理 ----
+
+    def add_printer(
+        self,
+        printer_config: PrinterConfig,
+        name: Optional[str] = None,
+        group: str = "default",
+        sdk: Optional[LabelPrinterSDK] = None,
+    ) -> PrinterDevice:
+        """
+        注册一台打印机。
+        :param printer_config: 打印机配置 (通过 mbsn 或 ip_address 区分设备)
+        :param name: 设备名称，默认由 printer_name() 生成
+        :param group: 分组名称，同组打印机视为可互换
+        :param sdk: 该打印机使用的 SDK 实例，默认由 sdk_factory 创建
+        :return: PrinterDevice 对象
+        """
+        name = name or printer_name(printer_config)
+        with self._lock:
+            if name in self._devices:
+                raise ZMPrinterConfigError(f"打印机 '{name}' 已注册")
+            device = PrinterDevice(name, printer_config, group, sdk or self.sdk_factory(printer_config))
+            self._devices[name] = device
+            if self._running:
+                self._start_worker(device)
+        if self.status_monitor is not None:
+            self.status_monitor.add_printer(printer_config, name, device.sdk)
+        logger.info(f"已注册打印机 '{name}' (分组: {group})")
+        return device
+
+    def printers(self, group: Optional[str] = None) -> List[PrinterDevice]:
+        """返回已注册的打印机列表，可按分组过滤"""
+        with self._lock:
+            return [d for d in self._devices.values() if group is None or d.group == group]
+
+    # ---- 生命周期 ----
+
+    def start(self):
+        """启动所有打印机的工作线程"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._started_at = time.monotonic()
+            for device in self._devices.values():
+                self._start_worker(device)
+
+    def _start_worker(self, device: PrinterDevice):
+        device.thread = threading.Thread(
+            target=self._worker, args=(device,), name=f"zmprinter-{device.name}", daemon=True
+        )
+        device.thread.start()
+
+    def stop(self, wait: bool = True, timeout: Optional[float] = None):
+        """
+        停止调度器。
+        :param wait: True 时等待所有已提交任务完成；False 时取消仍在排队的任务
+        :param timeout: 等待任务完成的最长时间 (秒)。超时后与 wait=False 相同，取消仍在排队的任务；
+            正在执行的打印调用无法中断，会在工作线程中执行完毕
+        """
+        with self._lock:
+            if not self._running:
+                return
+            finished = wait and self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+            self._running = False
+            devices = list(self._devices.values())
+
+        for device in devices:
+            if not finished:
+                self._drain(device)
+            device.queue.put(_STOP)
+        for device in devices:
+            if device.thread is not None:
+                device.thread.join(timeout=timeout)
+
+    def _drain(self, device: PrinterDevice):
+        """取消设备队列中尚未开始的任务"""
+        while True:
+            try:
+                job = device.queue.get_nowait()
+            except queue.Empty:
+                return
+            if not isinstance(job, PrintJob):
+                continue
+            if not job.future.cancel():
+                # 重试中的任务已处于运行状态，无法取消，直接以失败结束
+                job.future.set_exception(ZMPrinterError("调度器已停止"))
+            self._finish(job)
+
+    def __enter__(self) -> "PrintScheduler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop(wait=exc_type is None)
+
+    # ---- 提交与分发 ----
+
+    def submit(
+        self,
+        elements: List[LabelElementType],
+        copies: int = 1,
+        group: str = "default",
+        label_config: Optional[LabelConfig] = None,
+        printer: Optional[str] = None,
+    ) -> "Future[JobResult]":
+        """
+        提交打印任务。
+        :param elements: 标签元素列表。任务执行前不应再修改这些元素。
+        :param copies: 打印份数
+        :param group: 目标打印机分组
+        :param label_config: 标签配置，默认使用调度器的 label_config
+        :param printer: 指定打印机名称 (不做负载均衡和重试)
+        :return: concurrent.futures.Future，结果为 JobResult；任务最终失败时设置 ZMPrinterError 异常
+        """
+        if copies < 1:
+            raise ZMPrinterConfigError("打印份数必须至少为 1")
+        if label_config is None and self.label_config is None:
+            raise ZMPrinterConfigError("标签配置对象为空")
+
+        job = PrintJob(next(self._job_ids), elements, copies, group, label_config, printer)
+        with self._lock:
+            if not self._running:
+                raise ZMPrinterError("调度器未启动")
+            self._pending += 1
+            self.submitted_jobs += 1
+        self._dispatch(job)
+        return job.future
+
+    def _select_device(self, job: PrintJob) -> Optional[PrinterDevice]:
+        """选择执行任务的打印机：优先同组中未尝试过、状态可用且队列最短的设备"""
+        if job.printer is not None:
+            device = self._devices.get(job.printer)
+            if device is None or job.printer in job.tried_printers:
+                return None
+            return device
+
+        candidates = [d for d in self._devices.values() if d.group == job.group and d.name not in job.tried_printers]
+        if not candidates:
+            return None
+        available = [d for d in candidates if self._accepts(d, job)]
+        # 所有候选设备最近都不可用时仍然尝试，它们可能已经恢复
+        return min(available or candidates, key=lambda d: d.queue_depth)
+
+    def _dispatch(self, job: PrintJob, error: Optional[ZMPrinterError] = None):
+        with self._lock:
+            device = self._select_device(job) if self._running else None
+            if device is not None:
+                if error is not None:
+                    # 带着上一次的错误重新排队，即转移到其他打印机重试
+                    self.retried_jobs += 1
+                device.queue.put(job)
+                return
+
+        if error is None:
+            if job.printer is not None and job.printer not in self._devices:
+                error = ZMPrinterConfigError(f"未注册的打印机: '{job.printer}'")
+            elif not self._running:
+                error = ZMPrinterError("调度器已停止")
+            else:
+                error = ZMPrinterConfigError(f"分组 '{job.group}' 中没有可用的打印机")
+        logger.error(f"任务 {job.job_id} 失败 (已尝试: {job.tried_printers}): {error}")
+        job.future.set_exception(error)
+        with self._lock:
+            self.failed_jobs += 1
+        self._finish(job)
+
+    def _finish(self, job: PrintJob):
+        with self._lock:
+            self._pending -= 1
+            self._idle.notify_all()
+
+    # ---- 工作线程 ----
+
+    def _worker(self, device: PrinterDevice):
+        while True:
+            job = device.queue.get()
+            if job is _STOP:
+                return
+            assert isinstance(job, PrintJob)
+            # 首次执行前检查任务是否已被取消；重试中的任务已处于运行状态，不能再取消
+            if job.attempts == 0 and not job.future.set_running_or_notify_cancel():
+                self._finish(job)
+                continue
+
+            device.busy = True
+            try:
+                self._run_job(device, job)
+            except Exception as e:
+                logger.exception(f"打印机 '{device.name}' 执行任务 {job.job_id} 时发生异常")
+                self._retry_or_fail(device, job, ZMPrinterError(f"执行打印任务时发生异常: {e}", original_exception=e))
+            finally:
+                device.busy = False
+
+    def _run_job(self, device: PrinterDevice, job: PrintJob):
+        job.attempts += 1
+        job.tried_printers.append(device.name)
+
+        if self.check_status:
+            status = self._printer_status(device)
+            device.status = status
+            device.last_status = (status.code, status.message)
+            device.available = self._is_ready(status.code)
+            with self._lock:
+                self.status_categories[status.category] += 1
+            if not self._accepts(device, job):
+                logger.warning(
+                    f"打印机 '{device.name}' 状态异常 ({status.code}: {status.message}, "
+                    f"类别: {status.category.value})，转移任务 {job.job_id}"
+                )
+                self._retry_or_fail(
+                    device,
+                    job,
+                    ZMPrinterStateError(
+                        f"打印机 '{device.name}' 不可用", status_code=status.code, status_message=status.message
+                    ),
+                )
+                return
+
+        final_result, finished_count = device.sdk.print_label(
+            job.elements,
+            copies=job.remaining,
+            printer_config=device.printer_config,
+            label_config=job.label_config or self.label_config,
+        )
+        job.finished_count += finished_count
+        if self.status_monitor is not None:
+            # 打印后状态最可能发生变化 (如标签用完)，让监控器尽快重新查询
+            self.status_monitor.refresh(device.name)
+        with self._lock:
+            device.printed_labels += finished_count
+            self.printed_labels += finished_count
+
+        if job.remaining > 0:
+            self._retry_or_fail(
+                device, job, ZMPrinterCommandError(f"打印机 '{device.name}' 打印失败", dll_message=final_result)
+            )
+            return
+
+        with self._lock:
+            device.completed_jobs += 1
+            self.completed_jobs += 1
+        job.future.set_result(JobResult(job.job_id, device.name, final_result, job.finished_count, job.attempts))
+        self._finish(job)
+
+    def _printer_status(self, device: PrinterDevice) -> PrinterStatus:
+        """打印前检查的状态：优先使用状态监控器缓存的状态，尚未查询过时直接查询"""
+        if self.status_monitor is not None:
+            snapshot = self.status_monitor.get(device.name)
+            if snapshot is not None:
+                return snapshot.status
+        return device.sdk.query_printer_status(device.printer_config)
+
+    def _accepts(self, device: PrinterDevice, job: PrintJob) -> bool:
+        """
+        设备最近的状态是否可以执行该任务。
+        RFID 类错误 (读写或校准出错) 只影响需要写入 RFID 的任务，普通标签仍然可以在该打印机上打印。
+        """
+        status = device.status
+        if status is None or self._is_ready(status.code):
+            return True
+        return status.category == StatusCategory.RFID and not job.rfid
+
+    def _is_ready(self, code: int) -> bool:
+        """状态码是否可以接收打印任务"""
+        if self.ready_codes is None:
+            return lookup_status(code).ready
+        return code in self.ready_codes
+
+    def _retry_or_fail(self, device: PrinterDevice, job: PrintJob, error: ZMPrinterError):
+        with self._lock:
+            device.failed_attempts += 1
+        self._dispatch(job, error)
+
+    # ---- 指标 ----
+
+    def metrics(self) -> Dict[str, object]:
+        """
+        返回调度器指标：任务计数、打印张数、吞吐量以及每台打印机的队列深度和状态。
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started_at if self._started_at is not None else 0.0
+            return {
+                "submitted_jobs": self.submitted_jobs,
+                "completed_jobs": self.completed_jobs,
+                "failed_jobs": self.failed_jobs,
+                "retried_jobs": self.retried_jobs,
+                "pending_jobs": self._pending,
+                "printed_labels": self.printed_labels,
+                "jobs_per_second": self.completed_jobs / elapsed if elapsed > 0 else 0.0,
+                "labels_per_second": self.printed_labels / elapsed if elapsed > 0 else 0.0,
+                "status_categories": {c.value: count for c, count in self.status_categories.items() if count},
+                "printers": {
+                    d.name: {
+                        "group": d.group,
+                        "queue_depth": d.queue_depth,
+                        "busy": d.busy,
+                        "available": d.available,
+                        "last_status": d.last_status,
+                        "status_category": d.status.category.value if d.status is not None else None,
+                        "completed_jobs": d.completed_jobs,
+                        "failed_attempts": d.failed_attempts,
+                        "printed_labels": d.printed_labels,
+                    }
+                    for d in self._devices.values()
+                },
+            }
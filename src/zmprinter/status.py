@@ -0,0 +1,82 @@
+from typing import Dict, FrozenSet, NamedTuple
+
+from .utils import get_logger
+from .enums import StatusCategory, StatusSeverity
+
+logger = get_logger(__name__)
+
+
+class PrinterStatus(NamedTuple):
+    """getPrinterStatusCode 返回的状态码及其描述、类别和严重程度"""
+
+    code: int  # 状态码
+    message: str  # 状态描述
+    category: StatusCategory  # 类别
+    severity: StatusSeverity  # 严重程度
+
+    @property
+    def ready(self) -> bool:
+        """该状态下是否可以接收打印任务"""
+        return self.severity <= StatusSeverity.INFO
+
+
+# 状态码 -> PrinterStatus
+STATUS_TABLE: Dict[int, PrinterStatus] = {}
+
+
+def register_status(code: int, message: str, category: StatusCategory, severity: StatusSeverity) -> PrinterStatus:
+    """
+    登记 (或覆盖) 一个状态码，例如新固件增加的状态码。
+    :param code: 状态码
+    :param message: 状态描述
+    :param category: 类别
+    :param severity: 严重程度
+    :return: 登记的 PrinterStatus
+    """
+    status = PrinterStatus(code, message, category, severity)
+    STATUS_TABLE[code] = status
+    return status
+
+
+def lookup_status(code: int) -> PrinterStatus:
+    """
+    查询状态码对应的 PrinterStatus。
+    :param code: 状态码
+    :return: PrinterStatus；未登记的状态码返回 UNKNOWN 类别、WARNING 级别的状态
+    """
+    status = STATUS_TABLE.get(code)
+    if status is None:
+        return PrinterStatus(code, f"未知状态码: {code}", StatusCategory.UNKNOWN, StatusSeverity.WARNING)
+    return status
+
+
+def ready_codes() -> FrozenSet[int]:
+    """当前登记的所有可以接收打印任务的状态码"""
+    return frozenset(code for code, status in STATUS_TABLE.items() if status.ready)
+
+
+# SDK 内部错误 (调用 DLL 时发生 Python 异常)
+INTERNAL_ERROR_CODE = -999
+
+for _code, _message, _category, _severity in (
+    (0, "打印机正常待机", StatusCategory.READY, StatusSeverity.OK),
+    (1, "指令语法错误", StatusCategory.COMMAND, StatusSeverity.ERROR),
+    (4, "正在打印", StatusCategory.BUSY, StatusSeverity.OK),
+    (81, "硬件故障", StatusCategory.HARDWARE, StatusSeverity.ERROR),
+    (82, "碳带出错", StatusCategory.RIBBON, StatusSeverity.ERROR),
+    (83, "标签出错", StatusCategory.MEDIA, StatusSeverity.ERROR),
+    (88, "打印机暂停状态", StatusCategory.PAUSED, StatusSeverity.WARNING),
+    (89, "标签用完", StatusCategory.MEDIA, StatusSeverity.ERROR),
+    (90, "RFID读写出错", StatusCategory.RFID, StatusSeverity.ERROR),
+    (91, "RFID程序校准出错", StatusCategory.RFID, StatusSeverity.ERROR),
+    (92, "RFID手动校准出错", StatusCategory.RFID, StatusSeverity.ERROR),
+    (96, "剥纸器正在等待取走标签", StatusCategory.MEDIA, StatusSeverity.INFO),
+    (99, "打印机刚完成升级 (状态 99)", StatusCategory.FIRMWARE, StatusSeverity.WARNING),
+    (120, "打印机刚完成升级 (状态 120)", StatusCategory.FIRMWARE, StatusSeverity.WARNING),
+    (-101, "打印机硬件路径为空 (未连接?)", StatusCategory.CONNECTIVITY, StatusSeverity.ERROR),
+    (-102, "打开USB设备出错 (未连接?)", StatusCategory.CONNECTIVITY, StatusSeverity.ERROR),
+    (-103, "从USB读取状态失败 (异常?)", StatusCategory.CONNECTIVITY, StatusSeverity.ERROR),
+    (-104, "从USB读取状态异常 (异常?)", StatusCategory.CONNECTIVITY, StatusSeverity.ERROR),
+    (INTERNAL_ERROR_CODE, "SDK 内部错误", StatusCategory.INTERNAL, StatusSeverity.ERROR),
+):
+    register_status(_code, _message, _category, _severity)
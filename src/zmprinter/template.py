@@ -0,0 +1,120 @@
+import copy
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from .utils import get_logger
+from .config import PrinterConfig, LabelConfig
+from .elements import TextElement, BarcodeElement, RFIDElement, LabelElementType
+from .exceptions import ZMPrinterConfigError
+
+logger = get_logger(__name__)
+
+# 可以作为变量槽位的元素类型 (这些元素的内容由 objectdata 决定)
+SLOT_ELEMENT_TYPES = (TextElement, BarcodeElement, RFIDElement)
+
+
+class BatchResult(NamedTuple):
+    """批量打印中单条记录的打印结果"""
+
+    index: int  # 记录在输入序列中的序号 (从 0 开始)
+    result: str  # 打印结果，"OK" 或 "Error: xxx"
+    finished_count: int  # 该记录成功发送的份数
+    missing_fields: List[str]  # 记录中在模板里找不到的字段名
+
+    @property
+    def ok(self) -> bool:
+        """该记录是否打印成功"""
+        return not self.result.startswith("Error:")
+
+
+class LabelTemplate:
+    """
+    编译后的标签模板。
+
+    模板中的所有元素只在编译时转换为 .NET LabelObject 一次，之后每次打印只修改
+    变量槽位 (slot) 对应 LabelObject 的 objectdata，其余 .NET 对象保持不变。
+    模板保存元素的副本，其数据始终与写入 .NET 对象的值一致；之后修改调用方的元素不会影响模板，
+    模板的槽位更新也不会修改调用方的元素。
+    请通过 LabelPrinterSDK.compile_template() 创建模板，模板对象不是线程安全的。
+    """
+
+    def __init__(
+        self,
+        elements: List[LabelElementType],
+        printer_config: PrinterConfig,
+        label_config: LabelConfig,
+        dotnet_printer: Any,
+        dotnet_label: Any,
+        dotnet_elements: Any,
+        slots: Optional[Iterable[str]] = None,
+    ):
+        """
+        :param elements: 模板的 Python 元素列表 (模板会保存其深拷贝)
+        :param printer_config: 编译时使用的打印机配置
+        :param label_config: 编译时使用的标签配置
+        :param dotnet_printer: 转换后的 .NET ZMPrinter 对象
+        :param dotnet_label: 转换后的 .NET ZMLabel 对象
+        :param dotnet_elements: 转换后的 .NET List<LabelObject>，顺序与 elements 一致
+        :param slots: 变量槽位名称 (元素 object_name)。为 None 时文本、条码和 RFID 元素都作为槽位。
+        """
+        self.elements = copy.deepcopy(list(elements))
+        self.printer_config = printer_config
+        self.label_config = label_config
+        self.dotnet_printer = dotnet_printer
+        self.dotnet_label = dotnet_label
+        self.dotnet_elements = dotnet_elements
+
+        dotnet_objects = list(dotnet_elements)
+        if len(dotnet_objects) != len(self.elements):
+            raise ZMPrinterConfigError("模板元素数量与 .NET 对象数量不一致")
+
+        slot_names = set(slots) if slots is not None else None
+        self._slots: Dict[str, List[Tuple[LabelElementType, Any]]] = {}
+        for elem, dotnet_obj in zip(self.elements, dotnet_objects):
+            if slot_names is not None and elem.object_name not in slot_names:
+                continue
+            if not isinstance(elem, SLOT_ELEMENT_TYPES):
+                if slot_names is not None:
+                    raise ZMPrinterConfigError(
+                        f"元素 '{elem.object_name}' ({type(elem).__name__}) 不能作为模板变量槽位"
+                    )
+                continue
+            self._slots.setdefault(elem.object_name, []).append((elem, dotnet_obj))
+
+        if slot_names is not None:
+            missing = slot_names - self._slots.keys()
+            if missing:
+                raise ZMPrinterConfigError(f"模板中找不到变量槽位: {', '.join(sorted(missing))}")
+
+    @property
+    def slot_names(self) -> List[str]:
+        """模板的变量槽位名称列表"""
+        return list(self._slots)
+
+    def update(self, name: str, value: str) -> bool:
+        """
+        更新一个变量槽位的数据，只有值与上一次写入 .NET 对象的值不同时才会写入。
+        :param name: 槽位名称 (元素 object_name)
+        :param value: 新的数据值
+        :return: True 如果找到该槽位，False 如果未找到
+        """
+        targets = self._slots.get(name)
+        if targets is None:
+            return False
+        if not isinstance(value, str):
+            value = str(value)
+        for elem, dotnet_obj in targets:
+            if elem.data != value:
+                elem.data = value
+                dotnet_obj.objectdata = value
+        return True
+
+    def update_many(self, values: Mapping[str, str]) -> List[str]:
+        """
+        批量更新变量槽位。
+        :param values: 槽位名称到新数据的映射
+        :return: 未找到的槽位名称列表 (全部找到时为空列表)
+        """
+        return [name for name, value in values.items() if not self.update(name, value)]
+
+    def __repr__(self) -> str:
+        return f"LabelTemplate(elements={len(self.elements)}, slots={self.slot_names})"
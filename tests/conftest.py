@@ -0,0 +1,45 @@
+from typing import Optional
+
+import pytest
+
+from zmprinter import (
+    LabelPrinterSDK,
+    SimulatedBackend,
+    LSFCache,
+    PrinterConfig,
+    LabelConfig,
+    PrinterStyle,
+    BarcodeType,
+    TextElement,
+    BarcodeElement,
+)
+
+
+@pytest.fixture
+def make_sdk():
+    """创建使用 SimulatedBackend 的 SDK (300 DPI，100x30 mm 标签)，关键字参数传给 SimulatedBackend"""
+
+    def factory(
+        interface: PrinterStyle = PrinterStyle.USB, lsf_cache: Optional[LSFCache] = None, **backend_options
+    ) -> LabelPrinterSDK:
+        return LabelPrinterSDK(
+            printer_config=PrinterConfig(interface=interface, dpi=300),
+            label_config=LabelConfig(width=100, height=30),
+            backend=SimulatedBackend(**backend_options),
+            lsf_cache=lsf_cache,
+        )
+
+    return factory
+
+
+@pytest.fixture
+def make_elements():
+    """每次调用返回一组新的文本 + 条码元素"""
+
+    def factory():
+        return [
+            TextElement(object_name="text-01", data="Hello", x=5, y=5),
+            BarcodeElement(object_name="barcode-01", data="123456", barcode_type=BarcodeType.CODE_128_AUTO, x=5, y=15),
+        ]
+
+    return factory
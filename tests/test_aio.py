@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import pytest
+
+from zmprinter import (
+    SimulatedBackend,
+    PrinterConfig,
+    LabelConfig,
+    PrinterStyle,
+    TextElement,
+    ZMPrinterConnectionTimeoutError,
+)
+from zmprinter.aio import AsyncLabelPrinterSDK
+
+
+def make_async_sdk(**options) -> AsyncLabelPrinterSDK:
+    timeout = options.pop("timeout", None)
+    return AsyncLabelPrinterSDK(
+        printer_config=PrinterConfig(interface=PrinterStyle.USB, dpi=300),
+        label_config=LabelConfig(width=100, height=30),
+        backend=SimulatedBackend(**options),
+        timeout=timeout,
+    )
+
+
+def label(data: str):
+    return [TextElement(object_name="text-01", data=data, x=5, y=5)]
+
+
+def test_timeout_raises_and_discards_running_call():
+    async def main():
+        client = make_async_sdk(latency=0.3, timeout=0.05)
+        backend = client.sdk.backend
+        started = time.perf_counter()
+        with pytest.raises(ZMPrinterConnectionTimeoutError):
+            await client.print_label(label("slow"))
+        assert time.perf_counter() - started < 0.25
+        assert backend.printed == 0
+
+        # 已进入 DLL 的调用会在后台执行完毕，结果被丢弃
+        await client.aclose()
+        assert backend.printed == 1 and backend.history == [{"text-01": "slow"}]
+
+    asyncio.run(main())
+
+
+def test_cancel_discards_queued_call():
+    async def main():
+        client = make_async_sdk(latency=0.2)
+        backend = client.sdk.backend
+        running = asyncio.ensure_future(client.print_label(label("first")))
+        queued = asyncio.ensure_future(client.print_label(label("second")))
+        await asyncio.sleep(0.05)
+
+        # 第二个调用还在执行器队列中，取消后不会再执行
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert await running == ("OK", 1)
+        await client.aclose()
+        assert backend.history == [{"text-01": "first"}]
+        assert backend.calls["print_label"] == 1
+
+    asyncio.run(main())
+
+
+def test_per_instance_calls_run_in_submission_order():
+    async def main():
+        # 随机延迟下若调用并行执行，完成顺序会被打乱
+        client = make_async_sdk(latency=0.001, jitter=0.01, seed=1)
+        backend = client.sdk.backend
+        results = await asyncio.gather(*(client.print_label(label(str(i))) for i in range(20)))
+        await client.aclose()
+        assert results == [("OK", 1)] * 20
+        assert [record["text-01"] for record in backend.history] == [str(i) for i in range(20)]
+
+    asyncio.run(main())
+
+
+def test_default_timeout_can_be_overridden_per_call():
+    async def main():
+        async with make_async_sdk(latency=0.1, timeout=0.01) as client:
+            assert await client.print_label(label("ok"), timeout=None) == ("OK", 1)
+
+    asyncio.run(main())
@@ -0,0 +1,175 @@
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from zmprinter import (
+    LabelPrinterSDK,
+    SimulatedBackend,
+    DotNetBackend,
+    PrintScheduler,
+    PrinterConfig,
+    LabelConfig,
+    PrinterStyle,
+    RFIDElement,
+    ZMPrinterLSFError,
+)
+
+
+def test_print_label_copies(make_sdk, make_elements):
+    sdk = make_sdk()
+    result, finished = sdk.print_label(make_elements(), copies=3)
+    assert (result, finished) == ("OK", 3)
+    assert sdk.backend.printed == 3
+    assert sdk.backend.history[-1] == {"text-01": "Hello", "barcode-01": "123456"}
+
+
+def test_print_label_failure_stops_at_error(make_sdk, make_elements):
+    sdk = make_sdk(failure_rate=1.0)
+    result, finished = sdk.print_label(make_elements(), copies=3, stop_at_error=True)
+    assert result.startswith("Error:")
+    assert finished == 0
+    assert sdk.backend.calls["print_label"] == 1
+
+
+def test_print_batch_updates_slots(make_sdk, make_elements):
+    sdk = make_sdk()
+    template = sdk.compile_template(make_elements(), slots=["text-01"])
+    succeeded, failed = sdk.print_batch(template, [{"text-01": f"SN{i}"} for i in range(5)])
+    assert (succeeded, failed) == (5, 0)
+    assert [record["text-01"] for record in sdk.backend.history] == [f"SN{i}" for i in range(5)]
+
+
+def test_template_is_independent_of_caller_elements(make_sdk, make_elements):
+    sdk = make_sdk()
+    elements = make_elements()
+    template = sdk.compile_template(elements)
+
+    # 调用方修改自己的元素后，模板仍按上一次写入 .NET 对象的值判断是否需要更新
+    sdk.update_element_data(elements, "text-01", "B")
+    sdk.print_template(template, {"text-01": "B"})
+    assert sdk.backend.history[-1]["text-01"] == "B"
+
+    # 模板的槽位更新不会修改调用方的元素
+    sdk.print_template(template, {"text-01": "C"})
+    assert sdk.backend.history[-1]["text-01"] == "C"
+    assert elements[0].data == "B"
+
+
+def test_preview_size_follows_dpi(make_sdk, make_elements):
+    sdk = make_sdk()
+    image = sdk.preview_label(make_elements())
+    assert image.size == (1181, 354)
+
+
+def test_status_and_rfid(make_sdk):
+    sdk = make_sdk(PrinterStyle.RFID_USB, status_code=89, uhf_tag_data="E200ABCD")
+    assert sdk.get_printer_status() == (89, "标签用完")
+    assert sdk.read_uhf_tag() == "E200ABCD"
+
+
+def test_read_lsf_roundtrip(make_sdk, make_elements):
+    sdk = make_sdk(PrinterStyle.RFID_USB)
+    elements = make_elements() + [RFIDElement(object_name="rfiduhf-01", data="ABCD1234")]
+    template = sdk.compile_template(elements)
+    sdk.backend.register_lsf("demo.lsf", template.dotnet_printer, template.dotnet_label, template.dotnet_elements)
+
+    printer_config, label_config, read_elements, message = sdk.read_lsf("demo.lsf")
+    assert message == ""
+    assert printer_config.interface == PrinterStyle.RFID_USB
+    assert label_config.width == 100
+    assert read_elements.names() == ["text-01", "barcode-01", "rfiduhf-01"]
+    assert read_elements.get("barcode-01").data == "123456"
+
+    with pytest.raises(ZMPrinterLSFError):
+        sdk.read_lsf("missing.lsf")
+
+
+def test_scheduler_skips_unavailable_printer(make_elements):
+    backends = {"A": SimulatedBackend(status_code=89), "B": SimulatedBackend()}
+    label_config = LabelConfig(width=100, height=30)
+    with PrintScheduler(label_config=label_config) as scheduler:
+        for name, backend in backends.items():
+            config = PrinterConfig(interface=PrinterStyle.USB, mbsn=name)
+            scheduler.add_printer(config, sdk=LabelPrinterSDK(printer_config=config, backend=backend))
+        results = [scheduler.submit(make_elements()).result(timeout=5) for _ in range(4)]
+
+    assert all(result.printer == "B" for result in results)
+    assert backends["A"].printed == 0
+    assert backends["B"].printed == 4
+
+
+class FakeBitmap:
+    """模拟 System.Drawing.Bitmap：LockBits 返回指向 ctypes 缓冲区的 BitmapData，Save 写出 PNG"""
+
+    def __init__(self, image, bottom_up=False):
+        import ctypes
+
+        self.image = image
+        self.Width, self.Height = image.size
+        self.PixelFormat = "Format24bppRgb" if image.mode == "RGB" else "Format32bppArgb"
+        pixel_size = 3 if image.mode == "RGB" else 4
+        raw = image.tobytes("raw", "BGR" if image.mode == "RGB" else "BGRA")
+        row = self.Width * pixel_size
+        stride = (row + 3) // 4 * 4  # GDI+ 的行按 4 字节对齐
+        rows = [raw[y * row : (y + 1) * row] + b"\xee" * (stride - row) for y in range(self.Height)]
+        if bottom_up:
+            rows.reverse()
+        self._buffer = ctypes.create_string_buffer(b"".join(rows))
+        base = ctypes.addressof(self._buffer)
+        scan0 = base + stride * (self.Height - 1) if bottom_up else base
+        self.data = SimpleNamespace(
+            Stride=-stride if bottom_up else stride, Scan0=SimpleNamespace(ToInt64=lambda: scan0)
+        )
+        self.unlocked = False
+
+    def LockBits(self, rect, mode, pixel_format):
+        assert pixel_format == self.PixelFormat
+        return self.data
+
+    def UnlockBits(self, data):
+        self.unlocked = True
+
+    def Save(self, stream, image_format):
+        self.image.save(stream, format="PNG")
+
+
+def fake_dotnet():
+    class MemoryStream(io.BytesIO):
+        def ToArray(self):
+            return self.getvalue()
+
+        def Close(self):
+            self.close()
+
+    return SimpleNamespace(
+        PixelFormat=SimpleNamespace(Format24bppRgb="Format24bppRgb", Format32bppArgb="Format32bppArgb"),
+        ImageLockMode=SimpleNamespace(ReadOnly="ReadOnly"),
+        ImageFormat=SimpleNamespace(Png="Png"),
+        Rectangle=lambda *args: args,
+        MemoryStream=MemoryStream,
+    )
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA"])
+@pytest.mark.parametrize("bottom_up", [False, True])
+def test_bitmap_pixels_match_png_fallback(monkeypatch, tmp_path, mode, bottom_up):
+    from PIL import Image
+
+    import zmprinter.backends as backends
+
+    monkeypatch.setattr(backends, "get_dotnet", fake_dotnet)
+    dll_path = tmp_path / "LabelPrinter.dll"
+    dll_path.write_bytes(b"")
+    backend = DotNetBackend(str(dll_path))
+
+    # 宽度为奇数，24 位位图的每行带有对齐填充
+    image = Image.new(mode, (5, 3))
+    image.putdata([(x * 50, y * 80, (x + y) * 20, 255 - x * 40)[: len(mode)] for y in range(3) for x in range(5)])
+    bitmap = FakeBitmap(image, bottom_up=bottom_up)
+
+    pixels = backend._convert_bitmap_pixels(bitmap)
+    fallback = backend._convert_bitmap_png(bitmap)
+    assert bitmap.unlocked
+    assert pixels.mode == fallback.mode == mode
+    assert pixels.size == fallback.size and pixels.tobytes() == fallback.tobytes() == image.tobytes()
@@ -0,0 +1,131 @@
+import threading
+
+from zmprinter import (
+    LabelConfig,
+    TextElement,
+)
+from zmprinter.cache import ConversionCache, PreviewCache
+
+
+def test_conversion_cache_hits_and_invalidation():
+    cache = ConversionCache()
+    elem = TextElement(object_name="text-01", data="A")
+    converted = []
+
+    def convert(obj):
+        converted.append(obj.data)
+        return object()
+
+    first = cache.get(elem, convert)
+    assert cache.get(elem, convert) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # 修改任意字段都会重新转换
+    elem.data = "B"
+    second = cache.get(elem, convert)
+    assert second is not first and converted == ["A", "B"]
+    elem.x = 20
+    assert cache.get(elem, convert) is not second
+
+    cache.invalidate(elem)
+    cache.get(elem, convert)
+    assert cache.misses == 4
+
+
+def test_payload_reused_until_config_changes(make_sdk, make_elements):
+    sdk = make_sdk()
+    elements = make_elements()
+    payload = sdk._get_dotnet_payload(sdk.printer_config, sdk.label_config, elements)
+    assert sdk._get_dotnet_payload(sdk.printer_config, sdk.label_config, elements) == payload
+
+    # 原地修改配置对象也会使缓存失效
+    sdk.printer_config.dpi = 600
+    sdk.label_config.width = 80
+    printer, label, objects = sdk._get_dotnet_payload(sdk.printer_config, sdk.label_config, elements)
+    assert printer is not payload[0] and label is not payload[1]
+    assert objects is payload[2]
+
+    elements[0].data = "World"
+    objects = sdk._get_dotnet_payload(sdk.printer_config, sdk.label_config, elements)[2]
+    assert objects is not payload[2]
+    assert objects[1] is payload[2][1]
+
+
+def test_copies_reuse_one_payload(make_sdk, make_elements):
+    sdk = make_sdk()
+    seen = []
+    print_label = sdk.backend.print_label
+    sdk.backend.print_label = lambda printer, label, objects: (
+        seen.append((printer, label, objects)) or print_label(printer, label, objects)
+    )
+
+    assert sdk.print_label(make_elements(), copies=5) == ("OK", 5)
+    assert len(seen) == 5 and all(all(a is b for a, b in zip(call, seen[0])) for call in seen)
+    # 一次打印只转换 1 个打印机、1 个标签和 2 个元素，与份数无关
+    assert sdk._conversion_cache.misses == 4
+
+
+def test_conversion_cache_counters_are_thread_safe():
+    cache = ConversionCache()
+    elements = [TextElement(object_name=f"text-{i}", data="x") for i in range(10)]
+
+    def worker():
+        for _ in range(200):
+            for elem in elements:
+                cache.get(elem, lambda obj: object())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.hits + cache.misses == 8 * 200 * 10
+
+
+def test_preview_cache_lru_eviction():
+    from PIL import Image
+
+    # 每张 10x10 RGB 图像占 300 字节，容量只够两张
+    cache = PreviewCache(max_bytes=600)
+    cache.put("a", Image.new("RGB", (10, 10)))
+    cache.put("b", Image.new("RGB", (10, 10)))
+    assert cache.get("a") is not None  # a 变为最近使用
+    cache.put("c", Image.new("RGB", (10, 10)))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 2 and stats["bytes"] == 600
+
+    # 超过总容量的图像不缓存
+    cache.put("big", Image.new("RGB", (20, 20)))
+    assert cache.get("big") is None and cache.stats()["entries"] == 2
+
+
+def test_preview_cache_returns_copies():
+    from PIL import Image
+
+    cache = PreviewCache()
+    cache.put("a", Image.new("RGB", (2, 2), "white"))
+    cache.get("a").putpixel((0, 0), (0, 0, 0))
+    assert cache.get("a").getpixel((0, 0)) == (255, 255, 255)
+
+
+def test_preview_cache_hits_and_content_invalidation(make_sdk, make_elements):
+    sdk = make_sdk()
+    cache = sdk.enable_preview_cache()
+    elements = make_elements()
+
+    first = sdk.preview_label(elements)
+    second = sdk.preview_label(make_elements())  # 内容相同的新对象
+    assert first is not None and second is not None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert sdk.backend.calls["get_label_image"] == 1
+
+    elements[0].data = "World"
+    sdk.preview_label(elements)
+    elements[1].x = 6
+    sdk.preview_label(elements)
+    sdk.preview_label(elements, label_config=LabelConfig(width=100, height=40))
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert sdk.backend.calls["get_label_image"] == 4
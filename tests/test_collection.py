@@ -0,0 +1,59 @@
+import copy
+import pickle
+
+from zmprinter import ElementCollection, TextElement, BarcodeElement, BarcodeType
+
+
+def make_collection() -> ElementCollection:
+    shared = TextElement(object_name="text-02", data="")
+    shared.variables = [{"sharename": "SN", "data": ""}]
+    return ElementCollection(
+        [
+            TextElement(object_name="text-01", data="A"),
+            shared,
+            BarcodeElement(object_name="barcode-01", data="1", barcode_type=BarcodeType.QR_CODE),
+        ]
+    )
+
+
+def test_lookup_and_update():
+    coll = make_collection()
+    assert coll.get("barcode-01") is coll[2]
+    assert coll.get("missing") is None
+    assert coll.names() == ["text-01", "text-02", "barcode-01"]
+    assert coll.sharenames() == ["SN"]
+
+    assert coll.update("text-01", "B") and coll[0].data == "B"
+    assert coll.update("SN", "123") and coll[1].variables[0]["data"] == "123"
+    assert not coll.update("missing", "x")
+    assert coll.update_many({"text-01": "C", "barcode-01": "2", "nope": "x"}) == ["nope"]
+    assert (coll[0].data, coll[2].data) == ("C", "2")
+
+
+def test_reindex_after_mutation():
+    coll = make_collection()
+    coll.insert(0, TextElement(object_name="text-00", data=""))
+    coll.append(TextElement(object_name="text-03", data=""))
+    coll += [TextElement(object_name="text-04", data="")]
+    assert coll.get("text-00") is coll[0] and coll.get("text-04") is coll[-1]
+
+    replacement = TextElement(object_name="text-new", data="")
+    coll[1] = replacement
+    assert coll.get("text-01") is None and coll.get("text-new") is replacement
+
+    del coll[0]
+    assert coll.get("text-00") is None
+    coll.remove(replacement)
+    assert coll.get("text-new") is None
+    assert coll.pop().object_name == "text-04" and coll.get("text-04") is None
+    coll.clear()
+    assert coll.names() == [] and coll.sharenames() == []
+
+
+def test_pickle_and_copy_round_trip():
+    coll = make_collection()
+    for restored in (pickle.loads(pickle.dumps(coll)), copy.deepcopy(coll), copy.copy(coll)):
+        assert isinstance(restored, ElementCollection)
+        assert restored.names() == coll.names() and restored.sharenames() == ["SN"]
+        assert restored.update("SN", "9")
+        assert restored.get("text-02").variables[0]["data"] == "9"
@@ -0,0 +1,76 @@
+import pytest
+
+from zmprinter import (
+    LabelPrinterSDK,
+    SimulatedBackend,
+    PrinterConfig,
+    LabelConfig,
+    PrinterStyle,
+    RFIDElement,
+    TextElement,
+    RFIDDataBlock,
+    RFIDDataType,
+    ZMPrinterConfigError,
+    encode_sgtin96,
+    decode_sgtin96,
+    sgtin96_batch,
+    serial_batch,
+)
+
+
+def test_sgtin96_round_trip():
+    # GS1 EPC Tag Data Standard 中的示例: urn:epc:id:sgtin:0614141.812345.6789, 过滤值 3
+    epc = encode_sgtin96("0614141", "812345", 6789, filter_value=3)
+    assert epc == "3074257BF7194E4000001A85"
+    assert decode_sgtin96(epc) == (3, "0614141", "812345", 6789)
+
+    with pytest.raises(ZMPrinterConfigError):
+        encode_sgtin96("0614141", "12345", 1)
+    with pytest.raises(ZMPrinterConfigError):
+        encode_sgtin96("0614141", "812345", 1 << 38)
+
+
+def test_sgtin96_batch_matches_single_encoding():
+    batch = sgtin96_batch("0614141", "812345", 4094, 10000)
+    assert len(batch) == 10000 and batch.nbytes == 80000
+    values = list(batch)
+    assert values[0] == encode_sgtin96("0614141", "812345", 4094)
+    assert values[-1] == batch[9999] == encode_sgtin96("0614141", "812345", 14093)
+    assert decode_sgtin96(values[5000]).serial == 9094
+
+
+def test_serial_batch_fits_element():
+    user = RFIDElement("rfiduhf-01", data="", rfid_data_block=RFIDDataBlock.USER, data_length_double_words=True)
+    batch = serial_batch(1, 3, digits=4, head="AB", element=user)
+    assert list(batch) == ["AB000100", "AB000200", "AB000300"]
+
+    front = RFIDElement("rfiduhf-01", data="", data_alignment=1)
+    assert serial_batch(255, 1, element=front)[0] == "00FF"
+
+    with pytest.raises(ZMPrinterConfigError):
+        serial_batch(0, 1, head="00" * 62, element=front)
+    with pytest.raises(ZMPrinterConfigError):
+        serial_batch(0, 1, element=RFIDElement("rfiduhf-01", data="", rfid_data_type=RFIDDataType.TEXT))
+
+
+def test_serial_batch_rejects_out_of_range_values():
+    assert serial_batch((1 << 64) - 1, 1)[0] == "F" * 16
+    with pytest.raises(ZMPrinterConfigError, match="64 位"):
+        serial_batch((1 << 64) - 2, 2, step=2)
+    with pytest.raises(ZMPrinterConfigError, match="2 位十六进制"):
+        serial_batch(250, 10, digits=2)
+    with pytest.raises(ZMPrinterConfigError, match="1-16"):
+        serial_batch(0, 1, digits=0)
+
+
+def test_batch_records_feed_print_batch():
+    sdk = LabelPrinterSDK(
+        printer_config=PrinterConfig(interface=PrinterStyle.RFID_USB),
+        label_config=LabelConfig(width=100, height=30),
+        backend=SimulatedBackend(),
+    )
+    batch = sgtin96_batch("0614141", "812345", 1, 5)
+    base = ({"text-01": f"#{i}"} for i in range(5))
+    elements = [TextElement("text-01", data=""), RFIDElement("rfiduhf-01", data="")]
+    assert sdk.print_batch(elements, batch.records("rfiduhf-01", base)) == (5, 0)
+    assert sdk.backend.history[-1] == {"rfiduhf-01": batch[4], "text-01": "#4"}
@@ -0,0 +1,140 @@
+import base64
+import io
+import os
+
+import pytest
+
+from zmprinter import (
+    ImageDither,
+    ImageElement,
+    ImageStore,
+    LabelConfig,
+    LabelElement,
+    LabelPrinterSDK,
+    PrinterConfig,
+    SimulatedBackend,
+    content_digest,
+    get_image_store,
+    load_job,
+    preprocess_image,
+)
+from zmprinter.backends import ByteArrayCache
+
+PIXEL_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=="
+)
+
+
+def test_store_decodes_each_payload_once():
+    store = ImageStore()
+    text = base64.b64encode(PIXEL_PNG).decode("ascii")
+    first = store.decode(text)
+    assert first == PIXEL_PNG
+    assert store.decode(str(text)) is first
+    assert store.intern(bytes(PIXEL_PNG)) is first
+    assert store.stats() == {"images": 1, "bytes": len(PIXEL_PNG), "hits": 2, "misses": 1}
+
+
+def test_store_evicts_least_recently_used():
+    store = ImageStore(max_bytes=10)
+    store.intern(b"aaaaa")
+    store.intern(b"bbbbb")
+    store.intern(b"aaaaa")
+    store.intern(b"ccccc")
+    assert len(store) == 2
+    assert store.total_bytes == 10
+    assert store.intern(b"bbbbb") is not None and store.misses == 4
+
+
+def test_from_data_shares_image_bytes_across_jobs():
+    text = base64.b64encode(PIXEL_PNG * 3).decode("ascii")
+    objects = [{"ObjectName": f"image-{i}", "imagedata": text} for i in range(3)]
+    first = load_job({"LabelObjectList": objects}).elements
+    second = LabelElement.from_data(dict(objects[0]))
+    assert isinstance(second, ImageElement)
+    assert all(elem.image_data is second.image_data for elem in first)
+    assert get_image_store().intern(PIXEL_PNG * 3) is second.image_data
+
+
+@pytest.mark.parametrize("bad", ["not base64!", "abc", "abéc"])
+def test_from_data_rejects_invalid_base64(bad):
+    with pytest.raises(ValueError, match="image-bad"):
+        LabelElement.from_data({"ObjectName": "image-bad", "imagedata": bad})
+
+
+def test_byte_array_cache_converts_each_payload_once():
+    conversions = []
+
+    def convert(data):
+        conversions.append(data)
+        return bytearray(data)
+
+    cache = ByteArrayCache(max_bytes=len(PIXEL_PNG) * 2)
+    first = cache.get(PIXEL_PNG, convert)
+    assert cache.get(bytes(PIXEL_PNG), convert) is first
+    assert cache.get(bytearray(PIXEL_PNG), convert) is first
+    assert len(conversions) == 1 and (cache.hits, cache.misses) == (2, 1)
+
+    cache.get(b"x" * len(PIXEL_PNG), convert)
+    cache.get(b"y" * len(PIXEL_PNG), convert)
+    assert len(cache) == 2 and cache.total_bytes == len(PIXEL_PNG) * 2
+    cache.get(PIXEL_PNG, convert)
+    assert len(conversions) == 4
+
+
+def test_image_path_is_loaded_lazily_and_shared(tmp_path):
+    path = tmp_path / "logo.png"
+    path.write_bytes(PIXEL_PNG)
+    elements = [ImageElement(object_name=f"image-{i}", image_path=path) for i in range(3)]
+    assert all("_image_data" in vars(e) and vars(e)["_image_data"] is None for e in elements)
+    assert elements[0].image_data == PIXEL_PNG
+    assert all(e.image_data is elements[0].image_data for e in elements)
+
+    before = content_digest(elements[0])
+    path.write_bytes(PIXEL_PNG * 2)
+    os.utime(path, ns=(0, 10**18))
+    assert content_digest(elements[0]) != before
+    assert elements[1].image_data == PIXEL_PNG * 2
+
+    with pytest.raises(IOError):
+        ImageElement(object_name="image-missing", image_path=tmp_path / "missing.png")
+
+
+def make_photo(size=(400, 200)) -> bytes:
+    from PIL import Image
+
+    image = Image.linear_gradient("L").resize(size).convert("RGBA")
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("dither", list(ImageDither))
+def test_preprocess_scales_to_dpi_and_converts_to_1bit(dither):
+    from PIL import Image
+
+    processed = preprocess_image(make_photo(), dpi=300, dither=dither, width_mm=20, height_mm=20)
+    with Image.open(io.BytesIO(processed)) as image:
+        assert image.mode == "1"
+        assert image.size == (236, 118)  # 20 mm @ 300 dpi = 236 px，保持 2:1 长宽比
+        white = image.convert("L").histogram()[255]
+        assert 0 < white < 236 * 118
+
+
+def test_sdk_preprocesses_dithered_images_once_per_dpi():
+    store = get_image_store()
+    photo = make_photo()
+    element = ImageElement(
+        object_name="image-1", image_data=photo, fixed_width=10, fixed_height=5, dither=ImageDither.ORDERED
+    )
+    sdk = LabelPrinterSDK(printer_config=PrinterConfig(dpi=203), label_config=LabelConfig(), backend=SimulatedBackend())
+    sdk.preview_label([element])
+    first = sdk._get_dotnet_payload(sdk.printer_config, sdk.label_config, [element])[2][0].imagedata
+    misses = store.misses
+    sdk.preview_label([element])
+    assert store.misses == misses
+
+    sdk.printer_config = PrinterConfig(dpi=600)
+    second = sdk._get_dotnet_payload(sdk.printer_config, sdk.label_config, [element])[2][0].imagedata
+    assert len(second) > len(first)
+    assert first != photo and second != photo
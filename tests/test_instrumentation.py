@@ -0,0 +1,42 @@
+from zmprinter import (
+    TextElement,
+    CallbackSink,
+    MetricsSink,
+)
+
+
+def test_disabled_by_default(make_sdk):
+    sdk = make_sdk()
+    assert sdk.instrumentation is None
+    assert sdk.print_label([TextElement(object_name="text-01", data="A")]) == ("OK", 1)
+
+
+def test_print_label_stages(make_sdk):
+    sdk = make_sdk()
+    spans = []
+    sdk.enable_instrumentation(CallbackSink(spans.append))
+
+    sdk.print_label([TextElement(object_name="text-01", data="A")], copies=2)
+
+    names = [span.name for span in spans]
+    assert names.count("dll.PrintLabel") == 2
+    assert {"convert.printer", "convert.label", "convert.element", "convert.payload"} <= set(names)
+    assert names[-1] == "sdk.print_label"
+    assert next(span for span in spans if span.name == "dll.PrintLabel").parent == "sdk.print_label"
+    assert all(span.duration >= 0 and span.error is None for span in spans)
+
+
+def test_metrics_sink_prometheus_output(make_sdk):
+    sdk = make_sdk(status_code=0)
+    metrics = MetricsSink()
+    sdk.enable_instrumentation(metrics)
+
+    sdk.preview_label([TextElement(object_name="text-01", data="A")])
+    sdk.get_printer_status()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["dll.GetLabelImage"]["count"] == 1
+    assert snapshot["convert.bitmap"]["count"] == 1
+    text = metrics.render()
+    assert 'zmprinter_stage_calls_total{stage="dll.getPrinterStatusCode"} 1' in text
+    assert 'zmprinter_stage_seconds_bucket{stage="sdk.preview_label",le="+Inf"} 1' in text
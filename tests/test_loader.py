@@ -0,0 +1,87 @@
+import io
+import json
+
+import pytest
+
+from zmprinter import (
+    LabelElement,
+    PrinterStyle,
+    ZMPrinterConfigError,
+    load_element,
+    load_elements,
+    load_job,
+    iter_jobs,
+)
+
+SAMPLES = [
+    {"ObjectName": "text-1", "objectdata": "Hello", "Xposition": 2, "Yposition": 4, "fontsize": 4.5},
+    {"ObjectName": "Text-2", "objectdata": "para", "texttype": 1, "textwidth": 40, "textwidthbeyound": 2},
+    {"ObjectName": "text-3", "objectdata": "round", "texttype": 2, "direction": 1, "transparent": False},
+    {"ObjectName": "barcode-1", "objectdata": "123456", "barcodekind": "QR Code", "barcodeheight": 10},
+    {"ObjectName": "barcode-2", "objectdata": "7890", "barcodekind": "unknown kind", "barcodeheight": 0},
+    {"ObjectName": "rfiduhf-1", "objectdata": "ABCD", "RFIDEncodertype": 0, "RFIDDatablock": 1, "RFIDerrortimes": 1},
+    {"ObjectName": "rfiduhf-2", "objectdata": "ABCD", "RFIDEncodertype": 9, "RFIDDatatype": 1},
+    {"ObjectName": "line-1", "Xposition": 1, "lineDashStyle": 2, "lineclass": 2},
+    {"ObjectName": "rectangle-1", "Yposition": 8, "fillRectangle": True, "rectangleclass": 1},
+]
+
+
+@pytest.mark.parametrize("data", SAMPLES, ids=[s["ObjectName"] for s in SAMPLES])
+def test_load_element_matches_from_data(data):
+    expected = LabelElement.from_data(dict(data))
+    loaded = load_element(data)
+    assert type(loaded) is type(expected)
+    assert vars(loaded) == vars(expected)
+
+
+def test_load_elements_strict_and_lenient():
+    objects = [SAMPLES[0], {"ObjectName": "circle-1"}, {"objectdata": "no name"}]
+    with pytest.raises(ZMPrinterConfigError):
+        load_elements(objects)
+    elements = load_elements(objects, strict=False)
+    assert [e.object_name for e in elements] == ["text-1"]
+    assert elements.get("text-1") is elements[0]
+
+
+def test_load_job_configs():
+    job = load_job(
+        json.dumps(
+            {
+                "Operate": "print",
+                "Printer": {"printerinterface": "RFID_USB", "printnum": 2, "printDarkness": 18, "printermbsn": ""},
+                "LabelFormat": {"labelwidth": 103, "labelheight": 40, "labelrowgap": 4},
+                "LabelObjectList": SAMPLES,
+            }
+        )
+    )
+    assert job.printer_config.interface == PrinterStyle.RFID_USB
+    assert job.printer_config.darkness == 18
+    assert job.printer_config.mbsn is None
+    assert (job.label_config.width, job.label_config.height, job.label_config.gap) == (103.0, 40.0, 4.0)
+    assert job.copies == 2
+    assert job.operate == "print"
+    assert len(job.elements) == len(SAMPLES)
+
+
+def test_iter_jobs_streams_json_lines():
+    lines = [json.dumps({"Printer": {"printnum": i}, "LabelObjectList": [SAMPLES[0]]}) for i in range(1, 4)]
+    source = io.StringIO("\n".join(lines[:2]) + "\n\n" + lines[2] + "\n")
+    assert [job.copies for job in iter_jobs(source)] == [1, 2, 3]
+
+    with pytest.raises(ZMPrinterConfigError):
+        list(iter_jobs(["{not json"]))
+    assert [job.copies for job in iter_jobs(["{not json", lines[1]], strict=False)] == [2]
+
+
+def test_iter_jobs_rejects_null_and_wrongly_typed_configs():
+    lines = [
+        json.dumps({"Printer": {"printerdpi": None}}),
+        json.dumps({"Printer": "USB"}),
+        json.dumps({"Printer": {"printnum": 3}}),
+    ]
+    with pytest.raises(ZMPrinterConfigError, match="第 1 行") as excinfo:
+        list(iter_jobs(lines))
+    assert isinstance(excinfo.value.original_exception, TypeError)
+    with pytest.raises(ZMPrinterConfigError, match="第 2 行"):
+        list(iter_jobs([lines[2], lines[1]]))
+    assert [job.copies for job in iter_jobs(lines, strict=False)] == [3]
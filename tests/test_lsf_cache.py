@@ -0,0 +1,62 @@
+import os
+
+from zmprinter import (
+    LabelPrinterSDK,
+    LSFCache,
+    PrinterStyle,
+    TextElement,
+    RFIDElement,
+)
+
+
+def register(sdk: LabelPrinterSDK, path, text: str):
+    template = sdk.compile_template(
+        [TextElement(object_name="text-01", data=text), RFIDElement(object_name="rfiduhf-01", data="ABCD")]
+    )
+    sdk.backend.register_lsf(str(path), template.dotnet_printer, template.dotnet_label, template.dotnet_elements)
+
+
+def test_read_lsf_uses_cache_until_file_changes(make_sdk, tmp_path):
+    path = tmp_path / "demo.lsf"
+    path.write_bytes(b"v1")
+    cache = LSFCache()
+    sdk = make_sdk(PrinterStyle.RFID_USB, lsf_cache=cache)
+    register(sdk, path, "first")
+
+    first = sdk.read_lsf(path)
+    second = sdk.read_lsf(path)
+    assert sdk.backend.calls["open_label"] == 1
+    assert second[2].get("text-01").data == "first"
+    assert second[2] is not first[2]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # 返回的是副本，修改不影响缓存
+    second[2].update("text-01", "changed")
+    assert sdk.read_lsf(path)[2].get("text-01").data == "first"
+
+    register(sdk, path, "second")
+    path.write_bytes(b"v2-longer")
+    assert sdk.read_lsf(path)[2].get("text-01").data == "second"
+    assert sdk.backend.calls["open_label"] == 2
+
+
+def test_disk_cache_survives_new_process_state(make_sdk, tmp_path):
+    path = tmp_path / "demo.lsf"
+    path.write_bytes(b"content")
+    sdk = make_sdk(PrinterStyle.RFID_USB, lsf_cache=LSFCache(directory=tmp_path / "cache"))
+    register(sdk, path, "on disk")
+    sdk.read_lsf(path)
+
+    other = make_sdk(PrinterStyle.RFID_USB, lsf_cache=LSFCache(directory=tmp_path / "cache"))
+    printer_config, label_config, elements, message = other.read_lsf(path)
+    assert message == ""
+    assert "open_label" not in other.backend.calls
+    assert other.lsf_cache.disk_hits == 1
+    assert printer_config.interface == PrinterStyle.RFID_USB
+    assert elements.names() == ["text-01", "rfiduhf-01"]
+
+    # 复制的文件内容相同，即使路径和修改时间不同也命中
+    copy = tmp_path / "copy.lsf"
+    copy.write_bytes(b"content")
+    os.utime(copy, ns=(0, 0))
+    assert other.read_lsf(copy)[2].names() == ["text-01", "rfiduhf-01"]
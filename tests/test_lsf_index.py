@@ -0,0 +1,103 @@
+from zmprinter import (
+    LabelPrinterSDK,
+    SimulatedBackend,
+    LSFIndex,
+    LabelConfig,
+    BarcodeType,
+    TextElement,
+    BarcodeElement,
+    RFIDElement,
+)
+from zmprinter.backends import SimulatedObject
+
+
+class VariableList(list):
+    """模拟 .NET List 的 Count 属性"""
+
+    Count = property(len)
+
+
+def write_template(sdk: LabelPrinterSDK, path, elements, width: float = 60, sharenames=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(repr([e.object_name for e in elements]).encode())
+    template = sdk.compile_template(elements, label_config=LabelConfig(width=width, height=40))
+    for obj in template.dotnet_elements:
+        if obj.ObjectName in (sharenames or {}):
+            obj.Variables = VariableList([SimulatedObject(sharename=sharenames[obj.ObjectName], data="")])
+    sdk.backend.register_lsf(str(path), template.dotnet_printer, template.dotnet_label, template.dotnet_elements)
+
+
+def test_scan_and_query(make_sdk, tmp_path):
+    sdk = make_sdk()
+    write_template(
+        sdk,
+        tmp_path / "a.lsf",
+        [TextElement(object_name="text-01", data="A"), TextElement(object_name="text-02", data="")],
+        sharenames={"text-02": "SN"},
+    )
+    write_template(
+        sdk,
+        tmp_path / "sub" / "b.lsf",
+        [BarcodeElement(object_name="barcode-01", data="1", barcode_type=BarcodeType.QR_CODE)],
+        width=100,
+    )
+    write_template(sdk, tmp_path / "sub" / "c.lsf", [RFIDElement(object_name="rfiduhf-01", data="AB")])
+    (tmp_path / "broken.lsf").write_bytes(b"?")
+
+    index = LSFIndex(sdk, workers=4)
+    result = index.scan(tmp_path)
+    assert (result.added, result.failed) == (4, 1)
+    assert len(index) == 4 and len(index.errors()) == 1
+
+    assert [e.path for e in index.find(sharename="SN")] == [str(tmp_path / "a.lsf")]
+    assert [e.path for e in index.find(barcode_type=BarcodeType.QR_CODE)] == [str(tmp_path / "sub" / "b.lsf")]
+    assert [e.path for e in index.find(element_type="rfid")] == [str(tmp_path / "sub" / "c.lsf")]
+    assert [e.path for e in index.find(label_size=(100, 40))] == [str(tmp_path / "sub" / "b.lsf")]
+    assert index.values("object_names")["text-01"] == {str(tmp_path / "a.lsf")}
+
+
+def test_rescan_is_incremental_and_persistent(make_sdk, tmp_path):
+    sdk = make_sdk()
+    write_template(sdk, tmp_path / "a.lsf", [TextElement(object_name="text-01", data="A")])
+    write_template(sdk, tmp_path / "b.lsf", [TextElement(object_name="text-02", data="B")])
+    index = LSFIndex(sdk)
+    index.scan(tmp_path)
+    assert sdk.backend.calls["open_label"] == 2
+
+    write_template(
+        sdk,
+        tmp_path / "a.lsf",
+        [TextElement(object_name="text-03", data="A2"), RFIDElement(object_name="rfiduhf-01", data="AB")],
+    )
+    (tmp_path / "b.lsf").unlink()
+    result = index.scan(tmp_path)
+    assert (result.added, result.updated, result.removed, result.unchanged) == (0, 1, 1, 0)
+    assert sdk.backend.calls["open_label"] == 3
+    assert index.get(tmp_path / "a.lsf").object_names == ("text-03", "rfiduhf-01")
+
+    index.save(tmp_path / "index.json")
+    reloaded = LSFIndex(sdk)
+    assert reloaded.load(tmp_path / "index.json") == 1
+    assert reloaded.scan(tmp_path).unchanged == 1
+    assert sdk.backend.calls["open_label"] == 3
+    assert reloaded.find(object_name="text-03")[0].element_types == ("text", "rfid")
+
+
+def test_parallel_scan_uses_one_sdk_per_worker(make_sdk, tmp_path):
+    sdk = make_sdk()
+    for i in range(8):
+        write_template(sdk, tmp_path / f"{i}.lsf", [TextElement(object_name=f"text-{i:02d}", data="")])
+
+    created = []
+
+    def sdk_factory():
+        backend = SimulatedBackend(latency=0.02)
+        backend._lsf_files = sdk.backend._lsf_files
+        created.append(LabelPrinterSDK(backend=backend))
+        return created[-1]
+
+    index = LSFIndex(sdk, workers=4, sdk_factory=sdk_factory)
+    assert index.scan(tmp_path).added == 8
+    assert 1 < len(created) <= 4
+    assert sdk.backend.calls.get("open_label", 0) == 0
+    assert sum(worker.backend.calls.get("open_label", 0) for worker in created) == 8
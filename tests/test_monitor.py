@@ -0,0 +1,110 @@
+import threading
+
+from zmprinter import (
+    LabelPrinterSDK,
+    SimulatedBackend,
+    StatusMonitor,
+    PrintScheduler,
+    PrinterConfig,
+    LabelConfig,
+    PrinterStyle,
+    TextElement,
+)
+
+
+def make_printer(name, **backend_options):
+    config = PrinterConfig(interface=PrinterStyle.USB, mbsn=name)
+    return config, LabelPrinterSDK(printer_config=config, backend=SimulatedBackend(**backend_options))
+
+
+def test_poll_caches_status_and_backs_off():
+    monitor = StatusMonitor(interval=1.0, max_interval=3.0, backoff=2.0)
+    config, sdk = make_printer("A")
+    name = monitor.add_printer(config, sdk=sdk)
+    events = []
+    unsubscribe = monitor.subscribe(events.append)
+
+    assert monitor.get(name) is None
+    first = monitor.poll(name)
+    assert (first.code, len(events)) == (0, 1)
+    monitor.poll(name)
+    monitor.poll(name)
+    assert monitor.stats()["printers"][name]["interval"] == 3.0
+    assert len(events) == 1
+
+    sdk.backend.status_code = 89
+    current = monitor.poll(name)
+    assert events[-1].previous.code == 0 and events[-1].current == current
+    assert monitor.stats()["printers"][name]["interval"] == 1.0
+    # 读取缓存不调用 DLL
+    calls = sdk.backend.calls["get_printer_status_code"]
+    assert monitor.get(name).code == 89 and monitor.snapshot()[name] == current
+    assert sdk.backend.calls["get_printer_status_code"] == calls
+
+    unsubscribe()
+    sdk.backend.status_code = 0
+    monitor.poll(name)
+    assert len(events) == 2
+
+
+def test_background_polling_publishes_changes():
+    changed = threading.Event()
+    with StatusMonitor(interval=0.01, max_interval=0.05) as monitor:
+        config, sdk = make_printer("A", status_code=89)
+        monitor.subscribe(lambda event: event.current.code == 0 and changed.set())
+        monitor.add_printer(config, sdk=sdk)
+        sdk.backend.status_code = 0
+        monitor.refresh()
+        assert changed.wait(timeout=5)
+    assert monitor.stats()["polls"] >= 1
+
+
+def test_scheduler_uses_cached_status():
+    monitor = StatusMonitor()
+    with PrintScheduler(label_config=LabelConfig(width=100, height=30), status_monitor=monitor) as scheduler:
+        for name, code in (("A", 89), ("B", 0)):
+            config, sdk = make_printer(name, status_code=code)
+            scheduler.add_printer(config, sdk=sdk)
+            monitor.poll(name)
+        results = [scheduler.submit([TextElement("text-01", data="x")]).result(timeout=5) for _ in range(3)]
+
+    assert all(result.printer == "B" for result in results)
+    assert all(d.sdk.backend.calls["get_printer_status_code"] == 1 for d in scheduler.printers())
+
+
+class OverlapBackend(SimulatedBackend):
+    """记录同时进入 DLL 的最大调用数"""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.active = 0
+        self.max_active = 0
+        self._active_lock = threading.Lock()
+
+    def _call(self, name):
+        with self._active_lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            super()._call(name)
+        finally:
+            with self._active_lock:
+                self.active -= 1
+
+
+def test_polling_and_printing_share_sdk_serially():
+    backend = OverlapBackend(latency=0.002)
+    config = PrinterConfig(interface=PrinterStyle.USB, mbsn="A")
+    sdk = LabelPrinterSDK(printer_config=config, backend=backend)
+    monitor = StatusMonitor(interval=0.001, max_interval=0.001)
+    with monitor, PrintScheduler(label_config=LabelConfig(width=100, height=30), status_monitor=monitor) as scheduler:
+        scheduler.add_printer(config, sdk=sdk)
+        futures = [scheduler.submit([TextElement("text-01", data=str(i))], copies=2) for i in range(10)]
+        # 手动轮询与后台轮询、打印线程同时进行
+        for _ in range(5):
+            monitor.poll("A")
+        assert all(future.result(timeout=10).finished_count == 2 for future in futures)
+
+    assert backend.printed == 20
+    assert backend.calls["get_printer_status_code"] >= 5
+    assert backend.max_active == 1
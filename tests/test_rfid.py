@@ -0,0 +1,145 @@
+import asyncio
+import functools
+import threading
+import time
+
+import pytest
+
+from zmprinter import (
+    LabelPrinterSDK,
+    SimulatedBackend,
+    RFIDEncodePipeline,
+    PrinterConfig,
+    LabelConfig,
+    PrinterStyle,
+    RFIDElement,
+    TextElement,
+    ZMPrinterConfigError,
+    parse_uhf_tag_data,
+    TagInventory,
+)
+from zmprinter.aio import AsyncLabelPrinterSDK
+
+
+@pytest.fixture
+def make_sdk(make_sdk):
+    """RFID 打印机，读取标签时返回最近写入的数据"""
+    return functools.partial(make_sdk, PrinterStyle.RFID_USB, echo_rfid=True)
+
+
+def make_rfid_elements():
+    return [TextElement(object_name="text-01", data=""), RFIDElement(object_name="rfiduhf-01", data="")]
+
+
+def test_parse_uhf_tag_data():
+    tag = parse_uhf_tag_data("e2801160600002040000a1b2,3000ABCD", area=2, stop_position=1)
+    assert (tag.tid, tag.epc, tag.stop_position) == ("E2801160600002040000A1B2", "3000ABCD", 1)
+    assert parse_uhf_tag_data("E2801160600002040000A1B2" + "1234", area=2).epc == "1234"
+    assert parse_uhf_tag_data("ABCD", area=1).epc == "ABCD"
+    assert parse_uhf_tag_data("", area=2).tid is None
+
+
+def test_pipeline_encodes_and_verifies(make_sdk):
+    sdk = make_sdk()
+    pipeline = RFIDEncodePipeline(sdk, make_rfid_elements())
+    records = ({"text-01": f"#{i}", "rfiduhf-01": f"{i:024x}"} for i in range(20))
+    assert pipeline.encode_all(records) == (20, 0)
+    assert sdk.backend.calls["print_label"] == 20
+    assert "print_blank_page" not in sdk.backend.calls
+    assert sdk.backend.history[-1] == {"text-01": "#19", "rfiduhf-01": f"{19:024X}"}
+
+    stats = pipeline.histograms()
+    assert {"rfid.prepare", "rfid.encode", "rfid.verify", "rfid.label"} <= stats.keys()
+    assert stats["rfid.verify"]["count"] == 20
+
+
+def test_pipeline_voids_verification_failures(make_sdk):
+    sdk = make_sdk(rfid_error_rate=1.0)
+    pipeline = RFIDEncodePipeline(sdk, make_rfid_elements())
+    results = list(pipeline.run([{"rfiduhf-01": "ABCD"}, {"rfiduhf-01": "not-hex"}, {"text-01": "no epc"}]))
+    assert [r.voided for r in results] == [True, False, False]
+    assert "EPC 校验失败" in results[0].error
+    assert results[0].tag.tid is not None
+    assert sdk.backend.calls["print_blank_page"] == 1
+    assert sdk.backend.calls["print_label"] == 1
+
+
+def test_pipeline_stops_early(make_sdk):
+    sdk = make_sdk(rfid_error_rate=1.0)
+    pipeline = RFIDEncodePipeline(sdk, make_rfid_elements(), void_failures=False)
+    results = list(pipeline.run(({"rfiduhf-01": "ABCD"} for _ in range(100)), stop_at_error=True))
+    assert len(results) == 1
+    assert sdk.backend.calls["print_label"] == 1
+
+
+def test_pipeline_stop_does_not_wait_for_blocked_records(make_sdk):
+    release = threading.Event()
+
+    def records():
+        yield {"rfiduhf-01": "ABCD"}
+        release.wait(10)  # 模拟阻塞的数据源
+        yield {"rfiduhf-01": "ABCE"}
+
+    sdk = make_sdk(rfid_error_rate=1.0)
+    pipeline = RFIDEncodePipeline(sdk, make_rfid_elements(), void_failures=False)
+    started = time.perf_counter()
+    results = list(pipeline.run(records(), stop_at_error=True))
+    release.set()
+
+    assert len(results) == 1
+    assert time.perf_counter() - started < 5
+
+
+def test_pipeline_requires_epc_slot(make_sdk):
+    with pytest.raises(ZMPrinterConfigError):
+        RFIDEncodePipeline(make_sdk(), [TextElement(object_name="text-01", data="")])
+
+
+def test_inventory_stops_and_dedupes(make_sdk):
+    sdk = make_sdk()
+    sdk.backend.echo_rfid = False
+    inventory = TagInventory(sdk)
+    tags = list(inventory.scan(max_misses=5))
+    assert [tag.tid for tag in tags] == ["E2801160600002040000A1B2"]
+    stats = inventory.stats
+    assert (stats.reads, stats.unique, stats.duplicates) == (6, 1, 5)
+    assert stats.reads_per_second > 0
+    assert sdk.backend.calls["get_uhf_tag_data"] == 6
+
+    sdk.backend.uhf_tag_data = ""
+    assert list(inventory.scan(max_misses=3)) == []
+    assert inventory.stats.misses == 3
+
+    sdk.backend.uhf_tag_data = "E2801160600002040000A1B2,3000"
+    assert len(list(inventory.scan(max_tags=2, max_misses=0, dedupe=False))) == 2
+
+
+def test_inventory_reuses_converted_configs_and_counts_errors(make_sdk, monkeypatch):
+    sdk = make_sdk(uhf_tag_data="Error: 未检测到标签")
+    sdk.backend.echo_rfid = False
+    conversions = []
+    new_printer = sdk.backend.new_printer
+    monkeypatch.setattr(sdk.backend, "new_printer", lambda: conversions.append(1) or new_printer())
+
+    inventory = TagInventory(sdk)
+    assert list(inventory.scan(max_misses=4)) == []
+    assert (inventory.stats.errors, inventory.stats.reads) == (4, 4)
+    # 配置只转换一次，之后的读取都复用转换缓存
+    assert len(conversions) == 1
+
+
+def test_inventory_hf_and_async(make_sdk):
+    sdk = make_sdk()
+    tags = list(TagInventory(sdk, area=0, hf_protocol=1).scan(max_misses=2))
+    assert [tag.tid for tag in tags] == ["E004015012345678"]
+
+    async def collect():
+        return [tag async for tag in AsyncLabelPrinterSDK(sdk).inventory_tags(area=0, max_misses=2)]
+
+    sdk.backend.echo_rfid = False
+    assert [tag.tid for tag in asyncio.run(collect())] == ["E2801160600002040000A1B2"]
+
+    with pytest.raises(ZMPrinterConfigError):
+        TagInventory(
+            LabelPrinterSDK(printer_config=PrinterConfig(), label_config=LabelConfig(), backend=SimulatedBackend())
+        )
@@ -0,0 +1,82 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import zmprinter.runtime as runtime
+from zmprinter import LabelPrinterSDK, DotNetBackend, get_runtime
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """替换 .NET 运行时和程序集加载，记录每次加载的 DLL 路径"""
+    calls = []
+
+    def load_label_printer(dll_path):
+        calls.append(dll_path)
+        return SimpleNamespace(PrintUtility=object, LSFUtility=object)
+
+    monkeypatch.setattr(runtime, "_runtimes", {})
+    monkeypatch.setattr(runtime, "get_dotnet", lambda: None)
+    monkeypatch.setattr(runtime, "load_label_printer", load_label_printer)
+    return calls
+
+
+def make_dll(directory):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / "LabelPrinter.dll"
+    path.write_bytes(b"")
+    return path
+
+
+def test_same_dll_path_shares_runtime(tmp_path, loads):
+    dll = make_dll(tmp_path / "x64")
+    first = get_runtime(str(dll))
+    # 不同写法的同一路径解析后共享同一个运行时
+    second = get_runtime(str(tmp_path / "x64" / ".." / "x64" / "LabelPrinter.dll"))
+
+    assert first is second
+    assert loads == [str(dll.resolve())]
+    assert runtime.loaded_runtimes() == [first]
+
+
+def test_different_dll_paths_get_separate_runtimes(tmp_path, loads):
+    x64 = get_runtime(str(make_dll(tmp_path / "x64")))
+    x86 = get_runtime(str(make_dll(tmp_path / "x86")))
+
+    assert x64 is not x86
+    assert x64.LabelPrinter is not x86.LabelPrinter
+    assert len(loads) == 2 and len(runtime.loaded_runtimes()) == 2
+
+
+def test_concurrent_first_use_loads_once(tmp_path, loads):
+    dll = str(make_dll(tmp_path))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(get_runtime(dll))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_sdk_instances_share_runtime_handles(tmp_path, loads):
+    dll = str(make_dll(tmp_path))
+    sdks = [LabelPrinterSDK(backend=DotNetBackend(dll)) for _ in range(3)]
+
+    shared = {id(sdk.runtime) for sdk in sdks}
+    assert len(shared) == 1 and len(loads) == 1
+    assert sdks[0].runtime.handles == 3
+
+
+def test_sdk_instances_get_own_utilities(tmp_path, loads):
+    # 同一程序集上的 PrintUtility 不保证线程安全，每个 SDK 各自持有一组
+    dll = str(make_dll(tmp_path))
+    first, second = (LabelPrinterSDK(backend=DotNetBackend(dll)) for _ in range(2))
+
+    assert first.runtime is second.runtime
+    assert first.print_utility is not second.print_utility
+    assert first.lsf_utility is not second.lsf_utility
+    assert first.print_utility is first.backend.print_utility
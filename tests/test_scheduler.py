@@ -0,0 +1,169 @@
+import time
+
+import pytest
+
+from zmprinter import (
+    LabelPrinterSDK,
+    SimulatedBackend,
+    PrintScheduler,
+    PrinterConfig,
+    LabelConfig,
+    PrinterStyle,
+    TextElement,
+    StatusCategory,
+    StatusSeverity,
+    register_status,
+    ZMPrinterError,
+    ZMPrinterCommandError,
+)
+from zmprinter.status import STATUS_TABLE
+
+
+class FlakyBackend(SimulatedBackend):
+    """前 ok_prints 张正常打印，之后 PrintLabel 抛出异常"""
+
+    def __init__(self, ok_prints: int = 0, **options):
+        super().__init__(**options)
+        self.ok_prints = ok_prints
+
+    def print_label(self, printer, label, objects):
+        if self.printed >= self.ok_prints:
+            self._call("print_label")
+            raise RuntimeError("模拟 USB 断开")
+        return super().print_label(printer, label, objects)
+
+
+class BrokenSDK(LabelPrinterSDK):
+    """print_label 本身抛出异常的 SDK，用于覆盖工作线程的异常处理"""
+
+    def print_label(self, *args, **kwargs):
+        raise RuntimeError("模拟 SDK 异常")
+
+
+def make_scheduler(backends, sdk_classes=None, **options) -> PrintScheduler:
+    scheduler = PrintScheduler(label_config=LabelConfig(width=100, height=30), **options)
+    for name, backend in backends.items():
+        config = PrinterConfig(interface=PrinterStyle.USB, mbsn=name)
+        sdk_class = (sdk_classes or {}).get(name, LabelPrinterSDK)
+        scheduler.add_printer(config, sdk=sdk_class(printer_config=config, backend=backend))
+    return scheduler
+
+
+def label(data: str = "x"):
+    return [TextElement(object_name="text-01", data=data, x=5, y=5)]
+
+
+def test_failover_after_print_exception():
+    backends = {"A": FlakyBackend(), "B": SimulatedBackend()}
+    with make_scheduler(backends) as scheduler:
+        result = scheduler.submit(label()).result(timeout=5)
+
+    assert (result.printer, result.attempts, result.finished_count) == ("B", 2, 1)
+    assert backends["A"].calls["print_label"] == 1 and backends["B"].printed == 1
+    metrics = scheduler.metrics()
+    assert (metrics["retried_jobs"], metrics["completed_jobs"], metrics["failed_jobs"]) == (1, 1, 0)
+    assert metrics["printers"]["A"]["failed_attempts"] == 1
+
+
+def test_failover_after_sdk_exception():
+    backends = {"A": SimulatedBackend(), "B": SimulatedBackend()}
+    with make_scheduler(backends, sdk_classes={"A": BrokenSDK}) as scheduler:
+        result = scheduler.submit(label()).result(timeout=5)
+
+    assert (result.printer, result.attempts) == ("B", 2)
+    assert scheduler.metrics()["printers"]["A"]["failed_attempts"] == 1
+
+
+def test_retry_prints_only_remaining_copies():
+    # A 打印 1 张后出错，剩余 2 张转移到 B
+    backends = {"A": FlakyBackend(ok_prints=1), "B": SimulatedBackend()}
+    with make_scheduler(backends) as scheduler:
+        result = scheduler.submit(label(), copies=3).result(timeout=5)
+
+    assert (result.printer, result.finished_count, result.attempts) == ("B", 3, 2)
+    assert (backends["A"].printed, backends["B"].printed) == (1, 2)
+    assert scheduler.metrics()["printed_labels"] == 3
+
+
+def test_job_fails_when_every_printer_fails():
+    backends = {"A": FlakyBackend(), "B": SimulatedBackend(failure_rate=1.0)}
+    with make_scheduler(backends) as scheduler:
+        future = scheduler.submit(label())
+        with pytest.raises(ZMPrinterCommandError):
+            future.result(timeout=5)
+
+    assert sorted(backend.calls["print_label"] for backend in backends.values()) == [1, 1]
+    metrics = scheduler.metrics()
+    # 只有转移到 B 算一次重试，B 失败后没有可用的打印机，任务直接失败
+    assert (metrics["failed_jobs"], metrics["retried_jobs"], metrics["pending_jobs"]) == (1, 1, 0)
+
+
+def test_pinned_job_is_not_retried_elsewhere():
+    backends = {"A": FlakyBackend(), "B": SimulatedBackend()}
+    with make_scheduler(backends) as scheduler:
+        with pytest.raises(ZMPrinterError):
+            scheduler.submit(label(), printer="A").result(timeout=5)
+    assert backends["B"].calls.get("print_label", 0) == 0
+
+
+def test_stop_without_wait_drains_queues():
+    backends = {"A": SimulatedBackend(latency=0.3), "B": SimulatedBackend(failure_rate=1.0)}
+    scheduler = make_scheduler(backends, check_status=False)
+    scheduler.start()
+    running = scheduler.submit(label("running"), printer="A")
+    time.sleep(0.05)
+    # B 队列较短，任务先发给 B，失败后转移到 A 排队，此时它已处于运行状态
+    retrying = scheduler.submit(label("retrying"))
+    time.sleep(0.05)
+    queued = [scheduler.submit(label(f"queued-{i}"), printer="A") for i in range(3)]
+    scheduler.stop(wait=False)
+
+    assert running.result(timeout=5).printer == "A"
+    assert all(future.cancelled() for future in queued)
+    with pytest.raises(ZMPrinterError, match="调度器已停止"):
+        retrying.result(timeout=5)
+    assert backends["A"].history == [{"text-01": "running"}]
+    assert scheduler.metrics()["pending_jobs"] == 0
+    with pytest.raises(ZMPrinterError):
+        scheduler.submit(label())
+
+
+def test_stop_with_wait_finishes_queued_jobs():
+    backends = {"A": SimulatedBackend(latency=0.01)}
+    scheduler = make_scheduler(backends)
+    scheduler.start()
+    futures = [scheduler.submit(label(str(i))) for i in range(5)]
+    scheduler.stop(wait=True)
+
+    assert all(future.done() and not future.cancelled() for future in futures)
+    assert [record["text-01"] for record in backends["A"].history] == [str(i) for i in range(5)]
+
+
+def test_stop_timeout_cancels_queued_jobs():
+    backends = {"A": SimulatedBackend(latency=0.2)}
+    scheduler = make_scheduler(backends, check_status=False)
+    scheduler.start()
+    futures = [scheduler.submit(label(str(i))) for i in range(3)]
+    time.sleep(0.05)
+    scheduler.stop(wait=True, timeout=0.05)
+
+    # 超时后排队的任务被取消，正在打印的任务执行完毕
+    assert all(future.cancelled() for future in futures[1:])
+    assert futures[0].result(timeout=5).printer == "A"
+    assert backends["A"].history == [{"text-01": "0"}]
+    assert scheduler.metrics()["pending_jobs"] == 0
+
+
+def test_status_registered_later_is_ready():
+    # 调度器创建之后登记的可打印状态码也应被接受
+    backends = {"A": SimulatedBackend(status_code=12346)}
+    scheduler = make_scheduler(backends)
+    try:
+        register_status(12346, "自定义待机状态", StatusCategory.READY, StatusSeverity.OK)
+        with scheduler:
+            result = scheduler.submit(label()).result(timeout=5)
+    finally:
+        STATUS_TABLE.pop(12346, None)
+
+    assert (result.printer, result.attempts) == ("A", 1)
+    assert scheduler.metrics()["printers"]["A"]["available"] is True
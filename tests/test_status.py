@@ -0,0 +1,69 @@
+from zmprinter import (
+    LabelPrinterSDK,
+    SimulatedBackend,
+    PrintScheduler,
+    StatusMonitor,
+    PrinterConfig,
+    LabelConfig,
+    PrinterStyle,
+    TextElement,
+    RFIDElement,
+    StatusCategory,
+    StatusSeverity,
+    lookup_status,
+    register_status,
+)
+from zmprinter.status import STATUS_TABLE
+
+
+def test_lookup_status():
+    status = lookup_status(89)
+    assert (status.message, status.category, status.severity) == (
+        "标签用完",
+        StatusCategory.MEDIA,
+        StatusSeverity.ERROR,
+    )
+    assert not status.ready
+    assert lookup_status(96).ready and lookup_status(-102).category == StatusCategory.CONNECTIVITY
+
+    unknown = lookup_status(12345)
+    assert (unknown.category, unknown.message) == (StatusCategory.UNKNOWN, "未知状态码: 12345")
+
+    try:
+        added = register_status(12345, "自定义状态", StatusCategory.HARDWARE, StatusSeverity.WARNING)
+        assert lookup_status(12345) is added
+    finally:
+        STATUS_TABLE.pop(12345, None)
+
+
+def test_sdk_status_queries():
+    sdk = LabelPrinterSDK(printer_config=PrinterConfig(), backend=SimulatedBackend(status_code=82))
+    assert sdk.get_printer_status() == (82, "碳带出错")
+    assert sdk.query_printer_status().category == StatusCategory.RIBBON
+
+
+def test_scheduler_branches_on_category():
+    label_config = LabelConfig(width=100, height=30)
+    backends = {"A": SimulatedBackend(status_code=90), "B": SimulatedBackend(status_code=0)}
+    with PrintScheduler(label_config=label_config) as scheduler:
+        for name, backend in backends.items():
+            config = PrinterConfig(interface=PrinterStyle.RFID_USB, mbsn=name)
+            scheduler.add_printer(config, sdk=LabelPrinterSDK(printer_config=config, backend=backend))
+        rfid_job = scheduler.submit([RFIDElement("rfiduhf-01", data="ABCD")], printer="A")
+        plain_job = scheduler.submit([TextElement("text-01", data="x")], printer="A")
+        assert plain_job.result(timeout=5).printer == "A"
+        assert rfid_job.exception(timeout=5) is not None
+
+    assert scheduler.metrics()["status_categories"] == {"rfid": 2}
+
+
+def test_monitor_counts_categories():
+    monitor = StatusMonitor()
+    config = PrinterConfig(interface=PrinterStyle.USB, mbsn="A")
+    sdk = LabelPrinterSDK(printer_config=config, backend=SimulatedBackend(status_code=89))
+    monitor.add_printer(config, sdk=sdk)
+    monitor.poll("A")
+    sdk.backend.status_code = 0
+    snapshot = monitor.poll("A")
+    assert snapshot.category == StatusCategory.READY and snapshot.status == lookup_status(0)
+    assert monitor.stats()["categories"] == {"media": 1, "ready": 1}